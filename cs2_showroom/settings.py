@@ -65,11 +65,42 @@ DATABASES = {
     }
 }
 
+# Rendered skin cards are kept in their own LRU cache so they can be
+# dropped on save without touching other cached data.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'skin_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'skin-fragments',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('SKIN_FRAGMENT_CACHE_SIZE', '5000')),
+        },
+    },
+}
+
+# Seconds a rendered /buy/ page is cached per inventory version
+BUY_PAGE_CACHE_TIMEOUT = int(os.getenv('BUY_PAGE_CACHE_TIMEOUT', '300'))
+
 # Static files configuration
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
+# `manage.py collectstatic` minifies CSS and writes hashed, pre-compressed
+# copies here; see inventory/staticfiles.py
+STATIC_ROOT = os.getenv('STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles'))
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'inventory.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -77,10 +108,63 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # App-specific settings
 LOCAL_DATA_FILE = os.path.join(BASE_DIR, 'data', 'inventory_data.json')
 
+# Where skins are persisted: the JSON file above or the database
+# ('inventory.storage.DatabaseStorage', import with `manage.py import_inventory_json`)
+INVENTORY_STORAGE_BACKEND = os.getenv('INVENTORY_STORAGE_BACKEND', 'inventory.storage.JsonFileStorage')
+
+# JSON codec for the data file: 'auto' (orjson when installed), 'orjson' or 'json'
+INVENTORY_JSON_CODEC = os.getenv('INVENTORY_JSON_CODEC', 'auto')
+
+# Serve skin and sticker images through /icons/ from a local disk cache. Off by
+# default: misses are fetched from the CDN inside the web worker, and resizing
+# needs Pillow; run `manage.py prewarm_icons` before enabling it
+ICON_PROXY_ENABLED = os.getenv('ICON_PROXY_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+ICON_CACHE_DIR = os.getenv('ICON_CACHE_DIR', os.path.join(BASE_DIR, 'data', 'icon_cache'))
+ICON_CACHE_MAX_BYTES = int(os.getenv('ICON_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+
+# Manual refreshes run on a background thread; set to false to import inside the request
+INVENTORY_REFRESH_ASYNC = os.getenv('INVENTORY_REFRESH_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+REFRESH_JOB_DIR = os.getenv('REFRESH_JOB_DIR', os.path.join(BASE_DIR, 'data', 'refresh_jobs'))
+# Queued or running jobs older than this (seconds) are treated as abandoned
+REFRESH_JOB_STALE_AFTER = int(os.getenv('REFRESH_JOB_STALE_AFTER', '3600'))
+# A running job not heard from for this long (seconds) is not reused for resubmissions
+REFRESH_JOB_HEARTBEAT_TIMEOUT = int(os.getenv('REFRESH_JOB_HEARTBEAT_TIMEOUT', '300'))
+
+# Serve the landing page, /buy/ and the skins API with async views; enable when
+# running under ASGI (cs2_showroom.asgi), e.g. with uvicorn
+INVENTORY_ASYNC_VIEWS = os.getenv('INVENTORY_ASYNC_VIEWS', 'false').lower() in ('1', 'true', 'yes')
+
 # Steam configuration
 STEAM_ID = "76561198096622937"
 STEAM_APP_ID = "730"  # CS2
 
+# Showrooms of further traders as "slug:steam_id,slug:steam_id". Each is served
+# under /buy/<slug>/ and /manage/<slug>/ with its own file in data/profiles/;
+# STEAM_ID and LOCAL_DATA_FILE above remain the default showroom.
+INVENTORY_PROFILES = {
+    slug.strip(): {
+        'steam_id': steam_id.strip(),
+        'data_file': os.path.join(BASE_DIR, 'data', 'profiles', f'{slug.strip()}.json'),
+    }
+    for slug, _, steam_id in (
+        entry.partition(':') for entry in os.getenv('INVENTORY_PROFILES', '').split(',') if entry.strip()
+    )
+}
+# Parsed inventories kept in memory per process (least recently used dropped first)
+INVENTORY_SNAPSHOT_SHARDS = int(os.getenv('INVENTORY_SNAPSHOT_SHARDS', '8'))
+
+# Fetching inventories from Steam (`manage.py fetch_inventory`)
+STEAM_INVENTORY_BASE_URL = os.getenv('STEAM_INVENTORY_BASE_URL', 'https://steamcommunity.com/inventory')
+# Contexts fetched at the same time over one pooled session
+STEAM_FETCH_CONCURRENCY = int(os.getenv('STEAM_FETCH_CONCURRENCY', '2'))
+# Retries of rate limited (429) or failed (5xx) requests, with exponential backoff
+STEAM_FETCH_RETRIES = int(os.getenv('STEAM_FETCH_RETRIES', '4'))
+STEAM_FETCH_BACKOFF = float(os.getenv('STEAM_FETCH_BACKOFF', '1.0'))
+STEAM_FETCH_TIMEOUT = float(os.getenv('STEAM_FETCH_TIMEOUT', '20'))
+STEAM_FETCH_PAGE_SIZE = int(os.getenv('STEAM_FETCH_PAGE_SIZE', '2500'))
+# Pages kept with their ETag so unchanged ones are revalidated instead of downloaded
+STEAM_FETCH_CACHE_DIR = os.getenv('STEAM_FETCH_CACHE_DIR', os.path.join(BASE_DIR, 'data', 'steam_cache'))
+
 # Authentication settings
 LOGIN_URL = '/accounts/login/'
 LOGIN_REDIRECT_URL = '/manage/'
@@ -1,8 +1,18 @@
+import re
+
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from inventory.staticfiles import serve_static
 
 urlpatterns = [
     path('admin/', admin.site.urls),  # Django admin (not our admin interface)
     path('accounts/', include('django.contrib.auth.urls')),
     path('', include('inventory.urls')),  # Our app URLs
-]
\ No newline at end of file
+]
+
+if not settings.DEBUG:
+    # Collected, hashed assets; runserver serves the sources while DEBUG is on
+    static_prefix = settings.STATIC_URL.lstrip('/')
+    urlpatterns.append(re_path(rf'^{re.escape(static_prefix)}(?P<path>.*)$', serve_static))
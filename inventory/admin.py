@@ -1,3 +1,21 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import InventoryState, Skin, SkinSticker
+
+
+class SkinStickerInline(admin.TabularInline):
+    model = SkinSticker
+    extra = 0
+
+
+@admin.register(Skin)
+class SkinAdmin(admin.ModelAdmin):
+    list_display = ("name", "exterior", "item_type", "weapon_type", "selected", "price_eur", "asset_id")
+    list_filter = ("selected", "item_type", "weapon_type")
+    search_fields = ("name", "asset_id", "note")
+    inlines = [SkinStickerInline]
+
+
+@admin.register(InventoryState)
+class InventoryStateAdmin(admin.ModelAdmin):
+    list_display = ("generation", "total", "total_before_filters")
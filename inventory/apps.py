@@ -16,6 +16,8 @@ class InventoryConfig(AppConfig):
 
     def ready(self):
         """Ensure local cache directory exists and provision admin credentials if supplied."""
+        from . import checks  # noqa: F401  (registers the system checks)
+
         cache_dir = os.path.dirname(settings.LOCAL_DATA_FILE)
         if cache_dir:
             os.makedirs(cache_dir, exist_ok=True)
@@ -0,0 +1,80 @@
+"""Micro-benchmarks for inventory processing.
+
+Run them with ``python manage.py benchmark_inventory [suite ...]``. Each suite
+module registers a function that returns a list of result dicts with at least
+``suite``, ``case`` and ``seconds`` keys.
+"""
+import os
+import timeit
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+
+from django.conf import settings
+
+from inventory.storage import JsonFileStorage
+
+SUITES = {}
+
+# Inventory sizes (assets) of the synthetic suites unless --sizes is given
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+
+
+def register(name):
+    """Register a benchmark suite under ``name``."""
+    def decorator(func):
+        SUITES[name] = func
+        return func
+    return decorator
+
+
+def best_time(func, repeat=5, number=1, setup=None):
+    """Return the best wall-clock time of a single ``func()`` call in seconds.
+
+    ``setup`` runs untimed before each repetition.
+    """
+    timer = timeit.Timer(func, setup=setup or "pass")
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def peak_memory(func):
+    """Return the peak bytes allocated during one ``func()`` call (run separately from timing)."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+@contextmanager
+def quiet():
+    """Silence the progress prints of the code under benchmark."""
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        yield
+
+
+def size_label(count):
+    """Short label of an inventory size for case names: 100, 1k, 50k."""
+    return f"{count // 1000}k" if count >= 1000 and count % 1000 == 0 else str(count)
+
+
+def load_shipped_skins(path=None):
+    """Return the skins stored in the shipped inventory data file."""
+    # Through the storage, so attachment table references are resolved
+    data = JsonFileStorage(path or settings.LOCAL_DATA_FILE).read()
+    return (data or {}).get("skins", [])
+
+
+def scale_skins(skins, target):
+    """Return ``target`` copies of ``skins`` (cycled), each with a unique asset id."""
+    scaled = []
+    while skins and len(scaled) < target:
+        for skin in skins:
+            skin = dict(skin)
+            skin["asset_id"] = str(len(scaled))
+            scaled.append(skin)
+            if len(scaled) == target:
+                break
+    return scaled
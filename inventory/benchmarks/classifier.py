@@ -0,0 +1,115 @@
+"""Compare ``identify_item_types`` with the pre-compiled-classifier implementation."""
+from ..helpers import WEAPON_TYPES, _classify_item, identify_item_types
+from . import best_time, load_shipped_skins, register
+
+
+def legacy_identify_item_types(name, desc=None):
+    """The original per-call implementation, kept as the benchmark baseline."""
+    weapon_type = None
+    item_type = None
+
+    for weapon in sorted(WEAPON_TYPES, key=len, reverse=True):
+        if weapon.lower() in name.lower():
+            weapon_type = weapon
+            break
+
+    if desc and isinstance(desc, dict):
+        if "type" in desc and isinstance(desc["type"], str):
+            item_type_str = desc["type"]
+            for candidate in ("Agent", "Equipment", "Music Kit", "Collectible", "Pass", "Graffiti", "Sticker"):
+                if candidate in item_type_str:
+                    item_type = candidate
+                    break
+
+        if not item_type:
+            for tag in desc.get("tags", []):
+                if tag.get("category") == "Type":
+                    tag_name = tag.get("localized_tag_name", "")
+                    if tag_name in ("Agent", "Equipment", "Collectible", "Gloves"):
+                        item_type = tag_name
+
+    if not item_type:
+        if any(knife.lower() in name.lower() for knife in ["Knife", "Bayonet", "Karambit", "Daggers"]):
+            item_type = "Knife"
+        elif any(x.lower() in name.lower() for x in ["Pistol", "Glock", "USP", "P250", "Five-SeveN", "Tec-9", "CZ75", "Dual Berettas", "Desert Eagle", "P2000", "R8 Revolver"]):
+            item_type = "Pistol"
+        elif any(x.lower() in name.lower() for x in ["SMG", "MP9", "MAC-10", "MP7", "MP5", "UMP", "P90", "PP-Bizon"]):
+            item_type = "SMG"
+        elif any(x.lower() in name.lower() for x in ["AK-47", "M4A4", "M4A1", "Galil", "FAMAS", "SG 553", "AUG"]):
+            item_type = "Rifle"
+        elif any(x.lower() in name.lower() for x in ["AWP", "SSG 08", "SCAR-20", "G3SG1"]):
+            item_type = "Sniper Rifle"
+        elif any(x.lower() in name.lower() for x in ["Nova", "XM1014", "MAG-7", "Sawed-Off"]):
+            item_type = "Shotgun"
+        elif any(x.lower() in name.lower() for x in ["M249", "Negev"]):
+            item_type = "Machinegun"
+        elif "Glove" in name or "Hand Wraps" in name or "Driver Gloves" in name:
+            item_type = "Gloves"
+        elif "Agent" in name or "Operator" in name or "Enforcer" in name or "Soldier" in name:
+            item_type = "Agent"
+        elif "Sticker" in name:
+            item_type = "Sticker"
+        elif "Graffiti" in name or "Spray" in name:
+            item_type = "Graffiti"
+        elif "Music Kit" in name:
+            item_type = "Music Kit"
+        elif "Case" in name or "Container" in name:
+            item_type = "Collectible"
+        elif "Key" in name:
+            item_type = "Tool"
+        elif "Pass" in name or "Operation" in name:
+            item_type = "Pass"
+        elif "Tool" in name or "Kit" in name:
+            item_type = "Tool"
+        elif "Tag" in name or "Label" in name:
+            item_type = "Tag"
+        elif "Equipment" in name or "Defuse Kit" in name:
+            item_type = "Equipment"
+
+    return weapon_type, item_type
+
+
+def _sample_items(skins):
+    """Rebuild (name, desc) pairs from stored skins; descriptions only carry the Type tag."""
+    items = []
+    for skin in skins:
+        desc = {"tags": [{"category": "Type", "localized_tag_name": skin.get("item_type") or ""}]}
+        items.append((skin.get("name") or "", desc))
+    return items
+
+
+@register("classifier")
+def run(repeat=5, data_path=None, **options):
+    items = _sample_items(load_shipped_skins(data_path))
+
+    mismatches = sum(
+        1 for name, desc in items
+        if legacy_identify_item_types(name, desc) != identify_item_types(name, desc)
+    )
+
+    def legacy():
+        for name, desc in items:
+            legacy_identify_item_types(name, desc)
+
+    def compiled_cold():
+        _classify_item.cache_clear()
+        for name, desc in items:
+            identify_item_types(name, desc)
+
+    def compiled_warm():
+        for name, desc in items:
+            identify_item_types(name, desc)
+
+    baseline = best_time(legacy, repeat=repeat)
+    results = [{"suite": "classifier", "case": "legacy", "items": len(items), "seconds": baseline}]
+    for case, func in (("compiled (cold cache)", compiled_cold), ("compiled (memoized)", compiled_warm)):
+        seconds = best_time(func, repeat=repeat)
+        results.append({
+            "suite": "classifier",
+            "case": case,
+            "items": len(items),
+            "seconds": seconds,
+            "speedup": baseline / seconds if seconds else None,
+        })
+    results[0]["mismatches"] = mismatches
+    return results
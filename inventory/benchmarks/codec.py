@@ -0,0 +1,56 @@
+"""Load/dump times of the inventory data file for each JSON codec."""
+import json
+
+from inventory import codec
+from inventory.benchmarks import best_time, load_shipped_skins, register, scale_skins
+from inventory.helpers import build_facet_index
+from inventory.storage import _pack_attachments
+
+# The shipped file is replicated up to this many skins
+TARGET_SKINS = 10000
+
+
+@register("codec")
+def run(repeat=5, data_path=None, **options):
+    skins = scale_skins(load_shipped_skins(data_path), TARGET_SKINS)
+    if not skins:
+        return []
+    data = _pack_attachments({
+        "skins": skins,
+        "total": len(skins),
+        "total_before_filters": len(skins),
+        "facets": build_facet_index(skins),
+    })
+
+    # The format before the codec layer: stdlib json with indent=2
+    legacy_raw = json.dumps(data, indent=2)
+    cases = [
+        ("json indent=2 (legacy)", lambda: json.dumps(data, indent=2), lambda: json.loads(legacy_raw), len(legacy_raw)),
+    ]
+    codecs = ["json"] + (["orjson"] if codec.orjson is not None else [])
+    for name in codecs:
+        raw = codec.dumps(data, codec=name)
+        cases.append((
+            f"{name} compact",
+            lambda name=name: codec.dumps(data, codec=name),
+            lambda name=name, raw=raw: codec.loads(raw, codec=name),
+            len(raw),
+        ))
+
+    results = []
+    baseline = None
+    for case, dump, load, size in cases:
+        dump_seconds = best_time(dump, repeat=repeat)
+        load_seconds = best_time(load, repeat=repeat)
+        baseline = baseline or (dump_seconds + load_seconds)
+        results.append({
+            "suite": "codec",
+            "case": case,
+            "seconds": dump_seconds + load_seconds,
+            "skins": len(skins),
+            "dump_ms": dump_seconds * 1000,
+            "load_ms": load_seconds * 1000,
+            "bytes": size,
+            "speedup": baseline / (dump_seconds + load_seconds),
+        })
+    return results
@@ -0,0 +1,65 @@
+"""Memory held by the showroom snapshot: plain skin dicts vs slotted records."""
+import gc
+import json
+import tracemalloc
+
+from inventory.benchmarks import best_time, load_shipped_skins, register, scale_skins
+from inventory.helpers import build_tradable_info, intern_attachment
+from inventory.records import SkinRecord
+
+# Synthetic inventory size; the shipped file is replicated up to this many skins
+TARGET_SKINS = 10000
+
+
+def _load_dicts(payload):
+    """Skins in the shape ``load_inventory_from_file`` returns them."""
+    skins = json.loads(payload)
+    for skin in skins:
+        raw = (skin.get("tradable_info") or {}).get("raw") or skin.pop("tradable", "Yes")
+        skin["tradable_info"] = build_tradable_info(raw)
+        skin["stickers"] = [intern_attachment(sticker) for sticker in skin.get("stickers") or []]
+        skin["patches"] = [intern_attachment(patch) for patch in skin.get("patches") or []]
+        note = skin.get("note")
+        skin["is_reserved"] = bool(note.strip()) if isinstance(note, str) else False
+    return skins
+
+
+def _load_records(payload):
+    return [SkinRecord.from_dict(skin) for skin in _load_dicts(payload)]
+
+
+def _retained_bytes(loader, payload):
+    """Bytes still allocated after ``loader(payload)`` returns, while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = loader(payload)
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+@register("memory")
+def run(repeat=5, data_path=None, **options):
+    skins = load_shipped_skins(data_path)
+    if not skins:
+        return []
+    payload = json.dumps(scale_skins(skins, TARGET_SKINS))
+
+    results = []
+    baseline = None
+    for case, loader in (("dict skins", _load_dicts), ("slotted records", _load_records)):
+        retained = _retained_bytes(loader, payload)
+        baseline = baseline or retained
+        results.append({
+            "suite": "memory",
+            "case": case,
+            "skins": TARGET_SKINS,
+            "seconds": best_time(lambda: loader(payload), repeat=repeat),
+            "bytes_per_skin": retained // TARGET_SKINS,
+            "saving": 1 - retained / baseline,
+        })
+    return results
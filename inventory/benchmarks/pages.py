@@ -0,0 +1,90 @@
+"""Full-request timings of the showroom and admin pages through the test client.
+
+Runs against a throwaway test database and a temporary data file, so the
+configured database and inventory are left alone.
+"""
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from inventory.benchmarks import DEFAULT_SIZES, best_time, quiet, register, size_label
+from inventory.benchmarks.synthetic import make_inventory_payloads
+from inventory.fragment_cache import invalidate_skin_fragments
+from inventory.steam_api import invalidate_inventory_snapshot, parse_inventory_json, save_inventory_to_file
+
+
+def _store_inventory(asset_count):
+    skins, total, total_before_filters = parse_inventory_json(make_inventory_payloads(asset_count))
+    for index, skin in enumerate(skins):
+        skin["selected"] = index % 2 == 0
+        skin["price_eur"] = f"{index % 500}.50" if skin["selected"] else None
+    save_inventory_to_file(skins, total, total_before_filters)
+    return len(skins)
+
+
+def _drop_caches():
+    invalidate_inventory_snapshot()
+    invalidate_skin_fragments()
+    cache.clear()
+
+
+def _request(client, path):
+    def get():
+        response = client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} answered {response.status_code}")
+        return response
+    return get
+
+
+def _run_sizes(client, repeat, sizes):
+    results = []
+    for asset_count in sizes:
+        skin_count = _store_inventory(asset_count)
+        cases = (
+            # Snapshot rebuilt from the data file, page rendered
+            ("index (cold)", "/buy/", _drop_caches),
+            # Served from the page cache
+            ("index (cached)", "/buy/", None),
+            ("admin_view (cold)", "/manage/", _drop_caches),
+            # Skin cards reused from the fragment cache
+            ("admin_view (warm)", "/manage/", None),
+        )
+        for case, path, setup in cases:
+            get = _request(client, path)
+            get()
+            results.append({
+                "suite": "pages",
+                "case": f"{case} @{size_label(asset_count)}",
+                "assets": asset_count,
+                "skins": skin_count,
+                "seconds": best_time(get, repeat=repeat, setup=setup),
+                "kb": len(get().content) // 1024,
+            })
+    return results
+
+
+@register("pages")
+def run(repeat=5, sizes=DEFAULT_SIZES, **options):
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        with tempfile.TemporaryDirectory(prefix="inventory-bench-") as directory, override_settings(
+            LOCAL_DATA_FILE=os.path.join(directory, "inventory_data.json"),
+            INVENTORY_STORAGE_BACKEND="inventory.storage.JsonFileStorage",
+        ), quiet():
+            user = get_user_model().objects.create_superuser("benchmark", "benchmark@example.com", None)
+            client = Client()
+            client.force_login(user)
+            try:
+                return _run_sizes(client, repeat, sizes)
+            finally:
+                _drop_caches()
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
@@ -0,0 +1,57 @@
+"""Time and peak memory of the inventory pipeline on synthetic inventories."""
+import json
+import os
+import tempfile
+
+from inventory.benchmarks import DEFAULT_SIZES, best_time, peak_memory, quiet, register, size_label
+from inventory.benchmarks.synthetic import make_inventory_payloads
+from inventory.helpers import get_filter_counts
+from inventory.steam_api import (
+    load_inventory_from_file,
+    parse_inventory_json,
+    process_inventory_data,
+    save_inventory_to_file,
+)
+from inventory.storage import JsonFileStorage
+
+
+def _cases(asset_count, storage):
+    pages = make_inventory_payloads(asset_count)
+    text = "\n".join(json.dumps(page) for page in pages)
+    # process_inventory_data takes one payload, as if Steam sent a single page
+    single = make_inventory_payloads(asset_count, page_size=max(asset_count, 1))[0]
+
+    skins, total, total_before_filters = parse_inventory_json(text)
+    for index, skin in enumerate(skins):
+        # Half of the inventory on sale, a few reserved
+        skin["selected"] = index % 2 == 0
+        skin["price_eur"] = f"{index % 500}.50" if skin["selected"] else None
+        skin["note"] = "reserved" if index % 40 == 0 else ""
+    save_inventory_to_file(skins, total, total_before_filters, storage=storage)
+
+    return len(skins), (
+        ("parse_inventory_json", lambda: parse_inventory_json(text)),
+        ("process_inventory_data", lambda: process_inventory_data(single)),
+        ("load_inventory_from_file", lambda: load_inventory_from_file(storage=storage)),
+        ("save_inventory_to_file", lambda: save_inventory_to_file(skins, total, total_before_filters, storage=storage)),
+        ("get_filter_counts", lambda: get_filter_counts(skins)),
+    )
+
+
+@register("pipeline")
+def run(repeat=5, sizes=DEFAULT_SIZES, **options):
+    results = []
+    with tempfile.TemporaryDirectory(prefix="inventory-bench-") as directory, quiet():
+        storage = JsonFileStorage(os.path.join(directory, "inventory_data.json"))
+        for asset_count in sizes:
+            skin_count, cases = _cases(asset_count, storage)
+            for name, func in cases:
+                results.append({
+                    "suite": "pipeline",
+                    "case": f"{name} @{size_label(asset_count)}",
+                    "assets": asset_count,
+                    "skins": skin_count,
+                    "seconds": best_time(func, repeat=repeat),
+                    "peak_kb": peak_memory(func) // 1024,
+                })
+    return results
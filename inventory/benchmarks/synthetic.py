@@ -0,0 +1,166 @@
+"""Synthetic Steam inventory payloads for benchmarking at arbitrary sizes.
+
+The payloads have the shape of the community inventory endpoint: pages of
+``assets``, ``descriptions`` and ``asset_properties``. Many assets share a
+description, the way duplicates and stacks of cases and stickers do. Weapons
+carry stickers, agents carry patches, and a share of the items is trade
+protected or trade locked, with unlock dates around the current time.
+"""
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+# (name, type line, Type tag) of the generated descriptions, cycled
+_ITEMS = (
+    ("AK-47 | Redline", "Classified Rifle", "Rifle"),
+    ("AWP | Asiimov", "Covert Sniper Rifle", "Sniper Rifle"),
+    ("M4A1-S | Printstream", "Covert Rifle", "Rifle"),
+    ("Glock-18 | Water Elemental", "Classified Pistol", "Pistol"),
+    ("Desert Eagle | Blaze", "Restricted Pistol", "Pistol"),
+    ("MP9 | Starlight Protector", "Covert SMG", "SMG"),
+    ("Nova | Hyper Beast", "Classified Shotgun", "Shotgun"),
+    ("★ Karambit | Fade", "★ Covert Knife", "Knife"),
+    ("★ Sport Gloves | Vice", "★ Extraordinary Gloves", "Gloves"),
+    ("Sir Bloody Darryl Royale | The Professionals", "Master Agent", "Agent"),
+    ("Sticker | s1mple (Gold) | Paris 2023", "Extraordinary Sticker", "Sticker"),
+    ("Revolution Case", "Base Grade Container", "Container"),
+    ("Music Kit | Daniel Sadowski, Crimson Assault", "High Grade Music Kit", "Music Kit"),
+    ("Sealed Graffiti | GGWP (Bazooka Pink)", "Base Grade Graffiti", "Graffiti"),
+)
+_EXTERIORS = ("Factory New", "Minimal Wear", "Field-Tested", "Well-Worn", "Battle-Scarred")
+_STICKERED = {"Rifle", "Sniper Rifle", "Pistol", "SMG", "Shotgun"}
+_CDN = "https://cdn.steamstatic.com/apps/730/icons/econ"
+
+# Steam pages inventories in chunks of this many assets
+PAGE_SIZE = 2500
+
+
+def _steam_date(epoch):
+    moment = datetime.fromtimestamp(epoch, tz=timezone.utc)
+    return f"{moment.strftime('%b')} {moment.day}, {moment.year} ({moment.hour}:{moment:%M:%S})"
+
+
+def _sticker_html(rnd, count, kind="stickers", prefix="Sticker"):
+    images = "".join(
+        f'<img width=64 height=48 src="{_CDN}/{kind}/bench/{kind}_{rnd.randrange(40)}.png" '
+        f'title="{prefix}: Bench {rnd.randrange(40)}">'
+        for _ in range(count)
+    )
+    return f'<br><div id="sticker_info" class="sticker_info"><center>{images}</center></div>'
+
+
+def _description(rnd, index, now):
+    name, type_line, type_tag = _ITEMS[index % len(_ITEMS)]
+    exterior = _EXTERIORS[index % len(_EXTERIORS)]
+    blocks = [
+        {"type": "html", "name": "exterior_wear", "value": f"Exterior: {exterior}"},
+        {"type": "html", "name": "itemset_name", "value": f"The Bench Collection {index % 9}"},
+    ]
+    if type_tag in _STICKERED:
+        blocks.append({"type": "html", "name": "sticker_info", "value": _sticker_html(rnd, rnd.randint(0, 4))})
+    elif type_tag == "Agent":
+        html = _sticker_html(rnd, 2, "patches", "Patch") + _sticker_html(rnd, 1)
+        blocks.append({"type": "html", "name": "sticker_info", "value": html})
+
+    desc = {
+        "appid": 730,
+        "classid": str(3_000_000 + index),
+        "instanceid": str(index % 4),
+        "icon_url": f"bench-icon-{index}",
+        "name": name,
+        "market_hash_name": f"{name} ({exterior})",
+        "type": type_line,
+        "name_color": "D2D2D2",
+        "tradable": 1,
+        "marketable": 1,
+        "descriptions": blocks,
+        "actions": [{
+            "link": "steam://rungame/730/76561202255233023/+csgo_econ_action_preview%20S%owner_steamid%A%assetid%D"
+                    f"{rnd.getrandbits(60)}",
+            "name": "Inspect in Game...",
+        }],
+        "tags": [
+            {"category": "Type", "localized_tag_name": type_tag},
+            {"category": "Rarity", "localized_tag_name": type_line.split()[0], "color": "eb4b4b"},
+            {"category": "Exterior", "localized_tag_name": exterior},
+        ],
+    }
+
+    roll = index % 10
+    if roll in (1, 2):
+        # Trade protected for up to a week, some already expired
+        until = _steam_date(now + rnd.randint(-2, 7) * 86400 + 3600)
+        desc["tradable"] = 0
+        desc["owner_descriptions"] = [{
+            "type": "html",
+            "value": "This item is trade-protected and cannot be consumed, modified, or "
+                     f"transferred until {until} GMT",
+        }]
+    elif roll == 3:
+        desc["tradable"] = 0
+        desc["owner_descriptions"] = [{"type": "html", "value": f"Tradable/Marketable After {_steam_date(now + 86400)} GMT"}]
+    elif roll == 4 and index % 20 == 4:
+        # Not tradable at all; dropped while processing
+        desc["tradable"] = 0
+    return desc
+
+
+def make_inventory_payloads(asset_count, seed=0, page_size=PAGE_SIZE, now=None):
+    """Return Steam inventory pages holding ``asset_count`` assets.
+
+    Roughly eight assets share each description. Every page lists the
+    descriptions its own assets use, so descriptions repeat across pages as
+    they do in real responses.
+    """
+    rnd = random.Random(seed)
+    now = int(time.time() if now is None else now)
+    descriptions = [_description(rnd, index, now) for index in range(max(len(_ITEMS), asset_count // 8))]
+
+    payloads = []
+    next_asset_id = 30_000_000_000
+    for start in range(0, max(asset_count, 1), page_size):
+        assets = []
+        properties = []
+        used = {}
+        for _ in range(min(page_size, asset_count - start)):
+            desc = descriptions[min(int(rnd.paretovariate(1.2)) - 1, len(descriptions) - 1)
+                                if rnd.random() < 0.3 else rnd.randrange(len(descriptions))]
+            next_asset_id += rnd.randint(1, 50)
+            asset_id = str(next_asset_id)
+            assets.append({
+                "appid": 730,
+                "contextid": "2",
+                "assetid": asset_id,
+                "classid": desc["classid"],
+                "instanceid": desc["instanceid"],
+                "amount": "1",
+            })
+            used[desc["classid"], desc["instanceid"]] = desc
+            properties.append({
+                "appid": 730,
+                "contextid": "2",
+                "assetid": asset_id,
+                "asset_properties": [
+                    {"propertyid": 2, "float_value": f"{rnd.random():.14f}", "name": "Wear Rating"},
+                    {"propertyid": 1, "int_value": str(rnd.randrange(1000)), "name": "Pattern Template"},
+                ],
+            })
+        page = {
+            "assets": assets,
+            "descriptions": list(used.values()),
+            "asset_properties": properties,
+            "total_inventory_count": asset_count,
+            "success": 1,
+            "rwgrsn": -2,
+        }
+        if start + page_size < asset_count:
+            page["more_items"] = 1
+            page["last_assetid"] = assets[-1]["assetid"]
+        payloads.append(page)
+    return payloads
+
+
+def make_inventory_text(asset_count, seed=0):
+    """The payloads as pasted into the admin form: concatenated JSON documents."""
+    return "\n".join(json.dumps(page) for page in make_inventory_payloads(asset_count, seed=seed))
@@ -0,0 +1,29 @@
+"""System checks for inventory settings that would otherwise only fail per request."""
+from django.conf import settings
+from django.core.checks import Error, register
+from django.utils.module_loading import import_string
+
+from .profiles import DEFAULT_PROFILE
+from .storage import DEFAULT_STORAGE_BACKEND
+
+
+@register()
+def check_storage_backend(app_configs, **kwargs):
+    backend_path = getattr(settings, 'INVENTORY_STORAGE_BACKEND', DEFAULT_STORAGE_BACKEND)
+    try:
+        backend = import_string(backend_path)
+    except ImportError as exc:
+        return [Error(
+            f"INVENTORY_STORAGE_BACKEND {backend_path!r} could not be imported: {exc}",
+            id='inventory.E001',
+        )]
+
+    profiles = [slug for slug in (getattr(settings, 'INVENTORY_PROFILES', None) or {}) if slug != DEFAULT_PROFILE]
+    if profiles and not getattr(backend, 'supports_profiles', False):
+        return [Error(
+            f"{backend.__name__} only stores the default profile, but INVENTORY_PROFILES "
+            f"configures {', '.join(sorted(profiles))}.",
+            hint="Use inventory.storage.JsonFileStorage or unset INVENTORY_PROFILES.",
+            id='inventory.E002',
+        )]
+    return []
@@ -0,0 +1,60 @@
+"""JSON encoding for the inventory data file.
+
+orjson is used when it is installed and the standard library otherwise;
+``INVENTORY_JSON_CODEC`` (``"auto"``, ``"orjson"`` or ``"json"``) forces
+one. Both produce the same compact UTF-8 document, so files written by
+either load with the other.
+"""
+import json
+from collections.abc import Mapping
+
+from django.conf import settings
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+def _default(value):
+    # Skin records and similar mapping types are stored as plain objects
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def codec_name():
+    """Return the codec in use: ``"orjson"`` or ``"json"``."""
+    configured = getattr(settings, "INVENTORY_JSON_CODEC", "auto")
+    if configured == "json" or orjson is None:
+        return "json"
+    return "orjson"
+
+
+def dumps(data, pretty=False, codec=None):
+    """Encode ``data`` to UTF-8 bytes; compact unless ``pretty``."""
+    if (codec or codec_name()) == "orjson":
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(data, default=_default, option=option)
+    if pretty:
+        text = json.dumps(data, indent=2, ensure_ascii=False, default=_default)
+    else:
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=_default)
+    return text.encode("utf-8")
+
+
+def loads(raw, codec=None):
+    """Decode a JSON document from bytes or str.
+
+    Both codecs raise ``json.JSONDecodeError`` (orjson's error subclasses it).
+    """
+    if (codec or codec_name()) == "orjson":
+        if isinstance(raw, (bytes, bytearray)) and raw.startswith(b"\xef\xbb\xbf"):
+            raw = raw[3:]
+        return orjson.loads(raw)
+    if isinstance(raw, (bytes, bytearray)):
+        try:
+            raw = raw.decode("utf-8-sig")
+        except UnicodeDecodeError as exc:
+            raise json.JSONDecodeError(f"Invalid UTF-8: {exc.reason}", "", exc.start) from exc
+    return json.loads(raw)
@@ -0,0 +1,153 @@
+"""Local stand-in for the Steam community inventory endpoint.
+
+Serves ``/inventory/<steam_id>/<app_id>/<context>`` from in-memory payloads
+with Steam's pagination (``count``, ``start_assetid``, ``more_items``,
+``last_assetid``) and ``ETag``/``If-None-Match`` revalidation. Point
+``STEAM_INVENTORY_BASE_URL`` at ``server.base_url`` to exercise the fetcher
+without network access, or run it with ``manage.py fake_steam_server``.
+"""
+import hashlib
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+_PATH_RE = re.compile(r"^/inventory/(?P<steam_id>\d+)/(?P<app_id>\d+)/(?P<context>\d+)/?$")
+
+
+def paginate(payload, start_assetid=None, count=2500):
+    """Return the Steam response page of ``payload`` starting after ``start_assetid``."""
+    assets = payload.get("assets", [])
+    start = 0
+    if start_assetid:
+        for index, asset in enumerate(assets):
+            if asset.get("assetid") == start_assetid:
+                start = index + 1
+                break
+    page_assets = assets[start:start + count]
+    used = {(asset.get("classid"), asset.get("instanceid", "0")) for asset in page_assets}
+
+    page = {
+        "assets": page_assets,
+        "descriptions": [
+            desc for desc in payload.get("descriptions", [])
+            if (desc.get("classid"), desc.get("instanceid", "0")) in used
+        ],
+        "total_inventory_count": len(assets),
+        "success": 1,
+        "rwgrsn": -2,
+    }
+    if payload.get("asset_properties"):
+        asset_ids = {asset.get("assetid") for asset in page_assets}
+        page["asset_properties"] = [
+            entry for entry in payload["asset_properties"] if entry.get("assetid") in asset_ids
+        ]
+    if start + count < len(assets):
+        page["more_items"] = 1
+        page["last_assetid"] = page_assets[-1]["assetid"]
+    if not page_assets:
+        # Steam leaves both lists out for an empty inventory
+        del page["assets"], page["descriptions"]
+    return page
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "FakeSteam/1.0"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        match = _PATH_RE.match(parts.path)
+        if not match:
+            self._send(404, b"null")
+            return
+
+        key = (match["steam_id"], match["context"])
+        with self.server.lock:
+            self.server.requests.append(self.path)
+            status_override = self.server.failures.pop(0) if self.server.failures else None
+            payload = self.server.inventories.get(key)
+            if payload is None and any(steam_id == key[0] for steam_id, _ in self.server.inventories):
+                # Known account, nothing in this context
+                payload = {}
+        if status_override:
+            self._send(status_override, b"null", {"Retry-After": "0"})
+            return
+        if payload is None:
+            self._send(403, b"null")
+            return
+
+        query = parse_qs(parts.query)
+        count = int(query.get("count", ["2500"])[0])
+        start_assetid = query.get("start_assetid", [None])[0]
+        body = json.dumps(paginate(payload, start_assetid, count)).encode("utf-8")
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", {"ETag": etag})
+            return
+        self._send(200, body, {"ETag": etag})
+
+    def _send(self, status, body, headers=None):
+        with self.server.lock:
+            self.server.statuses.append(status)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FakeSteamServer(ThreadingHTTPServer):
+    """HTTP server answering like Steam's inventory endpoint.
+
+    ``inventories`` maps ``(steam_id, context)`` to a full payload
+    (``assets``, ``descriptions`` and optionally ``asset_properties``);
+    other Steam IDs are answered with 403 like a private profile.
+    Status codes queued in ``failures`` are answered before the next
+    requests, e.g. ``[429, 503]`` to exercise retries. Every request path
+    is recorded in ``requests`` and its response status in ``statuses``.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, inventories=None, host="127.0.0.1", port=0, verbose=False):
+        super().__init__((host, port), _Handler)
+        self.inventories = dict(inventories or {})
+        self.failures = []
+        self.requests = []
+        self.statuses = []
+        self.lock = threading.Lock()
+        self.verbose = verbose
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/inventory"
+
+    def start(self):
+        """Serve on a background thread; returns the server."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, name="fake-steam", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,84 @@
+import hashlib
+import json
+from collections.abc import Mapping
+
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .profiles import active_profile
+
+# Cache alias holding rendered skin cards, see CACHES in settings
+FRAGMENT_CACHE_ALIAS = "skin_fragments"
+_KEY_PREFIX = "skin-fragment"
+
+
+def _fragment_cache():
+    return caches[FRAGMENT_CACHE_ALIAS]
+
+
+def _json_default(value):
+    # Skin records and tradable info are mappings rather than dicts
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def _content_hash(skin):
+    payload = json.dumps(dict(skin), sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _asset_index_key(slug, asset_id):
+    return f"{_KEY_PREFIX}:{slug}:keys:{asset_id}"
+
+
+def _generation_key(slug):
+    return f"{_KEY_PREFIX}:{slug}:generation"
+
+
+def _generation(cache, slug):
+    # Bumped to drop a whole profile's cards without touching other profiles
+    return cache.get(_generation_key(slug), 0)
+
+
+def render_skin_fragment(template_name, skin):
+    """Render a skin card template, reusing the cached HTML while the skin is unchanged.
+
+    The key combines the asset id with a hash of the whole skin dict, so any
+    change to a skin (including per-request fields such as ``form_index``)
+    renders a fresh card even in processes whose cache was not invalidated.
+    Cards are cached per profile.
+    """
+    slug = active_profile().slug
+    asset_id = skin.get("asset_id") or "none"
+    cache = _fragment_cache()
+    key = f"{_KEY_PREFIX}:{slug}:{_generation(cache, slug)}:{template_name}:{asset_id}:{_content_hash(skin)}"
+
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string(template_name, {"skin": skin})
+        cache.set(key, html)
+        # Remember the keys per asset so a save can drop them again
+        if asset_id != "none":
+            index_key = _asset_index_key(slug, asset_id)
+            keys = cache.get(index_key) or []
+            if key not in keys:
+                cache.set(index_key, keys + [key])
+    return mark_safe(html)
+
+
+def invalidate_skin_fragments(asset_ids=None):
+    """Drop the active profile's cached cards for the given asset ids, or all of them when None."""
+    slug = active_profile().slug
+    cache = _fragment_cache()
+    if asset_ids is None:
+        # Old entries are never read again and age out of the cache
+        cache.set(_generation_key(slug), _generation(cache, slug) + 1, None)
+        return
+
+    index_keys = [_asset_index_key(slug, asset_id) for asset_id in asset_ids]
+    stale = []
+    for keys in cache.get_many(index_keys).values():
+        stale.extend(keys)
+    cache.delete_many(stale + index_keys)
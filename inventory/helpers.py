@@ -1,5 +1,11 @@
+import calendar
+import math
 import re
-from datetime import datetime
+import time
+import weakref
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from functools import lru_cache
 from html import unescape
 
 # Common weapon and item type detection
@@ -34,6 +40,41 @@ _TRADE_PROTECTED_DISPLAY_RE = re.compile(
 _STICKER_IMG_RE = re.compile(r'<img[^>]+src="([^\"]+)"[^>]*title="([^\"]+)"', re.I)
 
 
+class Attachment(dict):
+    """A sticker or patch shared by every skin that carries it; read-only.
+
+    Copy it with ``dict(attachment)`` before changing anything.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Attachments are shared between skins and cannot be modified")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return Attachment, (dict(self),)
+
+
+# Every distinct sticker/patch is held once per process, however many skins
+# or cached inventory copies reference it.
+_attachment_pool = weakref.WeakValueDictionary()
+
+
+def intern_attachment(attachment):
+    """Return the shared ``Attachment`` for a sticker/patch dict."""
+    if isinstance(attachment, Attachment):
+        return attachment
+    key = (attachment.get("icon_url"), attachment.get("name"))
+    shared = _attachment_pool.get(key)
+    if shared is None:
+        shared = Attachment(icon_url=key[0], name=key[1])
+        _attachment_pool[key] = shared
+    return shared
+
+
 def extract_stickers(desc):
     """Parse sticker thumbnails from Steam description HTML."""
     if not isinstance(desc, dict):
@@ -111,14 +152,18 @@ def tradable_text(desc):
     return "No"
 
 
-def _format_tradable_timestamp(tradable_status):
-    """Return (formatted_text, iso_timestamp) for a Trade Protected status string."""
+def parse_unlock_epoch(tradable_status):
+    """Return the unlock time of a Trade Protected status as a UTC epoch, or None.
+
+    Steam gives these times in GMT. Parse once when the status is stored and
+    keep the result as ``tradable_info["unlock_epoch"]``.
+    """
     if not isinstance(tradable_status, str):
-        return None, None
+        return None
 
     match = _TRADE_PROTECTED_DISPLAY_RE.search(tradable_status)
     if not match:
-        return None, None
+        return None
 
     date_part, hour_str, minute_str, second_str = match.groups()
 
@@ -131,25 +176,31 @@ def _format_tradable_timestamp(tradable_status):
             continue
 
     if not parsed_date:
-        return None, None
+        return None
 
-    hour = int(hour_str)
-    minute = int(minute_str)
-    second = int(second_str or 0)
-    timestamp = parsed_date.replace(hour=hour, minute=minute, second=second)
+    timestamp = parsed_date.replace(hour=int(hour_str), minute=int(minute_str), second=int(second_str or 0))
+    return calendar.timegm(timestamp.timetuple())
 
+
+def _format_unlock_epoch(unlock_epoch):
+    """Return (formatted_text, iso_timestamp) for an unlock epoch."""
+    timestamp = datetime.fromtimestamp(unlock_epoch, timezone.utc).replace(tzinfo=None)
     formatted = f"{timestamp.day}.{timestamp.month}.{timestamp.year} ({timestamp.hour}:{timestamp.strftime('%M')})"
     return formatted, timestamp.isoformat()
 
 
-def build_tradable_info(tradable_status):
-    """Construct structured tradable metadata for display purposes."""
+def build_tradable_info(tradable_status, unlock_epoch=None):
+    """Construct structured tradable metadata for display purposes.
+
+    Pass the stored ``unlock_epoch`` to skip parsing the status string.
+    """
     info = {
         "raw": tradable_status,
         "is_tradable": True,
         "lock_state": "unlocked",
         "unlock_text": None,
         "unlock_iso": None,
+        "unlock_epoch": None,
         "state_class": "meta--unlocked",
     }
 
@@ -168,13 +219,54 @@ def build_tradable_info(tradable_status):
     info["lock_state"] = "locked"
     info["state_class"] = "meta--locked"
 
-    formatted, iso_value = _format_tradable_timestamp(normalized)
-    if formatted:
+    if unlock_epoch is None:
+        unlock_epoch = parse_unlock_epoch(normalized)
+    if unlock_epoch is not None:
+        formatted, iso_value = _format_unlock_epoch(unlock_epoch)
         info["unlock_text"] = f"Tradable on {formatted}"
         info["unlock_iso"] = iso_value
+        info["unlock_epoch"] = unlock_epoch
 
     return info
 
+
+def trade_lock_state(tradable_info, now=None):
+    """Return "locked" or "unlocked" for ``tradable_info`` at ``now`` (epoch seconds).
+
+    A Trade Protected lock whose unlock time has passed counts as unlocked.
+    """
+    tradable_info = tradable_info or {}
+    if tradable_info.get("is_tradable", True):
+        return "unlocked"
+    unlock_epoch = tradable_info.get("unlock_epoch")
+    if unlock_epoch is not None and unlock_epoch <= (time.time() if now is None else now):
+        return "unlocked"
+    return "locked"
+
+
+def expire_trade_locks(skins, now=None):
+    """Mark skins whose trade lock has run out as tradable; returns how many changed."""
+    now = time.time() if now is None else now
+    expired = 0
+    for skin in skins:
+        tradable_info = skin.get("tradable_info") or {}
+        if not tradable_info.get("is_tradable", True) and trade_lock_state(tradable_info, now) == "unlocked":
+            skin["tradable_info"] = build_tradable_info("Yes")
+            expired += 1
+    return expired
+
+
+def next_unlock_epoch(skins):
+    """Earliest pending unlock time among ``skins``, or None when nothing is locked."""
+    pending = [
+        (skin.get("tradable_info") or {}).get("unlock_epoch")
+        for skin in skins
+        if not (skin.get("tradable_info") or {}).get("is_tradable", True)
+    ]
+    pending = [epoch for epoch in pending if epoch is not None]
+    return min(pending) if pending else None
+
+
 def exterior_text(desc):
     """Extract exterior quality from item description."""
     for tag in desc.get("tags", []):
@@ -186,113 +278,108 @@ def exterior_text(desc):
             return d.get("value", "").replace("Exterior:", "").strip()
     return None
 
-def identify_item_types(name, desc=None):
-    """Identify weapon and item types from item name and description."""
+# Weapon names ordered by priority: longer names win ("M9 Bayonet" over "Bayonet").
+_WEAPONS_BY_PRIORITY = sorted(WEAPON_TYPES, key=len, reverse=True)
+_WEAPON_RANKS = {weapon.lower(): (rank, weapon) for rank, weapon in enumerate(_WEAPONS_BY_PRIORITY)}
+# Zero-width lookahead so overlapping names are all reported; at each position
+# the longest (highest priority) alternative is captured.
+_WEAPON_RE = re.compile(
+    "(?=(" + "|".join(re.escape(weapon.lower()) for weapon in _WEAPONS_BY_PRIORITY) + "))"
+)
+
+# Substrings of desc["type"], checked in order
+_DESC_TYPE_RULES = [
+    (item_type, re.compile(re.escape(item_type)))
+    for item_type in ("Agent", "Equipment", "Music Kit", "Collectible", "Pass", "Graffiti", "Sticker")
+]
+
+# Exact "Type" tag names
+_TYPE_TAG_ITEM_TYPES = {
+    "Agent": "Agent",
+    "Equipment": "Equipment",
+    "Collectible": "Collectible",
+    "Gloves": "Gloves",
+}
+
+
+def _keyword_rule(item_type, keywords, ignore_case=False):
+    pattern = "|".join(re.escape(keyword.lower() if ignore_case else keyword) for keyword in keywords)
+    return item_type, re.compile(pattern), ignore_case
+
+
+# Name fallbacks, checked in order; ignore_case rules match against the lowercased name
+_NAME_RULES = [
+    _keyword_rule("Knife", ["Knife", "Bayonet", "Karambit", "Daggers"], ignore_case=True),
+    _keyword_rule("Pistol", ["Pistol", "Glock", "USP", "P250", "Five-SeveN", "Tec-9", "CZ75", "Dual Berettas", "Desert Eagle", "P2000", "R8 Revolver"], ignore_case=True),
+    _keyword_rule("SMG", ["SMG", "MP9", "MAC-10", "MP7", "MP5", "UMP", "P90", "PP-Bizon"], ignore_case=True),
+    _keyword_rule("Rifle", ["AK-47", "M4A4", "M4A1", "Galil", "FAMAS", "SG 553", "AUG"], ignore_case=True),
+    _keyword_rule("Sniper Rifle", ["AWP", "SSG 08", "SCAR-20", "G3SG1"], ignore_case=True),
+    _keyword_rule("Shotgun", ["Nova", "XM1014", "MAG-7", "Sawed-Off"], ignore_case=True),
+    _keyword_rule("Machinegun", ["M249", "Negev"], ignore_case=True),
+    _keyword_rule("Gloves", ["Glove", "Hand Wraps", "Driver Gloves"]),
+    _keyword_rule("Agent", ["Agent", "Operator", "Enforcer", "Soldier"]),
+    _keyword_rule("Sticker", ["Sticker"]),
+    _keyword_rule("Graffiti", ["Graffiti", "Spray"]),
+    _keyword_rule("Music Kit", ["Music Kit"]),
+    _keyword_rule("Collectible", ["Case", "Container"]),
+    _keyword_rule("Tool", ["Key"]),
+    _keyword_rule("Pass", ["Pass", "Operation"]),
+    _keyword_rule("Tool", ["Tool", "Kit"]),
+    _keyword_rule("Tag", ["Tag", "Label"]),
+    _keyword_rule("Equipment", ["Equipment", "Defuse Kit"]),
+]
+
+
+@lru_cache(maxsize=8192)
+def _classify_item(name, type_field, type_tag):
+    """Classify an item from the only inputs that influence the result."""
+    lowered = name.lower()
+
+    # First identify specific weapon type
     weapon_type = None
+    matches = _WEAPON_RE.findall(lowered)
+    if matches:
+        weapon_type = min(_WEAPON_RANKS[match] for match in matches)[1]
+
     item_type = None
-    
-    # First identify specific weapon type
-    for weapon in sorted(WEAPON_TYPES, key=len, reverse=True):
-        if weapon.lower() in name.lower():
-            weapon_type = weapon
-            break
-    
-    # Check tags first if we have the full description object
-    if desc and isinstance(desc, dict):
-        # Check the "type" field directly first
-        if "type" in desc and isinstance(desc["type"], str):
-            item_type_str = desc["type"]
-            # Check for specific item types in the type field
-            if "Agent" in item_type_str:
-                item_type = "Agent"
-            elif "Equipment" in item_type_str:
-                item_type = "Equipment"
-            elif "Music Kit" in item_type_str:
-                item_type = "Music Kit"
-            elif "Collectible" in item_type_str:
-                item_type = "Collectible"
-            elif "Pass" in item_type_str:
-                item_type = "Pass"
-            elif "Graffiti" in item_type_str:
-                item_type = "Graffiti"
-            elif "Sticker" in item_type_str:
-                item_type = "Sticker"
-                
-        # Check tags for Type information
-        if not item_type:
-            tags = desc.get("tags", [])
-            for tag in tags:
-                if tag.get("category") == "Type":
-                    tag_name = tag.get("localized_tag_name", "")
-                    if tag_name == "Agent":
-                        item_type = "Agent"
-                    elif tag_name == "Equipment":
-                        item_type = "Equipment"
-                    elif tag_name == "Collectible":
-                        item_type = "Collectible"
-                    elif tag_name == "Gloves":
-                        item_type = "Gloves"
-    
+    if type_field is not None:
+        for candidate, pattern in _DESC_TYPE_RULES:
+            if pattern.search(type_field):
+                item_type = candidate
+                break
+
+    if not item_type and type_tag is not None:
+        item_type = _TYPE_TAG_ITEM_TYPES[type_tag]
+
     # If we still haven't determined the type, use name matching
     if not item_type:
-        # For knives
-        if any(knife.lower() in name.lower() for knife in ["Knife", "Bayonet", "Karambit", "Daggers"]):
-            item_type = "Knife"
-        # For pistols
-        elif any(x.lower() in name.lower() for x in ["Pistol", "Glock", "USP", "P250", "Five-SeveN", "Tec-9", "CZ75", "Dual Berettas", "Desert Eagle", "P2000", "R8 Revolver"]):
-            item_type = "Pistol"
-        # For SMGs
-        elif any(x.lower() in name.lower() for x in ["SMG", "MP9", "MAC-10", "MP7", "MP5", "UMP", "P90", "PP-Bizon"]):
-            item_type = "SMG"
-        # For rifles
-        elif any(x.lower() in name.lower() for x in ["AK-47", "M4A4", "M4A1", "Galil", "FAMAS", "SG 553", "AUG"]):
-            item_type = "Rifle"
-        # For sniper rifles
-        elif any(x.lower() in name.lower() for x in ["AWP", "SSG 08", "SCAR-20", "G3SG1"]):
-            item_type = "Sniper Rifle"
-        # For shotguns
-        elif any(x.lower() in name.lower() for x in ["Nova", "XM1014", "MAG-7", "Sawed-Off"]):
-            item_type = "Shotgun"
-        # For machineguns
-        elif any(x.lower() in name.lower() for x in ["M249", "Negev"]):
-            item_type = "Machinegun"
-        # For gloves
-        elif "Glove" in name or "Hand Wraps" in name or "Driver Gloves" in name:
-            item_type = "Gloves"
-        # For agents
-        elif "Agent" in name or "Operator" in name or "Enforcer" in name or "Soldier" in name:
-            item_type = "Agent"
-        # For stickers
-        elif "Sticker" in name:
-            item_type = "Sticker"
-        # For graffiti
-        elif "Graffiti" in name or "Spray" in name:
-            item_type = "Graffiti"
-        # For music kits
-        elif "Music Kit" in name:
-            item_type = "Music Kit"
-        # For cases and containers
-        elif "Case" in name or "Container" in name:
-            item_type = "Collectible"
-        # For keys
-        elif "Key" in name:
-            item_type = "Tool"
-        # For passes
-        elif "Pass" in name or "Operation" in name:
-            item_type = "Pass"
-        # For tools
-        elif "Tool" in name or "Kit" in name:
-            item_type = "Tool"
-        # For tags
-        elif "Tag" in name or "Label" in name:
-            item_type = "Tag"
-        # For equipment
-        elif "Equipment" in name or "Defuse Kit" in name:
-            item_type = "Equipment"
-    
+        for candidate, pattern, ignore_case in _NAME_RULES:
+            if pattern.search(lowered if ignore_case else name):
+                item_type = candidate
+                break
+
     return weapon_type, item_type
 
 
+def identify_item_types(name, desc=None):
+    """Identify weapon and item types from item name and description."""
+    type_field = None
+    type_tag = None
+
+    if desc and isinstance(desc, dict):
+        if isinstance(desc.get("type"), str):
+            type_field = desc["type"]
+
+        # The last recognised "Type" tag wins
+        for tag in desc.get("tags", []):
+            if tag.get("category") == "Type":
+                tag_name = tag.get("localized_tag_name", "")
+                if tag_name in _TYPE_TAG_ITEM_TYPES:
+                    type_tag = tag_name
+
+    return _classify_item(name, type_field, type_tag)
+
+
 def get_filter_counts(skins):
     """Generate filter options with counts."""
     # Define categories to skip
@@ -332,3 +419,163 @@ def get_filter_counts(skins):
         'weapon_types': weapon_filters,
         'item_types': item_filters,
     }
+
+
+# Facet groups as exposed by get_filter_counts
+FACET_GROUPS = ("tradable", "weapon_types", "item_types")
+FACET_SCOPES = ("all", "selected")
+# Item types left out of filter counts (see get_filter_counts)
+_UNCOUNTED_ITEM_TYPES = frozenset(["C4", "Graffiti", "Pass", "Tag", "Tool"])
+
+
+def _facet_values(skin):
+    tradable_info = skin.get("tradable_info", {}) or {}
+    return {
+        # Files from before tradable_info still carry the raw string in "tradable"
+        "tradable": tradable_info.get("raw") or skin.get("tradable", "Yes"),
+        "weapon_types": skin.get("weapon_type", "Other"),
+        "item_types": skin.get("item_type", "Other"),
+    }
+
+
+def _empty_facet_scope():
+    return {
+        "counts": {group: {} for group in FACET_GROUPS},
+        "postings": {group: {} for group in FACET_GROUPS},
+    }
+
+
+def _add_to_facet_scope(scope, position, skin):
+    # Skipped categories can still be filtered on but are not counted
+    counted = skin.get("item_type", "Other") not in _UNCOUNTED_ITEM_TYPES
+    for group, value in _facet_values(skin).items():
+        insort(scope["postings"][group].setdefault(value, []), position)
+        if counted:
+            scope["counts"][group][value] = scope["counts"][group].get(value, 0) + 1
+
+
+def _remove_from_facet_scope(scope, position, skin):
+    counted = skin.get("item_type", "Other") not in _UNCOUNTED_ITEM_TYPES
+    for group, value in _facet_values(skin).items():
+        postings = scope["postings"][group].get(value, [])
+        idx = bisect_left(postings, position)
+        if idx >= len(postings) or postings[idx] != position:
+            continue
+        del postings[idx]
+        if not postings:
+            del scope["postings"][group][value]
+        if counted and value in scope["counts"][group]:
+            scope["counts"][group][value] -= 1
+            if scope["counts"][group][value] <= 0:
+                del scope["counts"][group][value]
+
+
+def build_facet_index(skins):
+    """Build filter counts and sorted position postings for all and selected skins.
+
+    Positions are indexes into ``skins``. The index is stored with the
+    inventory so views never have to scan skins to render filters.
+    """
+    index = {scope: _empty_facet_scope() for scope in FACET_SCOPES}
+    for position, skin in enumerate(skins):
+        _add_to_facet_scope(index["all"], position, skin)
+        if skin.get("selected", False):
+            _add_to_facet_scope(index["selected"], position, skin)
+    return index
+
+
+def update_facet_selection(index, position, skin, selected):
+    """Move a skin in or out of the "selected" scope after its selection changed."""
+    scope = index["selected"]
+    if selected:
+        _remove_from_facet_scope(scope, position, skin)
+        _add_to_facet_scope(scope, position, skin)
+    else:
+        _remove_from_facet_scope(scope, position, skin)
+
+
+def facet_counts(index, scope="all"):
+    """Return filter options with counts in the same shape as get_filter_counts."""
+    counts = index[scope]["counts"]
+    tradable_filters = list(counts["tradable"].items())
+    weapon_filters = list(counts["weapon_types"].items())
+    item_filters = list(counts["item_types"].items())
+
+    tradable_filters.sort(key=lambda x: (x[0] != "Yes", x))
+    weapon_filters.sort()
+    item_filters.sort()
+
+    return {
+        'tradable': tradable_filters,
+        'weapon_types': weapon_filters,
+        'item_types': item_filters,
+    }
+
+
+def filter_positions(index, scope="all", selections=None):
+    """Return sorted skin positions matching the selected facet values.
+
+    ``selections`` maps facet groups to accepted values; values within a
+    group are OR-ed and groups are AND-ed, like the client-side filters.
+    Returns None when no group is constrained (every skin in the scope).
+    """
+    result = None
+    postings = index[scope]["postings"]
+    for group, values in (selections or {}).items():
+        if not values:
+            continue
+        group_positions = set()
+        for value in values:
+            group_positions.update(postings[group].get(value, ()))
+        result = group_positions if result is None else result & group_positions
+        if not result:
+            return []
+    return None if result is None else sorted(result)
+
+
+SORT_MODES = ("tradable-desc", "price-asc", "price-desc", "float-asc", "float-desc")
+
+
+def _sort_value(skin, field):
+    try:
+        value = float(skin.get(field))
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def sort_skins(skins, mode):
+    """Order skins like the showroom sort menu; skins without a value go last.
+
+    ``tradable-desc`` (and unknown modes) keep the stored order.
+    """
+    if mode in ("price-asc", "price-desc"):
+        field = "price_eur"
+    elif mode in ("float-asc", "float-desc"):
+        field = "float"
+    else:
+        return list(skins)
+
+    keyed = [(_sort_value(skin, field), skin) for skin in skins]
+    missing = [skin for value, skin in keyed if value is None]
+    present = [(value, skin) for value, skin in keyed if value is not None]
+    present.sort(key=lambda pair: pair[0], reverse=mode.endswith("-desc"))
+    return [skin for _, skin in present] + missing
+
+
+def skin_search_text(skin):
+    """Lowercased text a search term is matched against, like the card's visible text."""
+    tradable_info = skin.get("tradable_info", {}) or {}
+    parts = [
+        skin.get("name"),
+        skin.get("exterior"),
+        skin.get("collection"),
+        skin.get("rarity"),
+        skin.get("weapon_type"),
+        skin.get("item_type"),
+        tradable_info.get("unlock_text"),
+        skin.get("price_eur"),
+    ]
+    for attachment in (skin.get("stickers") or []) + (skin.get("patches") or []):
+        parts.append(attachment.get("name"))
+    return " ".join(part for part in parts if isinstance(part, str)).lower()
@@ -0,0 +1,245 @@
+"""Local cache for Steam CDN images shown on skin cards.
+
+Source images are fetched once, kept on disk under ``ICON_CACHE_DIR`` and,
+when Pillow is installed, re-encoded as WebP/AVIF at the size the cards
+actually display. The directory is trimmed least-recently-used first once
+it grows past ``ICON_CACHE_MAX_BYTES``.
+"""
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow is optional; originals are served as they are
+    Image = None
+    features = None
+
+ECONOMY_IMAGE_BASE = "https://community.cloudflare.steamstatic.com/economy/image/"
+
+# Bounding boxes at 2x the CSS size of the card image and the sticker thumbs
+ICON_VARIANTS = {
+    "skin": (512, 340),
+    "sticker": (60, 48),
+}
+
+# Output formats in order of preference, with their MIME types
+ICON_FORMATS = (
+    ("avif", "image/avif"),
+    ("webp", "image/webp"),
+)
+
+DEFAULT_CDN_HOSTS = (
+    "community.cloudflare.steamstatic.com",
+    "community.akamai.steamstatic.com",
+    "steamcommunity-a.akamaihd.net",
+    "cdn.steamstatic.com",
+    "cdn.cloudflare.steamstatic.com",
+    "cdn.akamai.steamstatic.com",
+)
+
+# Refuse to cache anything larger than this from the CDN
+MAX_SOURCE_BYTES = 5 * 1024 * 1024
+
+_ORIGINAL = "orig"
+_size_lock = threading.Lock()
+_size_state = {"bytes": None}
+
+
+class IconFetchError(Exception):
+    """Raised when a source image cannot be fetched or decoded."""
+
+
+def _cache_dir():
+    return getattr(settings, "ICON_CACHE_DIR", os.path.join(settings.BASE_DIR, "data", "icon_cache"))
+
+
+def _max_cache_bytes():
+    return int(getattr(settings, "ICON_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+
+def source_url(icon_url):
+    """Return the absolute CDN URL for an ``icon_url`` (economy hashes are relative)."""
+    if not icon_url:
+        return ""
+    if icon_url.startswith(("http://", "https://")):
+        return icon_url
+    return ECONOMY_IMAGE_BASE + icon_url
+
+
+def is_allowed_source(url):
+    """Only images from the configured CDN hosts are proxied."""
+    parts = urlsplit(url)
+    hosts = getattr(settings, "ICON_CDN_HOSTS", DEFAULT_CDN_HOSTS)
+    return parts.scheme in ("http", "https") and parts.hostname in hosts
+
+
+def supported_formats():
+    """Output formats the installed Pillow can encode."""
+    if Image is None:
+        return []
+    return [fmt for fmt, _ in ICON_FORMATS if features.check(fmt)]
+
+
+def negotiate_format(accept_header):
+    """Pick the best encodable format the client accepts, or None for the original."""
+    available = supported_formats()
+    for fmt, mime in ICON_FORMATS:
+        if fmt in available and mime in (accept_header or ""):
+            return fmt
+    return None
+
+
+def _sniff_content_type(data):
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[4:12] in (b"ftypavif", b"ftypavis"):
+        return "image/avif"
+    return None
+
+
+def _cache_path(url, variant, fmt):
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    suffix = _ORIGINAL if fmt is None else f"{variant}.{fmt}"
+    return os.path.join(_cache_dir(), digest[:2], f"{digest}.{suffix}")
+
+
+def _read_cached(path):
+    try:
+        with open(path, "rb") as fp:
+            data = fp.read()
+    except OSError:
+        return None
+    # Reads refresh the mtime, which is what eviction orders by
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+
+def _store(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".icon-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    with _size_lock:
+        if _size_state["bytes"] is None:
+            _size_state["bytes"] = _scan_cache_bytes()
+        else:
+            _size_state["bytes"] += len(data)
+        if _size_state["bytes"] > _max_cache_bytes():
+            _size_state["bytes"] = _evict(_max_cache_bytes() * 9 // 10)
+
+
+def _iter_cache_files():
+    for root, _, files in os.walk(_cache_dir()):
+        for name in files:
+            if name.startswith(".icon-"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            yield path, stat.st_mtime, stat.st_size
+
+
+def _scan_cache_bytes():
+    return sum(size for _, _, size in _iter_cache_files())
+
+
+def _evict(target_bytes):
+    """Delete least recently used files until the cache fits ``target_bytes``."""
+    entries = sorted(_iter_cache_files(), key=lambda entry: entry[1])
+    total = sum(size for _, _, size in entries)
+    for path, _, size in entries:
+        if total <= target_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+    return total
+
+
+def _fetch(url):
+    timeout = getattr(settings, "ICON_FETCH_TIMEOUT", 10)
+    try:
+        response = requests.get(url, timeout=timeout, stream=True)
+        response.raise_for_status()
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > MAX_SOURCE_BYTES:
+                raise IconFetchError(f"Image too large: {url}")
+            chunks.append(chunk)
+    except requests.RequestException as exc:
+        raise IconFetchError(f"Could not fetch {url}: {exc}") from exc
+
+    data = b"".join(chunks)
+    if _sniff_content_type(data) is None:
+        raise IconFetchError(f"Not an image: {url}")
+    return data
+
+
+def _get_original(url):
+    path = _cache_path(url, None, None)
+    data = _read_cached(path)
+    if data is None:
+        data = _fetch(url)
+        _store(path, data)
+    return data
+
+
+def _resize(data, variant, fmt):
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            image.thumbnail(ICON_VARIANTS[variant], Image.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, format=fmt.upper(), quality=80)
+    except (OSError, ValueError) as exc:
+        raise IconFetchError(f"Could not convert image to {fmt}: {exc}") from exc
+    return output.getvalue()
+
+
+def get_icon(url, variant, fmt=None):
+    """Return ``(bytes, content_type)`` for ``url``, fetching and converting on a miss.
+
+    ``fmt`` is one of ``supported_formats()`` or None for the original image.
+    """
+    if fmt is None:
+        data = _get_original(url)
+        return data, _sniff_content_type(data)
+
+    path = _cache_path(url, variant, fmt)
+    data = _read_cached(path)
+    if data is None:
+        data = _resize(_get_original(url), variant, fmt)
+        _store(path, data)
+    return data, dict(ICON_FORMATS)[fmt]
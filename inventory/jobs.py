@@ -0,0 +1,209 @@
+"""Background queue for manual inventory refreshes.
+
+The admin view spools the submitted payloads to ``REFRESH_JOB_DIR`` and
+records a ``RefreshJob``; a single worker thread runs
+``update_inventory_from_manual`` on them so web workers return right away.
+Job rows live in the database, so any process can report their status.
+Submitting the same payloads again while a job for them is still queued or
+running returns that job instead of importing twice, as long as the job is
+alive: queued on this process's worker, or running with a recent heartbeat.
+Jobs left behind by a restarted process are failed and submitted anew.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .merge import describe_merge
+from .models import RefreshJob
+from .profiles import get_profile, use_profile
+
+_executor_lock = threading.Lock()
+_executor_state = {"executor": None}
+# Ids of jobs submitted to this process's executor that have not finished
+_owned_jobs = set()
+
+
+def _job_dir():
+    return getattr(settings, "REFRESH_JOB_DIR", os.path.join(settings.BASE_DIR, "data", "refresh_jobs"))
+
+
+def _get_executor():
+    with _executor_lock:
+        if _executor_state["executor"] is None:
+            # One worker: refreshes rewrite the whole inventory and must not overlap
+            _executor_state["executor"] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inventory-refresh")
+        return _executor_state["executor"]
+
+
+def _iter_segment_chunks(segment, chunk_size=64 * 1024):
+    if isinstance(segment, str):
+        yield segment.encode("utf-8")
+    elif hasattr(segment, "chunks"):
+        yield from segment.chunks(chunk_size)
+    else:
+        while True:
+            chunk = segment.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+
+def _spool_payloads(segments):
+    """Copy payload segments to files; returns ``(paths, sha256 hex digest)``."""
+    directory = _job_dir()
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    paths = []
+    try:
+        for segment in segments:
+            fd, path = tempfile.mkstemp(dir=directory, prefix="payload-", suffix=".json")
+            paths.append(path)
+            with os.fdopen(fd, "wb") as fp:
+                for chunk in _iter_segment_chunks(segment):
+                    digest.update(chunk)
+                    fp.write(chunk)
+            # Keep ["a", "b"] and ["ab"] apart
+            digest.update(b"\0")
+    except BaseException:
+        _remove_files(paths)
+        raise
+    return paths, digest.hexdigest()
+
+
+def _remove_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _abandon_stale_jobs():
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, "REFRESH_JOB_STALE_AFTER", 3600))
+    stale = RefreshJob.objects.filter(status__in=RefreshJob.ACTIVE_STATUSES, created_at__lt=cutoff)
+    for job in stale:
+        _remove_files(job.payload_files)
+    stale.update(
+        status=RefreshJob.STATUS_FAILED,
+        error="Abandoned before it finished",
+        finished_at=timezone.now(),
+    )
+
+
+def _is_alive(job):
+    """True if ``job`` will still run or finish: owned by this process or heartbeating."""
+    with _executor_lock:
+        if job.pk in _owned_jobs:
+            return True
+    timeout = timedelta(seconds=getattr(settings, "REFRESH_JOB_HEARTBEAT_TIMEOUT", 300))
+    return job.heartbeat_at is not None and job.heartbeat_at >= timezone.now() - timeout
+
+
+def _abandon_job(job):
+    # Conditional, so a job another process just picked up is left alone
+    abandoned = RefreshJob.objects.filter(
+        pk=job.pk, status=job.status, heartbeat_at=job.heartbeat_at
+    ).update(status=RefreshJob.STATUS_FAILED, error="Abandoned before it finished", finished_at=timezone.now())
+    if abandoned:
+        _remove_files(job.payload_files)
+    return bool(abandoned)
+
+
+def enqueue_refresh(segments, profile=None):
+    """Queue a refresh of the given payload segments and return its ``RefreshJob``.
+
+    ``segments`` are pasted strings or uploaded files, in the order
+    ``iter_inventory_payloads`` should read them. The job refreshes
+    ``profile``, by default the active one.
+    """
+    slug = get_profile(profile).slug
+    paths, payload_hash = _spool_payloads(segments)
+    with transaction.atomic():
+        _abandon_stale_jobs()
+        existing = RefreshJob.objects.filter(
+            status__in=RefreshJob.ACTIVE_STATUSES, profile=slug, payload_hash=payload_hash
+        ).first()
+        if existing is not None and (_is_alive(existing) or not _abandon_job(existing)):
+            _remove_files(paths)
+            return existing
+        job = RefreshJob.objects.create(profile=slug, payload_hash=payload_hash, payload_files=paths)
+    if getattr(settings, "INVENTORY_REFRESH_ASYNC", True):
+        with _executor_lock:
+            _owned_jobs.add(job.pk)
+        _get_executor().submit(_run_in_worker, job.pk)
+    else:
+        run_refresh_job(job.pk)
+        job.refresh_from_db()
+    return job
+
+
+def _run_in_worker(job_id):
+    close_old_connections()
+    try:
+        run_refresh_job(job_id)
+    finally:
+        with _executor_lock:
+            _owned_jobs.discard(job_id)
+        # The worker thread has its own connection; do not leak it
+        connection.close()
+
+
+def run_refresh_job(job_id):
+    """Run a queued job on the current thread."""
+    from .steam_api import iter_inventory_payloads, update_inventory_from_manual
+
+    job = RefreshJob.objects.filter(pk=job_id, status=RefreshJob.STATUS_QUEUED).first()
+    if job is None:
+        return
+    started = RefreshJob.objects.filter(pk=job_id, status=RefreshJob.STATUS_QUEUED).update(
+        status=RefreshJob.STATUS_RUNNING, started_at=timezone.now(), heartbeat_at=timezone.now()
+    )
+    if not started:
+        # Abandoned and resubmitted meanwhile
+        return
+
+    def progress(stage, processed):
+        RefreshJob.objects.filter(pk=job_id).update(stage=stage, processed=processed, heartbeat_at=timezone.now())
+
+    files = []
+    try:
+        files = [open(path, "rb") for path in job.payload_files]
+        with use_profile(job.profile):
+            *_, report = update_inventory_from_manual(iter_inventory_payloads(*files), progress=progress)
+    except Exception as exc:
+        print(f"Refresh job {job_id} failed: {exc}")
+        error = str(exc) if isinstance(exc, ValueError) else f"Unexpected error processing inventory: {exc}"
+        RefreshJob.objects.filter(pk=job_id).update(
+            status=RefreshJob.STATUS_FAILED, error=error, finished_at=timezone.now()
+        )
+    else:
+        RefreshJob.objects.filter(pk=job_id).update(
+            status=RefreshJob.STATUS_SUCCEEDED,
+            stage="",
+            result=f"Inventory refreshed: {describe_merge(report)}",
+            finished_at=timezone.now(),
+        )
+    finally:
+        for fp in files:
+            fp.close()
+        _remove_files(job.payload_files)
+
+
+def job_status(job):
+    """JSON-serializable status of ``job`` for the admin page."""
+    return {
+        "id": job.pk,
+        "status": job.status,
+        "stage": job.stage,
+        "processed": job.processed,
+        "result": job.result,
+        "error": job.error,
+        "finished": job.status not in RefreshJob.ACTIVE_STATUSES,
+    }
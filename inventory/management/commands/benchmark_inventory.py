@@ -0,0 +1,121 @@
+import platform
+import sys
+from datetime import datetime, timezone
+from importlib import import_module
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory import codec
+from inventory.benchmarks import DEFAULT_SIZES, SUITES
+from inventory.steam_api import SCHEMA_VERSION
+
+SUITE_MODULES = (
+    "inventory.benchmarks.classifier",
+    "inventory.benchmarks.memory",
+    "inventory.benchmarks.codec",
+    "inventory.benchmarks.pipeline",
+    "inventory.benchmarks.pages",
+)
+
+
+def _parse_sizes(value):
+    try:
+        sizes = tuple(int(size) for size in value.split(",") if size.strip())
+    except ValueError:
+        raise CommandError(f"Invalid --sizes: {value}") from None
+    if not sizes or any(size <= 0 for size in sizes):
+        raise CommandError(f"Invalid --sizes: {value}")
+    return sizes
+
+
+class Command(BaseCommand):
+    help = "Run inventory processing benchmarks."
+
+    def add_arguments(self, parser):
+        for module in SUITE_MODULES:
+            import_module(module)
+
+        parser.add_argument(
+            "suites",
+            nargs="*",
+            help=f"Suites to run: {', '.join(sorted(SUITES))} (default: all).",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions; the best run is reported.")
+        parser.add_argument("--data", dest="data_path", default=None, help="Inventory data file (defaults to LOCAL_DATA_FILE).")
+        parser.add_argument(
+            "--sizes",
+            default=",".join(str(size) for size in DEFAULT_SIZES),
+            help="Comma-separated asset counts of the synthetic inventories (pipeline and pages suites).",
+        )
+        parser.add_argument("--json", dest="json_path", default=None, help="Also write the results to this JSON file.")
+        parser.add_argument(
+            "--compare",
+            dest="baseline_path",
+            default=None,
+            help="JSON results of an earlier run; each case is reported with its change in time.",
+        )
+
+    def handle(self, *args, **options):
+        names = options["suites"] or sorted(SUITES)
+        unknown = sorted(set(names) - set(SUITES))
+        if unknown:
+            raise CommandError(f"Unknown benchmark suite(s): {', '.join(unknown)}")
+        sizes = _parse_sizes(options["sizes"])
+        baseline = self._load_baseline(options["baseline_path"])
+
+        results = []
+        for name in names:
+            for result in SUITES[name](repeat=options["repeat"], data_path=options["data_path"], sizes=sizes):
+                previous = baseline.get((result["suite"], result["case"]))
+                if previous:
+                    result["change"] = result["seconds"] / previous - 1
+                results.append(result)
+                self.stdout.write(self._format(result))
+
+        if options["json_path"]:
+            document = {"environment": self._environment(), "results": results}
+            with open(options["json_path"], "wb") as fp:
+                fp.write(codec.dumps(document, pretty=True))
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['json_path']}"))
+
+    @staticmethod
+    def _load_baseline(path):
+        """``(suite, case)`` to seconds from a ``--json`` file of an earlier run."""
+        if not path:
+            return {}
+        try:
+            with open(path, "rb") as fp:
+                document = codec.loads(fp.read())
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read baseline {path}: {exc}") from exc
+        return {
+            (result["suite"], result["case"]): result["seconds"]
+            for result in document.get("results", [])
+            if result.get("seconds")
+        }
+
+    @staticmethod
+    def _environment():
+        return {
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "django": django.get_version(),
+            "platform": platform.platform(),
+            "json_codec": codec.codec_name(),
+            "schema_version": SCHEMA_VERSION,
+        }
+
+    @staticmethod
+    def _format(result):
+        extras = []
+        for key, value in result.items():
+            if key in {"suite", "case", "seconds"}:
+                continue
+            if key == "change":
+                value = f"{value:+.1%}"
+            elif isinstance(value, float):
+                value = f"{value:.2f}"
+            extras.append(f"{key}={value}")
+        line = f"{result['suite']:<12} {result['case']:<34} {result['seconds'] * 1000:10.3f} ms"
+        return f"{line}  {' '.join(extras)}" if extras else line
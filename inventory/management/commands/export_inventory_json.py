@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory import codec
+from inventory.profiles import UnknownProfile
+from inventory.storage import _pack_attachments, get_storage
+
+
+class Command(BaseCommand):
+    help = "Write the stored inventory as indented JSON, e.g. for reviewing or diffing it."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default=None,
+            help="Output file (defaults to standard output).",
+        )
+        parser.add_argument("--profile", default=None, help="Profile slug (defaults to the default showroom).")
+
+    def handle(self, *args, **options):
+        try:
+            storage = get_storage(options["profile"])
+        except UnknownProfile as exc:
+            raise CommandError(f"Unknown profile: {exc}") from exc
+        data = storage.read()
+        if data is None:
+            raise CommandError("No inventory data has been saved yet.")
+
+        # Same layout as the data file, so the export can be loaded back as is
+        output = codec.dumps(_pack_attachments(data), pretty=True)
+        if options["path"] is None:
+            self.stdout.write(output.decode("utf-8"))
+            return
+
+        with open(options["path"], "wb") as fp:
+            fp.write(output)
+        self.stdout.write(self.style.SUCCESS(f"Exported {len(data.get('skins', []))} skins to {options['path']}"))
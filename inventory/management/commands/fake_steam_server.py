@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory import codec
+from inventory.fake_steam import FakeSteamServer
+from inventory.profiles import get_profile
+
+
+class Command(BaseCommand):
+    help = "Serve saved inventory payloads like Steam's inventory endpoint, for offline fetch_inventory runs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--main", help="Payload JSON served as context 2.")
+        parser.add_argument("--protected", help="Payload JSON served as context 16.")
+        parser.add_argument("--steam-id", default=None, help="Steam ID to serve (defaults to STEAM_ID).")
+
+    def handle(self, *args, **options):
+        steam_id = options["steam_id"] or get_profile().steam_id
+        inventories = {}
+        for context, option in (("2", "main"), ("16", "protected")):
+            if not options[option]:
+                continue
+            try:
+                with open(options[option], "rb") as fp:
+                    inventories[(steam_id, context)] = codec.loads(fp.read())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not load {options[option]}: {exc}") from exc
+
+        server = FakeSteamServer(inventories, port=options["port"], verbose=True)
+        self.stdout.write(f"Serving {len(inventories)} contexts for {steam_id}; set STEAM_INVENTORY_BASE_URL={server.base_url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.merge import describe_merge
+from inventory.profiles import UnknownProfile, get_profiles
+from inventory.steam_fetcher import SteamFetchError, refresh_inventory_from_steam
+
+
+class Command(BaseCommand):
+    help = "Fetch the inventory from Steam and merge it into the stored one, e.g. from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profile", default=None, help="Profile slug (defaults to the default showroom).")
+        parser.add_argument("--all-profiles", action="store_true", help="Refresh every configured showroom.")
+
+    def handle(self, *args, **options):
+        slugs = list(get_profiles()) if options["all_profiles"] else [options["profile"]]
+        failed = 0
+        for slug in slugs:
+            try:
+                skins, _, _, report = refresh_inventory_from_steam(slug)
+            except UnknownProfile as exc:
+                raise CommandError(f"Unknown profile: {exc}") from exc
+            except (SteamFetchError, ValueError) as exc:
+                failed += 1
+                self.stderr.write(f"{slug or 'default'}: {exc}")
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f"{slug or 'default'}: {len(skins)} skins ({describe_merge(report)})"
+            ))
+        if failed:
+            raise CommandError(f"{failed} of {len(slugs)} inventories could not be fetched")
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.steam_api import load_inventory_from_file, save_inventory_to_file
+from inventory.storage import DatabaseStorage, JsonFileStorage
+
+
+class Command(BaseCommand):
+    help = "Import the legacy inventory JSON file into the database storage backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default=None,
+            help="JSON file to import (defaults to LOCAL_DATA_FILE).",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"] or settings.LOCAL_DATA_FILE
+        source = JsonFileStorage(path)
+        try:
+            data = source.read()
+        except ValueError as exc:
+            raise CommandError(f"Could not parse {path}: {exc}") from exc
+        if data is None:
+            raise CommandError(f"No inventory data found at {path}")
+
+        # Reuse the regular load path so legacy fields are normalized on the way in.
+        skins, total_before_filters = load_inventory_from_file(auto_resave=False, storage=source)
+        total = data.get("total", len(skins))
+        save_inventory_to_file(skins, total, total_before_filters, storage=DatabaseStorage(), normalized=True)
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {len(skins)} skins from {path}"))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.icon_cache import IconFetchError, get_icon, is_allowed_source, source_url, supported_formats
+from inventory.profiles import UnknownProfile, use_profile
+from inventory.steam_api import load_inventory_from_file
+
+
+class Command(BaseCommand):
+    help = "Fetch skin and sticker images into the local icon cache ahead of the first visitors."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--selected-only",
+            action="store_true",
+            help="Only warm images of skins shown on the public showroom.",
+        )
+        parser.add_argument("--profile", default=None, help="Profile slug (defaults to the default showroom).")
+
+    def handle(self, *args, **options):
+        try:
+            with use_profile(options["profile"]):
+                skins, _ = load_inventory_from_file(selected_only=options["selected_only"])
+        except UnknownProfile as exc:
+            raise CommandError(f"Unknown profile: {exc}") from exc
+
+        # One entry per image; the same sticker shows up on many skins
+        targets = {}
+        for skin in skins:
+            targets.setdefault(source_url(skin.get("icon_url")), "skin")
+            for attachment in (skin.get("stickers") or []) + (skin.get("patches") or []):
+                targets.setdefault(source_url(attachment.get("icon_url")), "sticker")
+        targets = {url: variant for url, variant in targets.items() if url and is_allowed_source(url)}
+
+        formats = [None] + supported_formats()
+        warmed = failed = 0
+        for url, variant in targets.items():
+            try:
+                for fmt in formats:
+                    get_icon(url, variant, fmt)
+            except IconFetchError as exc:
+                failed += 1
+                self.stderr.write(str(exc))
+            else:
+                warmed += 1
+
+        summary = f"Warmed {warmed} of {len(targets)} images ({', '.join(fmt or 'original' for fmt in formats)})"
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{summary}, {failed} failed"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,67 @@
+"""Merge a freshly fetched inventory into the stored one.
+
+Skins are matched on ``asset_id``. Stacked items share one asset id, and
+files from before asset ids were stored have none (those fall back to
+``name`` + ``exterior``), so every key maps to a queue of stored skins and
+each stored skin is claimed at most once. Identical duplicates therefore
+keep their own price and note instead of all taking the first one's.
+"""
+from collections import deque
+
+# Admin-maintained fields carried over from the stored skin
+CARRIED_FIELDS = ("selected", "price_eur", "note")
+
+
+def _merge_key(skin):
+    asset_id = skin.get("asset_id")
+    return asset_id if asset_id else (skin.get("name"), skin.get("exterior"))
+
+
+def _claim(index, key):
+    candidates = index.get(key)
+    return candidates.popleft() if candidates else None
+
+
+def merge_inventory(current_skins, incoming_skins):
+    """Carry admin metadata from ``current_skins`` onto ``incoming_skins``.
+
+    Both lists must already be normalized. Incoming skins are updated in
+    place and returned in their own order together with a report dict:
+    ``added`` (new skins), ``removed`` (stored skins no longer present) and
+    ``retained`` (``(stored, incoming)`` pairs that were matched).
+    """
+    index = {}
+    for skin in current_skins:
+        index.setdefault(_merge_key(skin), deque()).append(skin)
+
+    added = []
+    retained = []
+    for skin in incoming_skins:
+        previous = _claim(index, _merge_key(skin))
+        if previous is None and skin.get("asset_id"):
+            # Stored before asset ids were recorded
+            previous = _claim(index, (skin.get("name"), skin.get("exterior")))
+        if previous is None:
+            added.append(skin)
+            continue
+        for field in CARRIED_FIELDS:
+            skin[field] = previous.get(field)
+        retained.append((previous, skin))
+
+    removed = [skin for candidates in index.values() for skin in candidates]
+    return incoming_skins, {"added": added, "removed": removed, "retained": retained}
+
+
+def merge_is_noop(current_skins, merged_skins, report):
+    """True if writing ``merged_skins`` would store exactly ``current_skins`` again."""
+    if report["added"] or report["removed"] or len(current_skins) != len(merged_skins):
+        return False
+    return all(dict(old) == dict(new) for old, new in zip(current_skins, merged_skins))
+
+
+def describe_merge(report):
+    """One-line summary of a merge report for the admin page."""
+    return (
+        f"{len(report['added'])} added, {len(report['removed'])} removed, "
+        f"{len(report['retained'])} kept"
+    )
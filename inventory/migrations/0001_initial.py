@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('total_before_filters', models.PositiveIntegerField(default=0)),
+                ('generation', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Skin',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(db_index=True)),
+                ('asset_id', models.CharField(blank=True, db_index=True, max_length=32, null=True)),
+                ('name', models.CharField(max_length=255)),
+                ('icon_url', models.TextField(blank=True, default='')),
+                ('exterior', models.CharField(blank=True, max_length=64, null=True)),
+                ('tradable_raw', models.CharField(default='Yes', max_length=128)),
+                ('selected', models.BooleanField(db_index=True, default=False)),
+                ('weapon_type', models.CharField(db_index=True, default='Other', max_length=64)),
+                ('item_type', models.CharField(db_index=True, default='Other', max_length=64)),
+                ('rarity', models.CharField(blank=True, max_length=64, null=True)),
+                ('rarity_color', models.CharField(blank=True, max_length=16, null=True)),
+                ('inspect_link', models.TextField(blank=True, null=True)),
+                ('pattern_template', models.IntegerField(blank=True, null=True)),
+                ('float_value', models.FloatField(blank=True, null=True)),
+                ('collection', models.CharField(blank=True, max_length=255, null=True)),
+                ('price_eur', models.CharField(blank=True, max_length=32, null=True)),
+                ('note', models.CharField(blank=True, default='', max_length=500)),
+            ],
+            options={
+                'ordering': ('position',),
+            },
+        ),
+        migrations.CreateModel(
+            name='SkinSticker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('sticker', 'Sticker'), ('patch', 'Patch')], default='sticker', max_length=8)),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('name', models.CharField(blank=True, default='', max_length=255)),
+                ('icon_url', models.TextField(blank=True, default='')),
+                ('skin', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='inventory.skin')),
+            ],
+            options={
+                'ordering': ('id',),
+            },
+        ),
+    ]
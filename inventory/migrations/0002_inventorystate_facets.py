@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventorystate',
+            name='facets',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
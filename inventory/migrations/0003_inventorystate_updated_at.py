@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_inventorystate_facets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventorystate',
+            name='updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
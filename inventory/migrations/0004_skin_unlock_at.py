@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:25
+
+from django.db import migrations, models
+
+from inventory.helpers import parse_unlock_epoch
+
+
+def fill_unlock_at(apps, schema_editor):
+    Skin = apps.get_model('inventory', 'Skin')
+    for skin in Skin.objects.exclude(tradable_raw='Yes').only('pk', 'tradable_raw'):
+        unlock_at = parse_unlock_epoch(skin.tradable_raw)
+        if unlock_at is not None:
+            Skin.objects.filter(pk=skin.pk).update(unlock_at=unlock_at)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_inventorystate_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skin',
+            name='unlock_at',
+            field=models.BigIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(fill_unlock_at, migrations.RunPython.noop),
+    ]
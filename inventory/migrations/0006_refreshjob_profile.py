@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_refreshjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='refreshjob',
+            name='profile',
+            field=models.CharField(default='default', max_length=64),
+        ),
+    ]
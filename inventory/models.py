@@ -1,3 +1,109 @@
 from django.db import models
 
-# Create your models here.
+
+class InventoryState(models.Model):
+    """Inventory-wide totals plus a generation counter bumped on every save."""
+
+    SINGLETON_ID = 1
+
+    total = models.PositiveIntegerField(default=0)
+    total_before_filters = models.PositiveIntegerField(default=0)
+    generation = models.PositiveBigIntegerField(default=0)
+    # Filter counts and position postings, see helpers.build_facet_index
+    facets = models.JSONField(null=True, blank=True)
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Inventory (generation {self.generation})"
+
+
+class Skin(models.Model):
+    """A single inventory item as shown in the showroom."""
+
+    position = models.PositiveIntegerField(db_index=True)
+    asset_id = models.CharField(max_length=32, null=True, blank=True, db_index=True)
+    name = models.CharField(max_length=255)
+    icon_url = models.TextField(blank=True, default="")
+    exterior = models.CharField(max_length=64, null=True, blank=True)
+    tradable_raw = models.CharField(max_length=128, default="Yes")
+    # Parsed unlock time of a Trade Protected status (UTC epoch seconds)
+    unlock_at = models.BigIntegerField(null=True, blank=True, db_index=True)
+    selected = models.BooleanField(default=False, db_index=True)
+    weapon_type = models.CharField(max_length=64, default="Other", db_index=True)
+    item_type = models.CharField(max_length=64, default="Other", db_index=True)
+    rarity = models.CharField(max_length=64, null=True, blank=True)
+    rarity_color = models.CharField(max_length=16, null=True, blank=True)
+    inspect_link = models.TextField(null=True, blank=True)
+    pattern_template = models.IntegerField(null=True, blank=True)
+    float_value = models.FloatField(null=True, blank=True)
+    collection = models.CharField(max_length=255, null=True, blank=True)
+    price_eur = models.CharField(max_length=32, null=True, blank=True)
+    note = models.CharField(max_length=500, blank=True, default="")
+
+    class Meta:
+        ordering = ("position",)
+
+    def __str__(self):
+        return self.name
+
+
+class SkinSticker(models.Model):
+    """A sticker or agent patch applied to a skin."""
+
+    KIND_STICKER = "sticker"
+    KIND_PATCH = "patch"
+    KIND_CHOICES = (
+        (KIND_STICKER, "Sticker"),
+        (KIND_PATCH, "Patch"),
+    )
+
+    skin = models.ForeignKey(Skin, related_name="attachments", on_delete=models.CASCADE)
+    kind = models.CharField(max_length=8, choices=KIND_CHOICES, default=KIND_STICKER)
+    position = models.PositiveSmallIntegerField(default=0)
+    name = models.CharField(max_length=255, blank=True, default="")
+    icon_url = models.TextField(blank=True, default="")
+
+    class Meta:
+        ordering = ("id",)
+
+    def __str__(self):
+        return self.name
+
+
+class RefreshJob(models.Model):
+    """A queued manual inventory refresh, run in the background (see inventory.jobs)."""
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    )
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+    # Slug of the profile whose inventory is refreshed, see inventory.profiles
+    profile = models.CharField(max_length=64, default="default")
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True)
+    # Current step while running: parsing, merging or saving
+    stage = models.CharField(max_length=16, blank=True, default="")
+    processed = models.PositiveIntegerField(default=0)
+    # Hash of the submitted payloads, used to fold duplicate submissions
+    payload_hash = models.CharField(max_length=64, db_index=True)
+    payload_files = models.JSONField(default=list)
+    result = models.CharField(max_length=255, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Touched by the worker as the job moves through its stages
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"Refresh job {self.pk} ({self.status})"
@@ -0,0 +1,109 @@
+"""Trader profiles: one inventory shard per Steam ID.
+
+``INVENTORY_PROFILES`` maps URL slugs to a Steam ID and a data file. The
+default profile uses ``STEAM_ID``/``LOCAL_DATA_FILE`` and the plain URLs;
+the others are served under ``/buy/<slug>/`` and ``/manage/<slug>/``.
+Views run inside ``use_profile`` so storage, snapshots and caches resolve
+to the requested shard without passing the profile around.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.http import Http404
+
+try:
+    from asgiref.sync import iscoroutinefunction
+except ImportError:  # asgiref < 3.7, still allowed by Django 4.2
+    from asyncio import iscoroutinefunction
+
+DEFAULT_PROFILE = "default"
+
+_active_slug = ContextVar("inventory_profile", default=None)
+
+
+class UnknownProfile(LookupError):
+    """Raised for a slug that is not configured in ``INVENTORY_PROFILES``."""
+
+
+class InventoryProfile:
+    """A configured showroom: its slug, Steam ID and data file."""
+
+    __slots__ = ("slug", "steam_id", "data_file")
+
+    def __init__(self, slug, steam_id=None, data_file=None):
+        self.slug = slug
+        self.steam_id = steam_id
+        # None means LOCAL_DATA_FILE, read when used so overrides apply
+        self.data_file = data_file
+
+    @property
+    def is_default(self):
+        return self.slug == DEFAULT_PROFILE
+
+    def __repr__(self):
+        return f"InventoryProfile({self.slug!r})"
+
+
+def get_profiles():
+    """Return all configured profiles keyed by slug, the default one first."""
+    profiles = {DEFAULT_PROFILE: InventoryProfile(DEFAULT_PROFILE, getattr(settings, "STEAM_ID", None))}
+    for slug, options in (getattr(settings, "INVENTORY_PROFILES", None) or {}).items():
+        if slug == DEFAULT_PROFILE:
+            continue
+        profiles[slug] = InventoryProfile(slug, options.get("steam_id"), options.get("data_file"))
+    return profiles
+
+
+def get_profile(slug=None):
+    """Return the profile for ``slug``, or the active one when None."""
+    if isinstance(slug, InventoryProfile):
+        return slug
+    slug = slug or _active_slug.get() or DEFAULT_PROFILE
+    try:
+        return get_profiles()[slug]
+    except KeyError:
+        raise UnknownProfile(slug) from None
+
+
+def active_profile():
+    """The profile of the current request (or ``use_profile`` block)."""
+    return get_profile()
+
+
+@contextmanager
+def use_profile(slug):
+    """Make ``slug`` the active profile for the enclosed block."""
+    profile = get_profile(slug or DEFAULT_PROFILE)
+    token = _active_slug.set(profile.slug)
+    try:
+        yield profile
+    finally:
+        _active_slug.reset(token)
+
+
+def profile_view(view):
+    """Run ``view`` with the profile named by its ``profile`` URL argument active.
+
+    Unknown slugs are a 404. Views reached without the argument use the
+    default profile. Works for sync and async views.
+    """
+    def resolve(slug):
+        try:
+            return get_profile(slug or DEFAULT_PROFILE)
+        except UnknownProfile:
+            raise Http404("Unknown showroom")
+
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, profile=None, **kwargs):
+            with use_profile(resolve(profile)):
+                return await view(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, profile=None, **kwargs):
+        with use_profile(resolve(profile)):
+            return view(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,148 @@
+"""Compact record types for skins held in long-lived caches.
+
+``SkinRecord`` and ``TradableInfo`` store their fields in ``__slots__``
+instead of a per-object dict, and behave as mappings so code written for
+skin dicts (``skin.get(...)``, ``skin["name"]``) and templates
+(``skin.tradable_info.raw``) keep working unchanged.
+"""
+from collections.abc import Mapping, MutableMapping
+from functools import lru_cache
+
+from .helpers import build_tradable_info
+
+
+class TradableInfo(Mapping):
+    """Immutable tradability details; instances are shared per status string."""
+
+    __slots__ = ("raw", "is_tradable", "lock_state", "unlock_text", "unlock_iso", "unlock_epoch", "state_class")
+
+    def __init__(self, raw, is_tradable=True, lock_state="unlocked", unlock_text=None,
+                 unlock_iso=None, unlock_epoch=None, state_class="meta--unlocked"):
+        set_field = object.__setattr__
+        set_field(self, "raw", raw)
+        set_field(self, "is_tradable", is_tradable)
+        set_field(self, "lock_state", lock_state)
+        set_field(self, "unlock_text", unlock_text)
+        set_field(self, "unlock_iso", unlock_iso)
+        set_field(self, "unlock_epoch", unlock_epoch)
+        set_field(self, "state_class", state_class)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TradableInfo is immutable")
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def from_status(cls, tradable_status):
+        return cls(**build_tradable_info(tradable_status))
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        return f"TradableInfo({self.raw!r})"
+
+
+class SkinRecord(MutableMapping):
+    """A skin with slotted fields and lazily derived ``tradable_info``/``is_reserved``."""
+
+    FIELDS = (
+        "asset_id", "name", "icon_url", "exterior", "selected", "weapon_type", "item_type",
+        "stickers", "patches", "rarity", "rarity_color", "inspect_link", "pattern_template",
+        "float", "collection", "price_eur", "note",
+    )
+    # Keys computed from the fields above
+    DERIVED = ("tradable_info", "wear_rating", "is_reserved")
+
+    __slots__ = FIELDS + ("tradable_raw", "_tradable_info", "_is_reserved", "_extra")
+
+    _FIELD_SET = frozenset(FIELDS)
+    _DEFAULTS = {"selected": False, "weapon_type": "Other", "item_type": "Other", "note": ""}
+
+    def __init__(self, tradable_raw="Yes", **fields):
+        for field in self.FIELDS:
+            setattr(self, field, fields.pop(field, self._DEFAULTS.get(field)))
+        self.tradable_raw = tradable_raw
+        self._tradable_info = None
+        self._is_reserved = None
+        self._extra = fields or None
+
+    @classmethod
+    def from_dict(cls, skin):
+        """Build a record from a normalized skin dict (see ``steam_api``)."""
+        fields = dict(skin)
+        tradable_info = fields.pop("tradable_info", None) or {}
+        tradable_raw = tradable_info.get("raw") or fields.pop("tradable", None) or "Yes"
+        fields.pop("is_reserved", None)
+        wear = fields.pop("wear_rating", None)
+        if fields.get("float") is None:
+            fields["float"] = wear
+        return cls(tradable_raw=tradable_raw, **fields)
+
+    @property
+    def tradable_info(self):
+        if self._tradable_info is None:
+            self._tradable_info = TradableInfo.from_status(self.tradable_raw)
+        return self._tradable_info
+
+    @property
+    def is_reserved(self):
+        if self._is_reserved is None:
+            note = self.note
+            self._is_reserved = bool(note.strip()) if isinstance(note, str) else False
+        return self._is_reserved
+
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        if key == "tradable_info":
+            return self.tradable_info
+        if key == "wear_rating":
+            return self.float
+        if key == "is_reserved":
+            return self.is_reserved
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+            if key == "note":
+                self._is_reserved = None
+        elif key == "tradable_info":
+            self.tradable_raw = (value or {}).get("raw") or "Yes"
+            self._tradable_info = value if isinstance(value, TradableInfo) else None
+        elif key == "wear_rating":
+            self.float = value
+        elif key == "is_reserved":
+            self._is_reserved = bool(value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if self._extra and key in self._extra:
+            del self._extra[key]
+            return
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from self.FIELDS
+        yield from self.DERIVED
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return len(self.FIELDS) + len(self.DERIVED) + len(self._extra or ())
+
+    def __repr__(self):
+        return f"SkinRecord({self.asset_id!r}, {self.name!r})"
@@ -1,9 +1,15 @@
+import asyncio
+import codecs
+import hashlib
 import json
-import os
 import re
+import threading
+import time
+from collections import OrderedDict
 from decimal import Decimal, InvalidOperation
-from json.decoder import JSONDecoder
+from json.decoder import JSONDecodeError, JSONDecoder
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from .helpers import (
     identify_item_types,
@@ -12,7 +18,29 @@ from .helpers import (
     extract_stickers,
     rarity_details,
     build_tradable_info,
+    expire_trade_locks,
+    next_unlock_epoch,
+    build_facet_index,
+    facet_counts,
+    intern_attachment,
+    filter_positions,
+    sort_skins,
+    skin_search_text,
 )
+from .storage import get_storage
+from .fragment_cache import invalidate_skin_fragments
+from .merge import describe_merge, merge_inventory, merge_is_noop
+from .records import SkinRecord
+from .profiles import active_profile
+
+# Process-wide snapshots of the parsed inventories, shared by public views and
+# keyed by profile slug; the least recently used is dropped past
+# INVENTORY_SNAPSHOT_SHARDS so memory follows the active profiles.
+_snapshot_lock = threading.Lock()
+_inventory_snapshots = OrderedDict()
+_snapshot_load_locks = {}
+# Reloads started by async views, keyed by event loop and profile slug
+_snapshot_reloads = {}
 
 def _normalize_price(value):
     if value is None:
@@ -58,7 +86,7 @@ def _resolve_inspect_link(template, asset_id):
     link = template
     replacements = {}
 
-    steam_id = getattr(settings, 'STEAM_ID', None)
+    steam_id = active_profile().steam_id
     if steam_id:
         steam_id = str(steam_id)
         replacements.update({
@@ -89,46 +117,8 @@ def _normalize_descriptions(descriptions):
     return descriptions or []
 
 
-def _merge_inventory_payloads(payloads):
-    merged = {
-        "assets": [],
-        "descriptions": [],
-        "asset_properties": []
-    }
-
-    seen_assets = set()
-    for payload in payloads:
-        assets = payload.get("assets", []) or []
-        for asset in assets:
-            asset_id = asset.get("assetid")
-            if asset_id in seen_assets:
-                continue
-            seen_assets.add(asset_id)
-            merged["assets"].append(asset)
-
-        merged["descriptions"].extend(_normalize_descriptions(payload.get("descriptions", [])))
-
-        for props in payload.get("asset_properties", []) or []:
-            merged["asset_properties"].append(props)
-
-    return merged
-
-
-def process_inventory_data(data):
-    """Transform raw Steam inventory payload into our skin list."""
-    assets = data.get("assets", [])
-    descriptions = _normalize_descriptions(data.get("descriptions", []))
-
-    desc_map = {}
-    for desc in descriptions:
-        classid = desc.get("classid")
-        if not classid:
-            continue
-        instanceid = desc.get("instanceid", "0")
-        desc_map[(classid, instanceid)] = desc
-
-    asset_properties_map = {}
-    for prop_entry in data.get("asset_properties", []) or []:
+def _collect_asset_properties(prop_entries, asset_properties_map):
+    for prop_entry in prop_entries or []:
         asset_id = prop_entry.get("assetid")
         for prop in prop_entry.get("asset_properties", []) or []:
             if asset_id not in asset_properties_map:
@@ -138,343 +128,783 @@ def process_inventory_data(data):
             elif prop.get("name") == "Pattern Template" and prop.get("int_value") is not None:
                 asset_properties_map[asset_id]["pattern_template"] = int(prop["int_value"])
 
-    # Count total items before filtering
-    total_before_filters = sum(int(asset.get("amount", 1)) for asset in assets)
 
+def _split_agent_patches(stickers):
+    """Separate agent patches (reported by Steam as stickers) from real stickers."""
+    filtered_stickers = []
+    patch_list = []
+    for sticker in stickers:
+        sticker_name = sticker.get("name") or ""
+        icon_url = sticker.get("icon_url")
+        is_patch = False
+        if isinstance(sticker_name, str) and sticker_name.strip().lower().startswith("patch:"):
+            is_patch = True
+        elif isinstance(icon_url, str) and "/patches/" in icon_url:
+            is_patch = True
+
+        if is_patch:
+            cleaned_name = (
+                sticker_name.split(":", 1)[1].strip()
+                if ":" in sticker_name else sticker_name.strip()
+            )
+            patch_list.append({
+                "icon_url": icon_url,
+                "name": cleaned_name or sticker_name.strip(),
+            })
+        else:
+            filtered_stickers.append(sticker)
+    return filtered_stickers, patch_list
+
+
+def _describe_item(desc):
+    """Derive the fields shared by every asset with this description.
+
+    Returns None when items of this description are filtered out.
+    """
     # Define categories to skip
     CATEGORIES_TO_SKIP = ["C4", "Graffiti", "Pass", "Tag", "Tool"]
 
-    skins = []
-    for asset in assets:
-        key, count = (asset["classid"], asset.get("instanceid", "0")), int(asset.get("amount", 1))
-        desc = desc_map.get(key, {})
-        item_name = desc.get("name", "Unknown")
-        
-        # Check tradability before doing other processing
-        tradable_status = tradable_text(desc)
-        if tradable_status == "No":
-            continue  # Skip non-tradable items
-            
-        # Pass the full description object for better type detection
-        weapon_type, item_type = identify_item_types(item_name, desc)
-        
-        # Skip items with unwanted types
-        if item_type in CATEGORIES_TO_SKIP:
-            continue
-        
-        stickers = extract_stickers(desc)
-        rarity_name, rarity_color = rarity_details(desc)
+    item_name = desc.get("name", "Unknown")
 
-        collection_name = None
-        for block in desc.get("descriptions", []) or []:
-            if block.get("name") == "itemset_name":
-                value = block.get("value")
+    # Check tradability before doing other processing
+    tradable_status = tradable_text(desc)
+    if tradable_status == "No":
+        return None  # Skip non-tradable items
+
+    # Pass the full description object for better type detection
+    weapon_type, item_type = identify_item_types(item_name, desc)
+
+    # Skip items with unwanted types
+    if item_type in CATEGORIES_TO_SKIP:
+        return None
+
+    stickers = extract_stickers(desc)
+    patches = []
+    if (item_type or "").lower() == "agent":
+        stickers, patches = _split_agent_patches(stickers)
+
+    rarity_name, rarity_color = rarity_details(desc)
+
+    collection_name = None
+    for block in desc.get("descriptions", []) or []:
+        if block.get("name") == "itemset_name":
+            value = block.get("value")
+            if isinstance(value, str):
+                collection_name = value.strip() or None
+            break
+
+    if not collection_name:
+        for tag in desc.get("tags", []) or []:
+            if tag.get("category") == "ItemSet":
+                value = tag.get("localized_tag_name") or tag.get("name")
                 if isinstance(value, str):
                     collection_name = value.strip() or None
                 break
 
-        if not collection_name:
-            for tag in desc.get("tags", []) or []:
-                if tag.get("category") == "ItemSet":
-                    value = tag.get("localized_tag_name") or tag.get("name")
-                    if isinstance(value, str):
-                        collection_name = value.strip() or None
-                    break
-
-        inspect_link = None
-        if isinstance(desc.get("actions"), list) and desc["actions"]:
-            inspect_link = desc["actions"][0].get("link")
-        if not inspect_link and isinstance(desc.get("market_actions"), list) and desc["market_actions"]:
-            inspect_link = desc["market_actions"][0].get("link")
-
-        asset_id = asset.get("assetid")
-        resolved_inspect_link = _resolve_inspect_link(inspect_link, asset_id)
-
-        for _ in range(count):  # Don't stack items
-            prop_data = asset_properties_map.get(asset_id, {})
-
-            sticker_list = stickers.copy() if stickers else []
-            patch_list = []
-            if (item_type or "").lower() == "agent":
-                filtered_stickers = []
-                for sticker in sticker_list:
-                    sticker_name = sticker.get("name") or ""
-                    icon_url = sticker.get("icon_url")
-                    is_patch = False
-                    if isinstance(sticker_name, str) and sticker_name.strip().lower().startswith("patch:"):
-                        is_patch = True
-                    elif isinstance(icon_url, str) and "/patches/" in icon_url:
-                        is_patch = True
-
-                    if is_patch:
-                        cleaned_name = (
-                            sticker_name.split(":", 1)[1].strip()
-                            if ":" in sticker_name else sticker_name.strip()
-                        )
-                        patch_entry = {
-                            "icon_url": icon_url,
-                            "name": cleaned_name or sticker_name.strip(),
-                        }
-                        patch_list.append(patch_entry)
-                    else:
-                        filtered_stickers.append(sticker)
-                sticker_list = filtered_stickers
-
-            skins.append({
-                "name": item_name,
-                "icon_url": desc.get("icon_url", ""),
-                "exterior": exterior_text(desc),
-                "tradable_info": build_tradable_info(tradable_status),
-                "selected": False,  # Default to not selected
-                "weapon_type": weapon_type or "Other",
-                "item_type": item_type or "Other",
-                "stickers": sticker_list,
-                "patches": patch_list,
-                "rarity": rarity_name,
-                "rarity_color": rarity_color,
-                "inspect_link": resolved_inspect_link,
-                "asset_id": asset_id,
-                "pattern_template": prop_data.get("pattern_template"),
-                "float": prop_data.get("wear_rating"),
-                "collection": collection_name,
-                "price_eur": None,
-                "note": "",
-            })
-    return skins, len(skins), total_before_filters
+    inspect_link = None
+    if isinstance(desc.get("actions"), list) and desc["actions"]:
+        inspect_link = desc["actions"][0].get("link")
+    if not inspect_link and isinstance(desc.get("market_actions"), list) and desc["market_actions"]:
+        inspect_link = desc["market_actions"][0].get("link")
+
+    return {
+        "name": item_name,
+        "icon_url": desc.get("icon_url", ""),
+        "exterior": exterior_text(desc),
+        "tradable_info": build_tradable_info(tradable_status),
+        "weapon_type": weapon_type or "Other",
+        "item_type": item_type or "Other",
+        "stickers": [intern_attachment(sticker) for sticker in stickers],
+        "patches": [intern_attachment(patch) for patch in patches],
+        "rarity": rarity_name,
+        "rarity_color": rarity_color,
+        "collection": collection_name,
+        "inspect_template": inspect_link,
+    }
+
+
+def _build_asset_skins(asset, item, prop_data):
+    """Return the skins for one Steam asset from its described item fields."""
+    asset_id = asset.get("assetid")
+    resolved_inspect_link = _resolve_inspect_link(item["inspect_template"], asset_id)
+
+    skins = []
+    for _ in range(int(asset.get("amount", 1))):  # Don't stack items
+        skins.append({
+            "name": item["name"],
+            "icon_url": item["icon_url"],
+            "exterior": item["exterior"],
+            "tradable_info": dict(item["tradable_info"]),
+            "selected": False,  # Default to not selected
+            "weapon_type": item["weapon_type"],
+            "item_type": item["item_type"],
+            "stickers": list(item["stickers"]),
+            "patches": list(item["patches"]),
+            "rarity": item["rarity"],
+            "rarity_color": item["rarity_color"],
+            "inspect_link": resolved_inspect_link,
+            "asset_id": asset_id,
+            "pattern_template": prop_data.get("pattern_template"),
+            "float": prop_data.get("wear_rating"),
+            "collection": item["collection"],
+            "price_eur": None,
+            "note": "",
+        })
+    return skins
+
+
+def iter_processed_skins(payloads, stats=None):
+    """Yield skins from an iterable of raw Steam inventory payloads.
+
+    Payloads are processed one at a time so they never have to be merged into
+    a single document. Descriptions and asset properties are indexed as each
+    payload arrives; an asset id seen in an earlier payload is skipped. Each
+    unique description is analysed once and shared by all of its assets.
+    When ``stats`` is given, ``stats["total_before_filters"]`` is incremented
+    with the item count before filtering.
+    """
+    desc_map = {}
+    described = {}
+    asset_properties_map = {}
+    seen_assets = set()
+
+    for payload in payloads:
+        for desc in _normalize_descriptions(payload.get("descriptions", [])):
+            classid = desc.get("classid")
+            if not classid:
+                continue
+            instanceid = desc.get("instanceid", "0")
+            desc_map[(classid, instanceid)] = desc
+            described.pop((classid, instanceid), None)
+
+        _collect_asset_properties(payload.get("asset_properties", []), asset_properties_map)
+
+        for asset in payload.get("assets", []) or []:
+            asset_id = asset.get("assetid")
+            if asset_id in seen_assets:
+                continue
+            seen_assets.add(asset_id)
+
+            if stats is not None:
+                stats["total_before_filters"] = stats.get("total_before_filters", 0) + int(asset.get("amount", 1))
+
+            key = (asset["classid"], asset.get("instanceid", "0"))
+            if key not in described:
+                described[key] = _describe_item(desc_map.get(key, {}))
+            item = described[key]
+            if item is None:
+                continue
+
+            yield from _build_asset_skins(asset, item, asset_properties_map.get(asset_id, {}))
+
+
+def process_inventory_data(data):
+    """Transform raw Steam inventory payload into our skin list."""
+    stats = {"total_before_filters": 0}
+    skins = list(iter_processed_skins([data], stats))
+    return skins, len(skins), stats["total_before_filters"]
+
+
+def _iter_text_payloads(raw_json):
+    decoder = JSONDecoder()
+    idx = 0
+    length = len(raw_json)
+    while idx < length:
+        while idx < length and raw_json[idx] in "\r\n\t ":
+            idx += 1
+        if idx >= length:
+            break
+        obj, end = decoder.raw_decode(raw_json, idx)
+        yield obj
+        idx = end
+
+
+def _iter_stream_payloads(stream, chunk_size):
+    """Yield concatenated JSON documents from a file-like object, chunk by chunk."""
+    decoder = JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    eof = False
+    read_size = chunk_size
+
+    while True:
+        buffer = buffer.lstrip("\r\n\t \ufeff")
+        if buffer:
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield obj
+                buffer = buffer[end:]
+                read_size = chunk_size
+                continue
+        elif eof:
+            return
+
+        chunk = stream.read(read_size)
+        if isinstance(chunk, (bytes, bytearray)):
+            chunk = text_decoder.decode(chunk, final=not chunk)
+        eof = not chunk
+        buffer += chunk
+        # Grow reads with the pending document so re-decoding stays linear overall.
+        read_size = max(chunk_size, len(buffer))
+
+
+def iter_inventory_payloads(*sources, chunk_size=64 * 1024):
+    """Yield Steam inventory payloads from pasted text or file-like sources.
+
+    Each source may hold several concatenated JSON responses. File-like
+    objects (uploaded files, or the ``HttpRequest`` itself for a raw body)
+    are read incrementally, so only one payload is held in memory at a time.
+    """
+    for source in sources:
+        if isinstance(source, (bytes, bytearray)):
+            source = source.decode("utf-8")
+        if isinstance(source, str):
+            yield from _iter_text_payloads(source)
+        elif hasattr(source, "read"):
+            yield from _iter_stream_payloads(source, chunk_size)
+        else:
+            raise ValueError("Unsupported inventory payload type")
+
+
+def _validated_payloads(payloads):
+    parsed_any = False
+    for payload in payloads:
+        if not isinstance(payload, dict) or "assets" not in payload:
+            raise ValueError("Each inventory payload must include 'assets' and 'descriptions'")
+        parsed_any = True
+        yield payload
+    if not parsed_any:
+        raise ValueError("Invalid JSON payload: could not parse data")
 
 
 def parse_inventory_json(raw_json):
-    """Parse a manual JSON payload copied from Steam community inventory."""
+    """Parse a manual JSON payload copied from Steam community inventory.
+
+    ``raw_json`` may be pasted text, a file-like object, a single payload dict
+    or an iterable of payload dicts (e.g. from ``iter_inventory_payloads``).
+    """
     if isinstance(raw_json, (bytes, bytearray)):
         raw_json = raw_json.decode("utf-8")
 
-    payloads = []
-
     if isinstance(raw_json, str):
         raw_json = raw_json.strip()
         if not raw_json:
             raise ValueError("Inventory JSON is empty")
-
-        decoder = JSONDecoder()
-        idx = 0
-        length = len(raw_json)
-        while idx < length:
-            while idx < length and raw_json[idx] in "\r\n\t ":
-                idx += 1
-            if idx >= length:
-                break
-            obj, end = decoder.raw_decode(raw_json, idx)
-            payloads.append(obj)
-            idx = end
-        if not payloads:
-            raise ValueError("Invalid JSON payload: could not parse data")
+        payloads = iter_inventory_payloads(raw_json)
+    elif hasattr(raw_json, "read"):
+        payloads = iter_inventory_payloads(raw_json)
     elif isinstance(raw_json, dict):
-        payloads.append(raw_json)
-    elif isinstance(raw_json, list):
-        payloads.extend(raw_json)
+        payloads = [raw_json]
+    elif hasattr(raw_json, "__iter__"):
+        payloads = raw_json
     else:
         raise ValueError("Unsupported inventory payload type")
 
-    normalized_payloads = []
-    for payload in payloads:
-        if not isinstance(payload, dict) or "assets" not in payload:
-            raise ValueError("Each inventory payload must include 'assets' and 'descriptions'")
-        normalized_payloads.append(payload)
-
-    merged = _merge_inventory_payloads(normalized_payloads)
-    return process_inventory_data(merged)
-
-def save_inventory_to_file(skins, filtered_total, total_before_filters=None):
-    """Save inventory data to JSON file."""
+    stats = {"total_before_filters": 0}
+    skins = list(iter_processed_skins(_validated_payloads(payloads), stats))
+    return skins, len(skins), stats["total_before_filters"]
+
+def _normalize_skin(skin):
+    """Bring a stored skin up to the current schema in place."""
+    wear = skin.get("wear_rating")
+    if wear is None and skin.get("float") is not None:
+        wear = skin.get("float")
+        skin["wear_rating"] = wear
+    skin.setdefault("float", wear)
+    skin.setdefault("pattern_template", None)
+    skin.setdefault("patches", [])
+    skin.setdefault("collection", None)
+    skin["note"] = _sanitize_note(skin.get("note"))
+    # Get existing tradable status from tradable_info.raw or fallback to old tradable field for compatibility
+    tradable_info = skin.get("tradable_info") or {}
+    existing_tradable = tradable_info.get("raw") or skin.get("tradable", "Yes")
+    skin["tradable_info"] = build_tradable_info(existing_tradable, tradable_info.get("unlock_epoch"))
+    # Remove redundant tradable field if it exists
+    skin.pop("tradable", None)
+    skin["price_eur"] = _normalize_price(skin.get("price_eur"))
+
+    if (skin.get("item_type") or "").lower() == "agent":
+        stickers = skin.get("stickers") or []
+        migrated_patches = []
+        remaining_stickers = []
+        for sticker in stickers:
+            name = (sticker.get("name") or "").strip()
+            icon_url = sticker.get("icon_url")
+            is_patch = False
+            if name.lower().startswith("patch:"):
+                is_patch = True
+            elif isinstance(icon_url, str) and "/patches/" in icon_url:
+                is_patch = True
+
+            if is_patch:
+                cleaned_name = name.split(":", 1)[1].strip() if ":" in name else name
+                migrated_patches.append(intern_attachment({
+                    "icon_url": icon_url,
+                    "name": cleaned_name or name,
+                }))
+            else:
+                remaining_stickers.append(sticker)
+
+        if migrated_patches:
+            existing_patches = skin.get("patches") or []
+            # Clean existing patch names and avoid duplicates by icon/name
+            cleaned_existing = []
+            seen = set()
+            for patch in existing_patches + migrated_patches:
+                pname = (patch.get("name") or "").strip()
+                if pname.lower().startswith("patch:"):
+                    pname = pname.split(":", 1)[1].strip()
+                icon = patch.get("icon_url")
+                key = (pname.lower(), icon)
+                if key in seen:
+                    continue
+                seen.add(key)
+                cleaned_existing.append(intern_attachment({
+                    "icon_url": icon,
+                    "name": pname,
+                }))
+            skin["patches"] = cleaned_existing
+            skin["stickers"] = remaining_stickers
+
+    # Patch names are stored without their "Patch:" prefix
+    patches = []
+    for patch in skin.get("patches") or []:
+        name = (patch.get("name") or "").strip()
+        if name.lower().startswith("patch:"):
+            name = name.split(":", 1)[1].strip()
+        patches.append(intern_attachment({
+            "icon_url": patch.get("icon_url"),
+            "name": name,
+        }))
+    skin["patches"] = patches
+
+
+def _upgrade_to_normalized_skins(data):
+    for skin in data.get("skins", []):
+        _normalize_skin(skin)
+
+
+def _add_unlock_epochs(data):
+    for skin in data.get("skins", []):
+        raw = (skin.get("tradable_info") or {}).get("raw") or "Yes"
+        skin["tradable_info"] = build_tradable_info(raw)
+
+
+# (target version, upgrade) pairs applied in order to older data documents;
+# SCHEMA_VERSION is the last target. Version 2 only changed the file layout
+# (see storage.JsonFileStorage).
+_SCHEMA_MIGRATIONS = (
+    (3, _upgrade_to_normalized_skins),
+    (4, _add_unlock_epochs),
+)
+SCHEMA_VERSION = _SCHEMA_MIGRATIONS[-1][0]
+
+
+def _upgrade_inventory_document(data):
+    """Apply pending schema migrations to ``data`` and stamp it; False if already current."""
+    version = data.get("schema_version") or 1
+    if version >= SCHEMA_VERSION:
+        return False
+    for target, upgrade in _SCHEMA_MIGRATIONS:
+        if version < target:
+            upgrade(data)
+            version = target
+    data["schema_version"] = version
+    return True
+
+
+def _needs_refresh(data, now):
+    """True if ``data`` predates SCHEMA_VERSION or holds trade locks that have run out."""
+    if (data.get("schema_version") or 1) < SCHEMA_VERSION:
+        return True
+    next_unlock_at = data.get("next_unlock_at")
+    return next_unlock_at is not None and next_unlock_at <= now
+
+
+def _upgrade_stored_inventory(storage, persist=True):
+    """Migrate the stored document and release expired trade locks, then write it back.
+
+    Returns the full document.
+    """
+    with storage.lock():
+        data = storage.read()
+        if data is None:
+            return data
+        upgraded = _upgrade_inventory_document(data)
+        skins = data.get("skins", [])
+        expired = expire_trade_locks(skins)
+        if not upgraded and not expired:
+            return data
+        data["facets"] = build_facet_index(skins)
+        data["next_unlock_at"] = next_unlock_epoch(skins)
+        if persist:
+            try:
+                storage.write(data)
+                if upgraded:
+                    print(f"Inventory data upgraded to schema version {SCHEMA_VERSION}")
+                if expired:
+                    print(f"Trade lock expired on {expired} skins")
+            except OSError as exc:
+                # Serve the refreshed copy anyway; the next load retries the write
+                print(f"Could not write upgraded inventory data: {exc}")
+    return data
+
+
+def save_inventory_to_file(skins, filtered_total, total_before_filters=None, storage=None, normalized=False):
+    """Save inventory data to ``storage`` or the configured storage backend.
+
+    Pass ``normalized=True`` when ``skins`` already went through
+    ``_normalize_skin`` and ``expire_trade_locks``.
+    """
     
     if total_before_filters is None:
         total_before_filters = filtered_total
         
-    sanitized_skins = []
-    for skin in skins:
-        normalized_value = _normalize_price(skin.get("price_eur"))
-        skin['price_eur'] = normalized_value
-        normalized_skin = dict(skin)
-        normalized_skin["price_eur"] = normalized_value
-
-        note_value = _sanitize_note(skin.get("note"))
-        normalized_skin["note"] = note_value
-        skin["note"] = note_value
-
-        patches = []
-        for patch in normalized_skin.get("patches", []) or []:
-            name = (patch.get("name") or "").strip()
-            if name.lower().startswith("patch:"):
-                name = name.split(":", 1)[1].strip()
-            patches.append({
-                "icon_url": patch.get("icon_url"),
-                "name": name,
-            })
-        normalized_skin["patches"] = patches
-        skin["patches"] = patches
-
-        sanitized_skins.append(normalized_skin)
+    if not normalized:
+        # Callers keep working with the normalized values
+        for skin in skins:
+            _normalize_skin(skin)
+        expire_trade_locks(skins)
+    sanitized_skins = [dict(skin) for skin in skins]
 
     data = {
+        "schema_version": SCHEMA_VERSION,
         "skins": sanitized_skins,
         "total": filtered_total,
-        "total_before_filters": total_before_filters
+        "total_before_filters": total_before_filters,
+        "facets": build_facet_index(sanitized_skins),
+        "next_unlock_at": next_unlock_epoch(sanitized_skins),
     }
         
-    os.makedirs(os.path.dirname(settings.LOCAL_DATA_FILE), exist_ok=True)
-    
     # Debug prints to verify data before saving
     print(f"\nSaving {len(sanitized_skins)} skins, {sum(1 for skin in sanitized_skins if skin.get('selected', False))} selected")
     
-    with open(settings.LOCAL_DATA_FILE, "w", encoding="utf-8") as fp:
-        json.dump(data, fp, indent=2)
+    storage = storage or get_storage()
+    storage.write(data)
         
-    # Verify the file was written correctly
-    print(f"File saved to {settings.LOCAL_DATA_FILE}")
+    invalidate_inventory_snapshot()
+    invalidate_skin_fragments()
+
+    # Verify the data was written correctly
+    print(f"Inventory saved via {type(storage).__name__}")
+
+def update_inventory_skins(changes, storage=None):
+    """Persist per-skin field changes keyed by ``asset_id``.
+
+    ``changes`` maps asset ids to already sanitized ``selected``/``price_eur``/
+    ``note`` values. Nothing is written when it is empty.
+    """
+    if not changes:
+        return
+
+    storage = storage or get_storage()
+    print(f"\nUpdating {len(changes)} changed skins")
+    storage.update_skins(changes)
+    invalidate_inventory_snapshot()
+    invalidate_skin_fragments(changes)
+
+
+def load_inventory_from_file(auto_resave=True, selected_only=False, storage=None, with_facets=False):
+    """Load inventory data from ``storage`` or the configured storage backend.
+
+    Documents older than ``SCHEMA_VERSION`` are migrated once and, with
+    ``auto_resave``, written back; current ones are returned as stored.
+    Skins whose trade lock ran out since the last write are switched to
+    tradable the same way, so facet counts never show stale locks.
+    With ``selected_only`` only skins marked for sale are returned. With
+    ``with_facets`` the stored facet index (see ``build_facet_index``) is
+    returned as a third element.
+    """
+    storage = storage or get_storage()
+    if storage.lock_held():
+        # A leader may be waiting on this lock to upgrade the file, so a
+        # caller holding it must not wait for the leader's result
+        result = _load_inventory(auto_resave, selected_only, storage)
+    else:
+        result = _coordinated_load(
+            (type(storage), getattr(storage, "path", None), selected_only, auto_resave),
+            storage.signature(),
+            lambda: _load_inventory(auto_resave, selected_only, storage),
+        )
+    return result if with_facets else result[:2]
 
-def load_inventory_from_file(auto_resave=True):
-    """Load inventory data from JSON file."""
-    try:
-        if os.path.exists(settings.LOCAL_DATA_FILE) and os.path.getsize(settings.LOCAL_DATA_FILE) > 0:
-            with open(settings.LOCAL_DATA_FILE, encoding="utf-8") as fp:
-                data = json.load(fp)
 
-            skins = data.get("skins", [])
-            needs_resave = False
-            for skin in skins:
-                wear = skin.get("wear_rating")
-                if wear is None and skin.get("float") is not None:
-                    wear = skin.get("float")
-                    skin["wear_rating"] = wear
-                skin.setdefault("float", wear)
-                skin.setdefault("pattern_template", None)
-                skin.setdefault("patches", [])
-                skin.setdefault("collection", None)
-                sanitized_note = _sanitize_note(skin.get("note"))
-                if skin.get("note") != sanitized_note:
-                    needs_resave = True
-                skin["note"] = sanitized_note
-                # Get existing tradable status from tradable_info.raw or fallback to old tradable field for compatibility
-                existing_tradable = skin.get("tradable_info", {}).get("raw") or skin.get("tradable", "Yes")
-                skin["tradable_info"] = build_tradable_info(existing_tradable)
-                # Remove redundant tradable field if it exists
-                if "tradable" in skin:
-                    del skin["tradable"]
-                    needs_resave = True
-                normalized_price = _normalize_price(skin.get("price_eur"))
-                if skin.get("price_eur") != normalized_price:
-                    needs_resave = True
-                skin["price_eur"] = normalized_price
-
-                if (skin.get("item_type") or "").lower() == "agent":
-                    stickers = skin.get("stickers") or []
-                    migrated_patches = []
-                    remaining_stickers = []
-                    for sticker in stickers:
-                        name = (sticker.get("name") or "").strip()
-                        icon_url = sticker.get("icon_url")
-                        is_patch = False
-                        if name.lower().startswith("patch:"):
-                            is_patch = True
-                        elif isinstance(icon_url, str) and "/patches/" in icon_url:
-                            is_patch = True
-
-                        if is_patch:
-                            cleaned_name = name.split(":", 1)[1].strip() if ":" in name else name
-                            migrated_patches.append({
-                                "icon_url": icon_url,
-                                "name": cleaned_name or name,
-                            })
-                        else:
-                            remaining_stickers.append(sticker)
-
-                    if migrated_patches:
-                        existing_patches = skin.get("patches") or []
-                        # Clean existing patch names and avoid duplicates by icon/name
-                        cleaned_existing = []
-                        seen = set()
-                        for patch in existing_patches + migrated_patches:
-                            pname = (patch.get("name") or "").strip()
-                            if pname.lower().startswith("patch:"):
-                                pname = pname.split(":", 1)[1].strip()
-                            icon = patch.get("icon_url")
-                            key = (pname.lower(), icon)
-                            if key in seen:
-                                continue
-                            seen.add(key)
-                            cleaned_existing.append({
-                                "icon_url": icon,
-                                "name": pname,
-                            })
-                        skin["patches"] = cleaned_existing
-                        skin["stickers"] = remaining_stickers
-                        needs_resave = True
-
-            if needs_resave and auto_resave:
-                save_inventory_to_file(
-                    skins,
-                    data.get("total", len(skins)),
-                    data.get("total_before_filters", data.get("total", len(skins)))
-                )
-
-            return skins, data.get("total_before_filters", data.get("total", 0))
+class _LoadFlight:
+    """One in-progress load that concurrent readers of the same version wait for."""
+
+    __slots__ = ("signature", "done", "result", "waiters")
+
+    def __init__(self, signature):
+        self.signature = signature
+        self.done = threading.Event()
+        self.result = None
+        self.waiters = 0
+
+
+_load_flights_lock = threading.Lock()
+_load_flights = {}
+
+
+def _copy_load_result(result):
+    # Views annotate the skin dicts they get, so every caller needs its own
+    skins, total_before_filters, facets = result
+    return [dict(skin) for skin in skins], total_before_filters, facets
+
+
+def _coordinated_load(key, signature, load):
+    """Run ``load`` once per ``key`` and storage ``signature`` among concurrent callers.
+
+    Right after a save every open request would otherwise parse the same new
+    file at once. The first caller loads it; callers arriving meanwhile with
+    the same signature wait and get copies of its result. If the load fails
+    they load on their own, so each caller still sees its own error.
+    """
+    with _load_flights_lock:
+        flight = _load_flights.get(key)
+        if flight is not None and flight.signature == signature:
+            flight.waiters += 1
+            leader = False
+        else:
+            flight = _load_flights[key] = _LoadFlight(signature)
+            leader = True
+
+    if not leader:
+        flight.done.wait()
+        return load() if flight.result is None else _copy_load_result(flight.result)
+
+    result = None
+    try:
+        result = load()
+        return result
+    finally:
+        with _load_flights_lock:
+            if _load_flights.get(key) is flight:
+                del _load_flights[key]
+            shared = flight.waiters and result is not None
+        if shared:
+            # The leader may change its skins once it returns
+            flight.result = _copy_load_result(result)
+        flight.done.set()
+
+
+def _load_inventory(auto_resave, selected_only, storage):
+    try:
+        data = storage.read(selected_only=selected_only)
+        if data is not None:
+            if _needs_refresh(data, time.time()):
+                # Older file or expired trade locks; current files are used as stored
+                data = _upgrade_stored_inventory(storage, persist=auto_resave) or {}
+            all_skins = skins = data.get("skins", [])
+            if selected_only:
+                skins = [skin for skin in skins if skin.get("selected", False)]
+
+            facets = data.get("facets")
+            if facets is None:
+                # Files written before the facet index existed
+                facets = build_facet_index(all_skins)
+
+            return skins, data.get("total_before_filters", data.get("total", 0)), facets
         else:
             # Create default data structure and save it
             default_data = {"skins": [], "total": 0, "total_before_filters": 0}
-            save_inventory_to_file(default_data["skins"], default_data["total"], default_data["total_before_filters"])
-            return default_data["skins"], default_data["total_before_filters"]
+            save_inventory_to_file(
+                default_data["skins"],
+                default_data["total"],
+                default_data["total_before_filters"],
+                storage=storage,
+            )
+            return default_data["skins"], default_data["total_before_filters"], build_facet_index([])
     except json.JSONDecodeError as e:
+        # The storage keeps the damaged file untouched; serve an empty inventory
+        # until the next successful save.
         print(f"Error loading inventory data: {e}")
-        # If the file is corrupted, create a new one with default data
-        default_data = {"skins": [], "total": 0, "total_before_filters": 0}
-        save_inventory_to_file(default_data["skins"], default_data["total"], default_data["total_before_filters"])
-        return default_data["skins"], default_data["total_before_filters"]
+        return [], 0, build_facet_index([])
 
-def update_inventory_from_manual(raw_json):
-    """Update inventory using a manually pasted JSON payload."""
-    try:
-        current_skins, _ = load_inventory_from_file()
-
-        # Use asset_id as the primary key for preserving selections, with fallback to name+exterior
-        selection_map = {}
-        price_map = {}
-        note_map = {}
-        for skin in current_skins:
-            asset_id = skin.get('asset_id')
-            if asset_id:
-                # Primary key: asset_id (unique identifier)
-                selection_map[asset_id] = skin.get('selected', False)
-                price_map[asset_id] = _normalize_price(skin.get('price_eur'))
-                note_map[asset_id] = _sanitize_note(skin.get('note'))
-            else:
-                # Fallback key: name + exterior (for items without asset_id)
-                key = skin['name']
-                if skin.get('exterior'):
-                    key += f"_{skin['exterior']}"
-                selection_map[key] = skin.get('selected', False)
-                price_map[key] = _normalize_price(skin.get('price_eur'))
-                note_map[key] = _sanitize_note(skin.get('note'))
+def invalidate_inventory_snapshot(profile=None):
+    """Drop the cached snapshot of ``profile`` (default: the active one) so the next read reloads it."""
+    slug = profile or active_profile().slug
+    with _snapshot_lock:
+        _inventory_snapshots.pop(slug, None)
 
-        skins, filtered_total, total_before_filters = parse_inventory_json(raw_json)
 
-        for skin in skins:
-            asset_id = skin.get('asset_id')
-            if asset_id and asset_id in selection_map:
-                # Use asset_id for lookup if available
-                skin['selected'] = selection_map.get(asset_id, False)
-                skin['price_eur'] = _normalize_price(price_map.get(asset_id))
-                skin['note'] = note_map.get(asset_id, "")
-            else:
-                # Fallback to name + exterior
-                key = skin['name']
-                if skin.get('exterior'):
-                    key += f"_{skin['exterior']}"
-                skin['selected'] = selection_map.get(key, False)
-                skin['price_eur'] = _normalize_price(price_map.get(key))
-                skin['note'] = note_map.get(key, "")
-
-        save_inventory_to_file(skins, filtered_total, total_before_filters)
-        return skins, filtered_total, total_before_filters
-    except Exception as exc:
-        print(f"Error updating inventory from manual payload: {exc}")
-        raise
+def _inventory_version(signature):
+    """Short stable identifier of a storage signature, used for ETags and page caching."""
+    if signature is None:
+        return None
+    return hashlib.blake2b(repr(signature).encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _cached_snapshot(slug):
+    with _snapshot_lock:
+        snapshot = _inventory_snapshots.get(slug)
+        if snapshot is not None:
+            _inventory_snapshots.move_to_end(slug)
+        return snapshot
+
+
+def _snapshot_load_lock(slug):
+    with _snapshot_lock:
+        return _snapshot_load_locks.setdefault(slug, threading.Lock())
+
+
+def _snapshot_is_current(snapshot, signature):
+    if snapshot is None or signature is None or snapshot["signature"] != signature:
+        return False
+    # A trade lock running out changes the filters without touching storage
+    next_unlock_at = snapshot["next_unlock_at"]
+    return next_unlock_at is None or time.time() < next_unlock_at
+
+
+def get_inventory_snapshot():
+    """Return the cached, normalized inventory for read-only views.
+
+    The snapshot is rebuilt whenever the storage signature changes (for the
+    JSON file its mtime, size and inode, including writes from other
+    processes), after ``save_inventory_to_file`` and when the next trade
+    lock among the selected skins runs out. Callers must treat the
+    returned skins as read-only since they are shared across requests.
+    Each profile has its own snapshot and load lock.
+    """
+    slug = active_profile().slug
+    storage = get_storage()
+    signature = storage.signature()
+    snapshot = _cached_snapshot(slug)
+    if _snapshot_is_current(snapshot, signature):
+        return snapshot
+
+    with _snapshot_load_lock(slug):
+        snapshot = _cached_snapshot(slug)
+        if _snapshot_is_current(snapshot, signature):
+            return snapshot
+
+        selected_skins, total_before_filters, facets = load_inventory_from_file(
+            selected_only=True, with_facets=True
+        )
+        # The load may have written the file back (schema upgrade, expired
+        # trade locks); the snapshot belongs to the version it left behind
+        signature = storage.signature()
+
+        # Slotted records keep the per-worker copy small
+        selected_skins = [SkinRecord.from_dict(skin) for skin in selected_skins]
+
+        # Facet postings hold positions in the full inventory; map them back
+        # to the selected skins, which are loaded in the same order.
+        positions = sorted({
+            position
+            for postings in facets["selected"]["postings"]["tradable"].values()
+            for position in postings
+        })
+        if len(positions) != len(selected_skins):
+            facets = build_facet_index(selected_skins)
+            positions = range(len(selected_skins))
+        by_position = dict(zip(positions, selected_skins))
+
+        snapshot = {
+            "signature": signature,
+            "version": _inventory_version(signature),
+            "last_modified": storage.last_modified(),
+            "total_before_filters": total_before_filters,
+            "selected_skins": selected_skins,
+            "facets": facets,
+            "filters": facet_counts(facets, "selected"),
+            "by_position": by_position,
+            "next_unlock_at": next_unlock_epoch(selected_skins),
+            "search_text": {position: skin_search_text(skin) for position, skin in by_position.items()},
+        }
+        with _snapshot_lock:
+            _inventory_snapshots[slug] = snapshot
+            _inventory_snapshots.move_to_end(slug)
+            while len(_inventory_snapshots) > getattr(settings, "INVENTORY_SNAPSHOT_SHARDS", 8):
+                _inventory_snapshots.popitem(last=False)
+        return snapshot
+
+
+async def aget_inventory_snapshot():
+    """Async ``get_inventory_snapshot`` for ASGI views.
+
+    A current snapshot is returned from memory on the event loop. Otherwise
+    the reload runs on a worker thread, and every coroutine needing the same
+    profile meanwhile awaits that one reload instead of queueing its own.
+    """
+    slug = active_profile().slug
+    storage = get_storage()
+    if storage.nonblocking_signature:
+        snapshot = _cached_snapshot(slug)
+        if _snapshot_is_current(snapshot, storage.signature()):
+            return snapshot
+
+    key = (asyncio.get_running_loop(), slug)
+    reload = _snapshot_reloads.get(key)
+    if reload is None:
+        reload = asyncio.ensure_future(sync_to_async(get_inventory_snapshot)())
+        _snapshot_reloads[key] = reload
+        reload.add_done_callback(lambda _: _snapshot_reloads.pop(key, None))
+    # A client disconnecting must not cancel the reload the others wait for
+    return await asyncio.shield(reload)
+
+
+def query_inventory(snapshot, selections=None, search="", sort=None):
+    """Return the selected skins matching filters and search, in display order.
+
+    ``selections`` maps facet groups (``tradable``, ``weapon_types``,
+    ``item_types``) to accepted values. Search terms must all appear in the
+    skin's text. Reserved skins are always listed after the regular ones.
+    """
+    positions = filter_positions(snapshot["facets"], "selected", selections)
+    if positions is None:
+        positions = sorted(snapshot["by_position"])
+
+    terms = search.lower().split() if search else []
+    if terms:
+        search_text = snapshot["search_text"]
+        positions = [
+            position for position in positions
+            if all(term in search_text[position] for term in terms)
+        ]
+
+    by_position = snapshot["by_position"]
+    regular = []
+    reserved = []
+    for position in positions:
+        skin = by_position[position]
+        (reserved if skin.get("is_reserved") else regular).append(skin)
+    return sort_skins(regular, sort) + sort_skins(reserved, sort)
+
+
+def update_inventory_from_manual(raw_json, progress=None):
+    """Update inventory using a manually pasted JSON payload.
+
+    Selection, price and note are carried over from the stored skins (see
+    ``merge.merge_inventory``). Returns the new skins, both totals and the
+    merge report; nothing is written when the payload changes nothing.
+    ``progress(stage, processed)`` is called as the import moves through
+    its ``parsing``, ``merging`` and ``saving`` stages.
+    """
+    progress = progress or (lambda stage, processed: None)
+    with get_storage().lock():
+        try:
+            progress("parsing", 0)
+            current_skins, stored_total_before_filters = load_inventory_from_file()
+            skins, filtered_total, total_before_filters = parse_inventory_json(raw_json)
+
+            progress("merging", len(skins))
+            for skin in skins:
+                _normalize_skin(skin)
+            expire_trade_locks(skins)
+            skins, report = merge_inventory(current_skins, skins)
+            print(f"Inventory merge: {describe_merge(report)}")
+
+            unchanged = total_before_filters == stored_total_before_filters and merge_is_noop(
+                current_skins, skins, report
+            )
+            if not unchanged:
+                progress("saving", len(skins))
+                save_inventory_to_file(skins, filtered_total, total_before_filters, normalized=True)
+            return skins, filtered_total, total_before_filters, report
+        except Exception as exc:
+            print(f"Error updating inventory from manual payload: {exc}")
+            raise
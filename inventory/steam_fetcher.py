@@ -0,0 +1,195 @@
+"""Fetch inventories straight from Steam instead of pasting them in the admin.
+
+Both contexts (16: trade protected, 2: main) are fetched over one pooled
+``requests`` session, at most ``STEAM_FETCH_CONCURRENCY`` at a time, each
+following Steam's ``more_items``/``last_assetid`` pagination. Rate limits
+and server errors are retried with exponential backoff (honouring
+``Retry-After``). Pages are cached on disk with their ``ETag``/
+``Last-Modified`` so unchanged pages are answered with 304 on the next run.
+The payloads feed ``steam_api.update_inventory_from_manual`` as is.
+"""
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import codec
+from .profiles import active_profile, get_profile, use_profile
+
+DEFAULT_INVENTORY_BASE_URL = "https://steamcommunity.com/inventory"
+
+# Trade-protected items first: the first payload holding an asset id wins
+INVENTORY_CONTEXTS = ("16", "2")
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class SteamFetchError(Exception):
+    """Raised when an inventory page cannot be fetched or is not a valid response."""
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def inventory_url(steam_id, context):
+    """Steam inventory endpoint for one context of ``steam_id``."""
+    base = _setting("STEAM_INVENTORY_BASE_URL", DEFAULT_INVENTORY_BASE_URL).rstrip("/")
+    return f"{base}/{steam_id}/{settings.STEAM_APP_ID}/{context}"
+
+
+def build_session(pool_size=None, retries=None):
+    """Return a ``requests`` session with a connection pool and retrying adapter."""
+    pool_size = pool_size or _setting("STEAM_FETCH_CONCURRENCY", 2)
+    retry = Retry(
+        total=_setting("STEAM_FETCH_RETRIES", 4) if retries is None else retries,
+        backoff_factor=_setting("STEAM_FETCH_BACKOFF", 1.0),
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept"] = "application/json"
+    return session
+
+
+def _cache_dir():
+    return _setting("STEAM_FETCH_CACHE_DIR", os.path.join(settings.BASE_DIR, "data", "steam_cache"))
+
+
+def _cache_paths(url, params):
+    key = url + "?" + "&".join(f"{name}={value}" for name, value in sorted(params.items()))
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    base = os.path.join(_cache_dir(), digest)
+    return f"{base}.json", f"{base}.meta"
+
+
+def _read_cached_page(url, params):
+    body_path, meta_path = _cache_paths(url, params)
+    try:
+        with open(meta_path, "rb") as fp:
+            meta = codec.loads(fp.read())
+        with open(body_path, "rb") as fp:
+            return meta, fp.read()
+    except (OSError, ValueError):
+        return None, None
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".steam-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _store_cached_page(url, params, response):
+    meta = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    if not meta["etag"] and not meta["last_modified"]:
+        return
+    body_path, meta_path = _cache_paths(url, params)
+    try:
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        _write_atomic(body_path, response.content)
+        _write_atomic(meta_path, codec.dumps(meta))
+    except OSError as exc:
+        # The cache only saves bandwidth; a failed write is not an error
+        print(f"Could not cache Steam inventory page: {exc}")
+
+
+def fetch_page(session, url, params):
+    """Fetch one inventory page as a payload dict, revalidating a cached copy."""
+    meta, cached_body = _read_cached_page(url, params)
+    headers = {}
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = session.get(url, params=params, headers=headers, timeout=_setting("STEAM_FETCH_TIMEOUT", 20))
+        if response.status_code == 304 and cached_body is not None:
+            body = cached_body
+        else:
+            if response.status_code == 403:
+                raise SteamFetchError(f"Inventory is private or not accessible: {url}")
+            response.raise_for_status()
+            body = response.content
+            _store_cached_page(url, params, response)
+    except requests.RequestException as exc:
+        raise SteamFetchError(f"Could not fetch {url}: {exc}") from exc
+
+    try:
+        payload = codec.loads(body)
+    except ValueError as exc:
+        raise SteamFetchError(f"Steam returned invalid JSON for {url}: {exc}") from exc
+    if not isinstance(payload, dict) or not payload.get("success", 1):
+        raise SteamFetchError(f"Steam reported a failure for {url}")
+    # Empty inventories come without these lists
+    payload.setdefault("assets", [])
+    payload.setdefault("descriptions", [])
+    return payload
+
+
+def iter_context_pages(session, steam_id, context):
+    """Yield every page of one inventory context, following ``last_assetid``."""
+    url = inventory_url(steam_id, context)
+    params = {"l": "english", "count": _setting("STEAM_FETCH_PAGE_SIZE", 2500)}
+    while True:
+        payload = fetch_page(session, url, params)
+        yield payload
+        last_assetid = payload.get("last_assetid")
+        if not payload.get("more_items") or not last_assetid or last_assetid == params.get("start_assetid"):
+            return
+        params = dict(params, start_assetid=last_assetid)
+
+
+def fetch_inventory_payloads(steam_id=None, contexts=INVENTORY_CONTEXTS, session=None):
+    """Return all pages of ``contexts`` for ``steam_id`` (default: the active profile's).
+
+    Contexts are fetched concurrently; the result lists them in the order of
+    ``contexts``, so it can be passed to ``parse_inventory_json`` directly.
+    """
+    steam_id = steam_id or active_profile().steam_id
+    if not steam_id:
+        raise SteamFetchError("No Steam ID configured")
+
+    concurrency = max(1, min(_setting("STEAM_FETCH_CONCURRENCY", 2), len(contexts)))
+    own_session = session is None
+    session = session or build_session(pool_size=concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="steam-fetch") as executor:
+            pages = executor.map(lambda context: list(iter_context_pages(session, steam_id, context)), contexts)
+            return [payload for context_pages in pages for payload in context_pages]
+    finally:
+        if own_session:
+            session.close()
+
+
+def refresh_inventory_from_steam(profile=None, progress=None):
+    """Fetch ``profile``'s inventory from Steam and merge it like a manual import.
+
+    Returns the result of ``update_inventory_from_manual``.
+    """
+    from .steam_api import update_inventory_from_manual
+
+    with use_profile(get_profile(profile)):
+        payloads = fetch_inventory_payloads()
+        return update_inventory_from_manual(payloads, progress=progress)
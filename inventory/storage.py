@@ -0,0 +1,560 @@
+"""Storage backends for the inventory document.
+
+``steam_api`` owns parsing and normalization; a backend only persists and
+returns the ``{"skins": [...], "total": ..., "total_before_filters": ...}``
+document. Stickers and patches in returned documents are shared, read-only
+``helpers.Attachment`` objects. The active backend is chosen with
+``INVENTORY_STORAGE_BACKEND``; each profile (see ``profiles``) gets its own
+instance.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from . import codec
+
+DEFAULT_STORAGE_BACKEND = 'inventory.storage.JsonFileStorage'
+
+# Serializes writers within this process; the lock file does the same across
+# processes. One lock per data file, so profiles do not wait on each other.
+_file_locks = {}
+_file_locks_guard = threading.Lock()
+
+_storages = {}
+_storages_lock = threading.Lock()
+
+
+@contextmanager
+def inventory_file_lock(path=None):
+    """Hold an exclusive lock on the inventory data file.
+
+    The lock is shared by all threads and worker processes using the same
+    data file and is re-entrant within a thread, so callers can wrap a whole
+    load-modify-save sequence around ``save_inventory_to_file``.
+    """
+    path = os.path.abspath(path or settings.LOCAL_DATA_FILE)
+    with _file_locks_guard:
+        if path not in _file_locks:
+            _file_locks[path] = (threading.RLock(), {"depth": 0, "fp": None, "owner": None})
+        file_lock, lock_state = _file_locks[path]
+
+    with file_lock:
+        if lock_state["depth"] == 0:
+            lock_path = f"{path}.lock"
+            os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+            fp = open(lock_path, "a+b")
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+                else:
+                    fp.seek(0)
+                    msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+            except BaseException:
+                fp.close()
+                raise
+            lock_state["fp"] = fp
+            lock_state["owner"] = threading.get_ident()
+
+        lock_state["depth"] += 1
+        try:
+            yield
+        finally:
+            lock_state["depth"] -= 1
+            if lock_state["depth"] == 0:
+                fp = lock_state["fp"]
+                lock_state["fp"] = None
+                lock_state["owner"] = None
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+                    else:
+                        fp.seek(0)
+                        msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+                finally:
+                    fp.close()
+
+
+def inventory_file_lock_held(path=None):
+    """True if the current thread holds ``inventory_file_lock(path)``."""
+    path = os.path.abspath(path or settings.LOCAL_DATA_FILE)
+    with _file_locks_guard:
+        entry = _file_locks.get(path)
+    # Only the holding thread sets its own id, so no lock is needed to compare
+    return entry is not None and entry[1]["owner"] == threading.get_ident()
+
+
+def _atomic_write_json(path, data):
+    """Write JSON to a temp file beside ``path``, fsync it and swap it into place.
+
+    Readers either see the previous file or the complete new one, never a
+    partially written document.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".inventory-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(codec.dumps(data))
+            fp.flush()
+            os.fsync(fp.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if fcntl is not None:
+        # Persist the rename itself; not supported for directories on Windows.
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+# Schema version from which JSON files hold the shared attachment table.
+# Versions are stamped by steam_api, see steam_api.SCHEMA_VERSION.
+ATTACHMENT_TABLE_VERSION = 2
+
+_ATTACHMENT_LISTS = ("stickers", "patches")
+
+
+def _pack_attachments(data):
+    """Return ``data`` with stickers/patches moved to a shared ``attachments`` table.
+
+    Skins reference table entries by index, so a sticker that appears on
+    many skins is stored once.
+    """
+    table = []
+    ids = {}
+    skins = []
+    for skin in data.get("skins", []):
+        packed = dict(skin)
+        for field in _ATTACHMENT_LISTS:
+            refs = []
+            for attachment in skin.get(field) or []:
+                key = (attachment.get("icon_url"), attachment.get("name"))
+                if key not in ids:
+                    ids[key] = len(table)
+                    table.append({"icon_url": key[0], "name": key[1]})
+                refs.append(ids[key])
+            packed[field] = refs
+        skins.append(packed)
+    document = {"schema_version": max(data.get("schema_version") or 1, ATTACHMENT_TABLE_VERSION)}
+    document.update((key, value) for key, value in data.items() if key != "schema_version")
+    document["attachments"] = table
+    document["skins"] = skins
+    return document
+
+
+def _unpack_attachments(data):
+    """Resolve attachment references in place to shared, read-only objects."""
+    from .helpers import intern_attachment
+
+    # Files without a header predate the attachment table (version 1)
+    data.setdefault("schema_version", 1)
+    table = [intern_attachment(entry) for entry in data.pop("attachments", None) or []]
+    for skin in data.get("skins", []):
+        for field in _ATTACHMENT_LISTS:
+            refs = skin.get(field)
+            if refs:
+                # Files written before the table existed hold the dicts inline
+                skin[field] = [
+                    table[ref] if isinstance(ref, int) else intern_attachment(ref)
+                    for ref in refs
+                ]
+    return data
+
+
+class InventoryStorage:
+    """Interface implemented by inventory storage backends."""
+
+    # True when signature() is a local stat that async views may call on the event loop
+    nonblocking_signature = False
+    # True when for_profile() can store profiles other than the default one
+    # (checked at startup, see checks.check_storage_backend)
+    supports_profiles = False
+
+    @classmethod
+    def for_profile(cls, profile):
+        """Return the backend instance holding ``profile``'s inventory."""
+        if not profile.is_default:
+            raise ImproperlyConfigured(f"{cls.__name__} only stores the default profile's inventory")
+        return cls()
+
+    def read(self, selected_only=False):
+        """Return the stored document, or None when nothing has been saved yet.
+
+        With ``selected_only`` a backend may omit unselected skins.
+        """
+        raise NotImplementedError
+
+    def write(self, data):
+        """Persist a full, already sanitized inventory document."""
+        raise NotImplementedError
+
+    def update_skins(self, changes):
+        """Apply ``{asset_id: {field: value}}`` changes to stored skins.
+
+        The default implementation rewrites the whole document; backends that
+        can address single skins override it.
+        """
+        from .helpers import build_facet_index, update_facet_selection
+
+        with self.lock():
+            data = self.read()
+            if data is None:
+                return
+            skins = data.get("skins", [])
+            facets = data.get("facets")
+            if facets is None:
+                facets = data["facets"] = build_facet_index(skins)
+            for position, skin in enumerate(skins):
+                updates = changes.get(skin.get("asset_id"))
+                if not updates:
+                    continue
+                if "selected" in updates and bool(updates["selected"]) != bool(skin.get("selected", False)):
+                    update_facet_selection(facets, position, skin, bool(updates["selected"]))
+                skin.update(updates)
+            self.write(data)
+
+    def signature(self):
+        """Return a cheap token that changes whenever the stored data changes."""
+        raise NotImplementedError
+
+    def last_modified(self):
+        """Return when the stored data last changed (aware datetime), or None if unknown."""
+        return None
+
+    def lock(self):
+        """Return a context manager that serializes writers."""
+        raise NotImplementedError
+
+    def lock_held(self):
+        """True if the current thread is inside ``lock()``."""
+        return False
+
+
+class JsonFileStorage(InventoryStorage):
+    """Single JSON document at ``LOCAL_DATA_FILE``."""
+
+    nonblocking_signature = True
+    supports_profiles = True
+
+    def __init__(self, path=None):
+        self._path = path
+
+    @classmethod
+    def for_profile(cls, profile):
+        return cls(profile.data_file)
+
+    @property
+    def path(self):
+        return self._path or settings.LOCAL_DATA_FILE
+
+    def read(self, selected_only=False):
+        path = self.path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+
+        try:
+            with open(path, "rb") as fp:
+                return _unpack_attachments(codec.loads(fp.read()))
+        except json.JSONDecodeError:
+            # Never overwrite a corrupted file; keep a copy for manual recovery.
+            backup_path = f"{path}.corrupt"
+            try:
+                shutil.copy2(path, backup_path)
+                print(f"Corrupted inventory preserved at {backup_path}")
+            except OSError as copy_error:
+                print(f"Could not back up corrupted inventory: {copy_error}")
+            raise
+
+    def write(self, data):
+        path = self.path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.lock():
+            _atomic_write_json(path, _pack_attachments(data))
+
+    def signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def last_modified(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return None
+        return datetime.fromtimestamp(mtime, tz=timezone.utc)
+
+    def lock(self):
+        return inventory_file_lock(self.path)
+
+    def lock_held(self):
+        return inventory_file_lock_held(self.path)
+
+
+class DatabaseStorage(InventoryStorage):
+    """Skins stored as rows in the Django database.
+
+    Writes diff the incoming skins against existing rows by ``asset_id`` and
+    only touch rows whose fields or stickers changed.
+    """
+
+    SKIN_FIELDS = (
+        "name", "icon_url", "exterior", "selected", "weapon_type", "item_type",
+        "rarity", "rarity_color", "inspect_link", "pattern_template",
+        "collection", "price_eur", "note",
+    )
+
+    def read(self, selected_only=False):
+        from .models import InventoryState, Skin
+
+        state = InventoryState.objects.filter(pk=InventoryState.SINGLETON_ID).first()
+        if state is None:
+            return None
+
+        queryset = Skin.objects.order_by("position").prefetch_related("attachments")
+        if selected_only:
+            queryset = queryset.filter(selected=True)
+
+        skins = [self._row_to_skin(row) for row in queryset]
+        facets = state.facets
+        if facets is None:
+            # Rows written before the facet index existed
+            from .helpers import build_facet_index
+
+            all_skins = skins if not selected_only else [
+                self._row_to_skin(row) for row in Skin.objects.order_by("position").prefetch_related("attachments")
+            ]
+            facets = build_facet_index(all_skins)
+            InventoryState.objects.filter(pk=state.pk).update(facets=facets)
+
+        # Rows are only ever written from normalized documents
+        from django.db.models import Min
+        from .steam_api import SCHEMA_VERSION
+
+        return {
+            "schema_version": SCHEMA_VERSION,
+            "skins": skins,
+            "total": state.total,
+            "total_before_filters": state.total_before_filters,
+            "facets": facets,
+            "next_unlock_at": Skin.objects.aggregate(next_unlock_at=Min("unlock_at"))["next_unlock_at"],
+        }
+
+    def write(self, data):
+        from django.db import transaction
+        from django.db.models import F
+        from .models import InventoryState, Skin, SkinSticker
+
+        skins = data.get("skins", [])
+        with transaction.atomic():
+            existing = {}
+            for row in Skin.objects.prefetch_related("attachments"):
+                existing.setdefault(row.asset_id, []).append(row)
+
+            keep_ids = set()
+            for position, skin in enumerate(skins):
+                values = self._skin_to_fields(skin, position)
+                attachments = self._skin_attachments(skin)
+                candidates = existing.get(values["asset_id"])
+                row = candidates.pop(0) if candidates else None
+
+                if row is None:
+                    row = Skin.objects.create(**values)
+                    SkinSticker.objects.bulk_create(
+                        SkinSticker(skin=row, **attachment) for attachment in attachments
+                    )
+                    keep_ids.add(row.pk)
+                    continue
+
+                keep_ids.add(row.pk)
+                changed = [field for field, value in values.items() if getattr(row, field) != value]
+                if changed:
+                    for field in changed:
+                        setattr(row, field, values[field])
+                    row.save(update_fields=changed)
+
+                if self._row_attachments(row) != attachments:
+                    row.attachments.all().delete()
+                    SkinSticker.objects.bulk_create(
+                        SkinSticker(skin=row, **attachment) for attachment in attachments
+                    )
+
+            stale = [row.pk for rows in existing.values() for row in rows if row.pk not in keep_ids]
+            if stale:
+                Skin.objects.filter(pk__in=stale).delete()
+
+            state, created = InventoryState.objects.get_or_create(
+                pk=InventoryState.SINGLETON_ID,
+                defaults={
+                    "total": data.get("total", len(skins)),
+                    "total_before_filters": data.get("total_before_filters", len(skins)),
+                    "facets": data.get("facets"),
+                    "updated_at": datetime.now(timezone.utc),
+                },
+            )
+            if not created:
+                InventoryState.objects.filter(pk=state.pk).update(
+                    total=data.get("total", len(skins)),
+                    total_before_filters=data.get("total_before_filters", len(skins)),
+                    facets=data.get("facets"),
+                    generation=F("generation") + 1,
+                    updated_at=datetime.now(timezone.utc),
+                )
+
+    def update_skins(self, changes):
+        from django.db import transaction
+        from django.db.models import F
+        from .models import InventoryState, Skin
+
+        from .helpers import update_facet_selection
+
+        with transaction.atomic():
+            state = InventoryState.objects.select_for_update().filter(pk=InventoryState.SINGLETON_ID).first()
+            facets = state.facets if state is not None else None
+
+            if facets is not None:
+                toggled = {
+                    asset_id: bool(updates["selected"])
+                    for asset_id, updates in changes.items() if "selected" in updates
+                }
+                rows = Skin.objects.filter(asset_id__in=toggled).values(
+                    "position", "asset_id", "selected", "tradable_raw", "weapon_type", "item_type",
+                )
+                for row in rows:
+                    if row["selected"] != toggled[row["asset_id"]]:
+                        skin = {
+                            "tradable_info": {"raw": row["tradable_raw"]},
+                            "weapon_type": row["weapon_type"],
+                            "item_type": row["item_type"],
+                        }
+                        update_facet_selection(facets, row["position"], skin, toggled[row["asset_id"]])
+
+            for asset_id, updates in changes.items():
+                fields = {field: value for field, value in updates.items() if field in self.SKIN_FIELDS}
+                if fields:
+                    Skin.objects.filter(asset_id=asset_id).update(**fields)
+            InventoryState.objects.filter(pk=InventoryState.SINGLETON_ID).update(
+                facets=facets,
+                generation=F("generation") + 1,
+                updated_at=datetime.now(timezone.utc),
+            )
+
+    def signature(self):
+        from .models import InventoryState
+
+        return InventoryState.objects.filter(pk=InventoryState.SINGLETON_ID).values_list(
+            "generation", flat=True
+        ).first()
+
+    def last_modified(self):
+        from .models import InventoryState
+
+        return InventoryState.objects.filter(pk=InventoryState.SINGLETON_ID).values_list(
+            "updated_at", flat=True
+        ).first()
+
+    def lock(self):
+        from django.db import transaction
+
+        return transaction.atomic()
+
+    def lock_held(self):
+        from django.db import connection
+
+        return connection.in_atomic_block
+
+    def _skin_to_fields(self, skin, position):
+        values = {field: skin.get(field) for field in self.SKIN_FIELDS}
+        values["selected"] = bool(values["selected"])
+        values["note"] = values["note"] or ""
+        values["weapon_type"] = values["weapon_type"] or "Other"
+        values["item_type"] = values["item_type"] or "Other"
+        values["asset_id"] = skin.get("asset_id")
+        values["position"] = position
+        values["float_value"] = skin.get("float")
+        tradable_info = skin.get("tradable_info") or {}
+        values["tradable_raw"] = tradable_info.get("raw") or skin.get("tradable", "Yes")
+        values["unlock_at"] = None if tradable_info.get("is_tradable", True) else tradable_info.get("unlock_epoch")
+        return values
+
+    @staticmethod
+    def _skin_attachments(skin):
+        attachments = []
+        for kind, key in (("sticker", "stickers"), ("patch", "patches")):
+            for index, entry in enumerate(skin.get(key) or []):
+                attachments.append({
+                    "kind": kind,
+                    "position": index,
+                    "name": entry.get("name") or "",
+                    "icon_url": entry.get("icon_url") or "",
+                })
+        return attachments
+
+    @staticmethod
+    def _row_attachments(row):
+        return [
+            {
+                "kind": attachment.kind,
+                "position": attachment.position,
+                "name": attachment.name,
+                "icon_url": attachment.icon_url,
+            }
+            for attachment in row.attachments.all()
+        ]
+
+    def _row_to_skin(self, row):
+        from .helpers import build_tradable_info, intern_attachment
+
+        skin = {field: getattr(row, field) for field in self.SKIN_FIELDS}
+        skin["asset_id"] = row.asset_id
+        skin["float"] = row.float_value
+        skin["wear_rating"] = row.float_value
+        skin["tradable_info"] = build_tradable_info(row.tradable_raw, row.unlock_at)
+        skin["stickers"] = []
+        skin["patches"] = []
+        for attachment in row.attachments.all():
+            target = skin["stickers"] if attachment.kind == "sticker" else skin["patches"]
+            target.append(intern_attachment({"icon_url": attachment.icon_url, "name": attachment.name}))
+        return skin
+
+
+def get_storage(profile=None):
+    """Return the configured storage backend for ``profile`` (default: the active profile)."""
+    from .profiles import get_profile
+
+    profile = get_profile(profile)
+    backend_path = getattr(settings, 'INVENTORY_STORAGE_BACKEND', DEFAULT_STORAGE_BACKEND)
+    key = (backend_path, profile.slug)
+    storage = _storages.get(key)
+    if storage is None:
+        with _storages_lock:
+            storage = _storages.get(key)
+            if storage is None:
+                storage = import_string(backend_path).for_profile(profile)
+                _storages[key] = storage
+    return storage
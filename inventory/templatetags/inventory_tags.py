@@ -1,7 +1,14 @@
+from urllib.parse import urlencode
+
 from django import template
+from django.conf import settings
+from django.urls import reverse
 from django.utils.html import escape
 from django.utils.safestring import mark_safe
 
+from inventory.fragment_cache import render_skin_fragment
+from inventory.icon_cache import source_url
+
 register = template.Library()
 
 
@@ -16,3 +23,18 @@ def pipe_breaks(value: str | None) -> str:
         return ""
 
     return mark_safe("<br>".join(segments))
+
+
+@register.simple_tag(name="skin_fragment")
+def skin_fragment(template_name: str, skin: dict) -> str:
+    """Render a skin card partial through the per-skin fragment cache."""
+    return render_skin_fragment(template_name, skin)
+
+
+@register.simple_tag(name="icon_src")
+def icon_src(icon_url: str | None, variant: str = "skin") -> str:
+    """Return the image URL for a skin or sticker icon, through the icon proxy when enabled."""
+    url = source_url(icon_url)
+    if not url or not getattr(settings, "ICON_PROXY_ENABLED", False):
+        return url
+    return f"{reverse('inventory:icon_proxy', args=[variant])}?{urlencode({'src': url})}"
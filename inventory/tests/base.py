@@ -0,0 +1,83 @@
+"""Shared setup for the inventory tests: a temporary data file and clean caches."""
+import os
+import shutil
+import tempfile
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from inventory.helpers import build_tradable_info
+from inventory.steam_api import invalidate_inventory_snapshot, save_inventory_to_file
+from inventory.storage import get_storage
+
+
+def make_skin(asset_id, name="AK-47 | Redline", **fields):
+    """A stored skin as ``save_inventory_to_file`` accepts it."""
+    skin = {
+        "name": name,
+        "asset_id": asset_id,
+        "icon_url": f"icon-{asset_id}",
+        "exterior": "Field-Tested",
+        "tradable_info": build_tradable_info("Yes"),
+        "weapon_type": "AK-47",
+        "item_type": "Rifle",
+        "stickers": [],
+        "patches": [],
+        "selected": False,
+        "price_eur": None,
+        "note": "",
+    }
+    skin.update(fields)
+    return skin
+
+
+class InventoryTestCase(TestCase):
+    """Runs each test against its own data file with empty caches."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp(prefix="inventory-test-")
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        self.data_file = os.path.join(self.tmp_dir, "inventory_data.json")
+        overrides = override_settings(
+            LOCAL_DATA_FILE=self.data_file,
+            INVENTORY_STORAGE_BACKEND="inventory.storage.JsonFileStorage",
+            INVENTORY_REFRESH_ASYNC=False,
+            REFRESH_JOB_DIR=os.path.join(self.tmp_dir, "jobs"),
+            ICON_CACHE_DIR=os.path.join(self.tmp_dir, "icons"),
+            STEAM_FETCH_CACHE_DIR=os.path.join(self.tmp_dir, "steam_cache"),
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self._clear_caches()
+        self.addCleanup(self._clear_caches)
+
+    @staticmethod
+    def _clear_caches():
+        invalidate_inventory_snapshot()
+        for alias in ("default", "skin_fragments"):
+            caches[alias].clear()
+
+    def store_skins(self, skins):
+        save_inventory_to_file(skins, len(skins))
+
+    def store_skins_with_expired_lock(self, skins):
+        """Store ``skins`` as written while the first one's trade lock was still pending.
+
+        The lock has run out a minute ago, so the next load writes it back.
+        """
+        self.store_skins(skins)
+        storage = get_storage()
+        data = storage.read()
+        past = int(time.time()) - 60
+        data["skins"][0]["tradable_info"] = build_tradable_info("Trade Protected until Jan 1, 2020 (9:00:00)", past)
+        data["next_unlock_at"] = past
+        storage.write(data)
+        invalidate_inventory_snapshot()
+
+    def login_admin(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(user)
+        return user
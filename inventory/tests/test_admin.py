@@ -0,0 +1,33 @@
+from inventory.steam_api import load_inventory_from_file
+from inventory.tests.base import InventoryTestCase, make_skin
+
+
+class SaveSelectionTests(InventoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login_admin()
+
+    def _save(self, **fields):
+        data = {"action": "save_selection", "selected_skins": ["0", "1", "2"]}
+        data.update(fields)
+        return self.client.post("/manage/", data)
+
+    def test_copies_of_a_stacked_asset_keep_their_own_price_and_note(self):
+        # amount > 1 assets become several skins sharing one asset id
+        self.store_skins([make_skin("100"), make_skin("100"), make_skin("200")])
+
+        response = self._save(price_0="10", price_1="20", price_2="30", note_1="held for a friend")
+
+        self.assertEqual(response.status_code, 302)
+        skins, _ = load_inventory_from_file()
+        self.assertEqual([skin["price_eur"] for skin in skins], ["10", "20", "30"])
+        self.assertEqual([skin["note"] for skin in skins], ["", "held for a friend", ""])
+
+    def test_single_skin_change_is_stored(self):
+        self.store_skins([make_skin("100"), make_skin("200")])
+
+        self.client.post("/manage/", {"action": "save_selection", "selected_skins": ["1"], "price_1": "5"})
+
+        skins, _ = load_inventory_from_file()
+        self.assertEqual([skin["selected"] for skin in skins], [False, True])
+        self.assertEqual(skins[1]["price_eur"], "5")
@@ -0,0 +1,81 @@
+from inventory.helpers import build_tradable_info
+from inventory.tests.base import InventoryTestCase, make_skin
+from inventory.views import SKINS_PAGE_SIZE_MAX
+
+
+class SkinsApiTests(InventoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.store_skins([
+            make_skin("100", selected=True, price_eur="30", float=0.2),
+            make_skin("200", name="AWP | Asiimov", weapon_type="AWP", item_type="Sniper Rifle",
+                      selected=True, price_eur="80", float=0.4),
+            make_skin("300", name="Glock-18 | Fade", weapon_type="Glock-18", item_type="Pistol",
+                      selected=True, price_eur="10", note="reserved for Bob"),
+            make_skin("400", name="AWP | Dragon Lore", weapon_type="AWP", item_type="Sniper Rifle",
+                      selected=True, price_eur="5000",
+                      tradable_info=build_tradable_info("Trade Protected until Jan 1, 2099 (9:00:00)")),
+            make_skin("500", name="AWP | Redline", weapon_type="AWP", item_type="Sniper Rifle"),
+        ])
+
+    def _ids(self, **params):
+        response = self.client.get("/api/skins/", params)
+        self.assertEqual(response.status_code, 200)
+        return [skin["asset_id"] for skin in response.json()["results"]]
+
+    def test_lists_selected_skins_with_reserved_last(self):
+        data = self.client.get("/api/skins/").json()
+
+        self.assertEqual([skin["asset_id"] for skin in data["results"]], ["100", "200", "400", "300"])
+        self.assertEqual(data["total"], 4)
+        self.assertIsNone(data["next_cursor"])
+        self.assertTrue(data["results"][-1]["is_reserved"])
+
+    def test_filters(self):
+        self.assertEqual(self._ids(weapon_type="AWP"), ["200", "400"])
+        self.assertEqual(self._ids(item_type=["Rifle", "Pistol"]), ["100", "300"])
+        self.assertEqual(self._ids(weapon_type="AWP", tradable="Yes"), ["200"])
+
+    def test_search_needs_every_term(self):
+        self.assertEqual(self._ids(q="awp"), ["200", "400"])
+        self.assertEqual(self._ids(q="awp lore"), ["400"])
+        self.assertEqual(self._ids(q="redline"), ["100"])
+
+    def test_sort(self):
+        self.assertEqual(self._ids(sort="price-asc"), ["100", "200", "400", "300"])
+        self.assertEqual(self._ids(sort="price-desc"), ["400", "200", "100", "300"])
+        self.assertEqual(self._ids(sort="float-desc"), ["200", "100", "400", "300"])
+
+    def test_cursor_paging_visits_every_skin_once(self):
+        seen = []
+        cursor = None
+        for _ in range(10):
+            params = {"limit": 3, "sort": "price-desc"}
+            if cursor:
+                params["cursor"] = cursor
+            data = self.client.get("/api/skins/", params).json()
+            seen.extend(skin["asset_id"] for skin in data["results"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, ["400", "200", "100", "300"])
+
+    def test_rejects_invalid_paging(self):
+        for params in ({"limit": 0}, {"limit": -1}, {"limit": "x"}, {"cursor": -3}, {"cursor": "abc"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get("/api/skins/", params).status_code, 400)
+
+    def test_limit_is_capped(self):
+        data = self.client.get("/api/skins/", {"limit": SKINS_PAGE_SIZE_MAX * 10}).json()
+
+        self.assertEqual(len(data["results"]), 4)
+
+    def test_html_format_renders_the_cards(self):
+        data = self.client.get("/api/skins/", {"format": "html", "limit": 1}).json()
+
+        self.assertIn("AK-47 | Redline", data["html"])
+        self.assertEqual(data["next_cursor"], "1")
+
+    def test_only_get(self):
+        self.assertEqual(self.client.post("/api/skins/").status_code, 405)
@@ -0,0 +1,49 @@
+import json
+
+from django.test import AsyncRequestFactory
+
+from inventory import views
+from inventory.tests.base import InventoryTestCase, make_skin
+
+
+class AsyncShowroomViewTests(InventoryTestCase):
+    """The ASGI variants, called directly since urls.py picks them at import time."""
+
+    def setUp(self):
+        super().setUp()
+        self.factory = AsyncRequestFactory()
+        self.store_skins([make_skin("100", selected=True), make_skin("200", selected=True), make_skin("300")])
+
+    async def test_index_sets_validators_and_answers_304_when_unchanged(self):
+        response = await views.index_async(self.factory.get("/buy/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        revalidated = await views.index_async(self.factory.get("/buy/", headers={"If-None-Match": response["ETag"]}))
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertIn("no-cache", revalidated["Cache-Control"])
+
+    async def test_index_matches_the_sync_view(self):
+        async_response = await views.index_async(self.factory.get("/buy/"))
+
+        self.assertEqual(async_response.content, self.client.get("/buy/").content)
+
+    async def test_api_lists_selected_skins(self):
+        response = await views.api_skins_async(self.factory.get("/api/skins/", {"limit": "1"}))
+
+        data = json.loads(response.content)
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(len(data["results"]), 1)
+        self.assertEqual(data["next_cursor"], "1")
+
+    async def test_api_only_allows_get(self):
+        response = await views.api_skins_async(self.factory.post("/api/skins/"))
+
+        self.assertEqual(response.status_code, 405)
+
+    async def test_landing(self):
+        response = await views.landing_async(self.factory.get("/"))
+
+        self.assertEqual(response.status_code, 200)
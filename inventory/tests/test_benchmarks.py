@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+
+class BenchmarkCommandTests(SimpleTestCase):
+    def test_synthetic_suites_leave_the_shipped_data_file_alone(self):
+        # The pages suite sets up its own test database, so it runs in a
+        # separate process against the real settings
+        data_file = settings.LOCAL_DATA_FILE
+        with open(data_file, "rb") as fp:
+            before = fp.read()
+
+        def restore():
+            with open(data_file, "rb") as fp:
+                if fp.read() != before:
+                    with open(data_file, "wb") as out:
+                        out.write(before)
+        self.addCleanup(restore)
+
+        result = subprocess.run(
+            [sys.executable, os.path.join(settings.BASE_DIR, "manage.py"), "benchmark_inventory",
+             "pages", "pipeline", "--sizes", "30", "--repeat", "1"],
+            capture_output=True, text=True, timeout=300,
+            env={**os.environ, "INVENTORY_STORAGE_BACKEND": "inventory.storage.JsonFileStorage"},
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("index (cold) @30", result.stdout)
+        self.assertIn("save_inventory_to_file @30", result.stdout)
+        with open(data_file, "rb") as fp:
+            self.assertEqual(fp.read(), before)
@@ -0,0 +1,117 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from inventory.helpers import build_facet_index, facet_counts
+from inventory.models import Skin
+from inventory.steam_api import load_inventory_from_file, save_inventory_to_file, update_inventory_skins
+from inventory.storage import DatabaseStorage, JsonFileStorage, get_storage
+from inventory.tests.base import InventoryTestCase, make_skin
+
+STICKER = {"name": "Sticker | Crown (Foil)", "icon_url": "sticker-crown"}
+PATCH = {"name": "Patch | Phoenix", "icon_url": "patch-phoenix"}
+
+
+class DatabaseStorageTests(InventoryTestCase):
+    def setUp(self):
+        super().setUp()
+        overrides = override_settings(INVENTORY_STORAGE_BACKEND="inventory.storage.DatabaseStorage")
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.storage = get_storage()
+
+    def _asset_ids(self):
+        return [skin["asset_id"] for skin in self.storage.read()["skins"]]
+
+    def test_round_trip(self):
+        self.assertIsInstance(self.storage, DatabaseStorage)
+        self.assertIsNone(self.storage.read())
+        self.store_skins([
+            make_skin("100", selected=True, price_eur="12.50", note="mint", stickers=[STICKER], float=0.0712),
+            make_skin("200", name="Sir Bloody Darryl Royale | The Professionals", weapon_type="Other",
+                      item_type="Agent", exterior=None, stickers=[STICKER], patches=[PATCH]),
+        ])
+
+        data = self.storage.read()
+
+        first, second = data["skins"]
+        self.assertEqual(data["total"], 2)
+        self.assertEqual((first["asset_id"], first["selected"], first["price_eur"], first["note"]),
+                         ("100", True, "12.5", "mint"))
+        self.assertEqual(first["float"], 0.0712)
+        self.assertEqual(first["stickers"], [STICKER])
+        self.assertEqual((second["stickers"], second["patches"]), ([STICKER], [PATCH]))
+        self.assertEqual(second["item_type"], "Agent")
+        self.assertEqual(facet_counts(data["facets"], "selected"),
+                         facet_counts(build_facet_index(data["skins"]), "selected"))
+
+    def test_save_only_replaces_changed_and_removed_rows(self):
+        self.store_skins([make_skin("100"), make_skin("200"), make_skin("300")])
+        pks = dict(Skin.objects.values_list("asset_id", "pk"))
+        signature = self.storage.signature()
+
+        self.store_skins([make_skin("300", note="moved"), make_skin("100"), make_skin("400")])
+
+        self.assertEqual(self._asset_ids(), ["300", "100", "400"])
+        rows = dict(Skin.objects.values_list("asset_id", "pk"))
+        self.assertEqual((rows["100"], rows["300"]), (pks["100"], pks["300"]))
+        self.assertNotIn("200", rows)
+        self.assertEqual(Skin.objects.get(asset_id="300").note, "moved")
+        self.assertNotEqual(self.storage.signature(), signature)
+
+    def test_stacked_copies_keep_their_own_rows(self):
+        self.store_skins([
+            make_skin("100", price_eur="1.00"),
+            make_skin("100", price_eur="2.00"),
+            make_skin("200"),
+        ])
+
+        self.store_skins([make_skin("100", price_eur="1.00"), make_skin("100", price_eur="3.00")])
+
+        skins = self.storage.read()["skins"]
+        self.assertEqual([(skin["asset_id"], skin["price_eur"]) for skin in skins], [("100", "1"), ("100", "3")])
+        self.assertEqual(Skin.objects.count(), 2)
+
+        self.store_skins([make_skin("100", price_eur="1.00")])
+
+        self.assertEqual(Skin.objects.count(), 1)
+
+    def test_partial_update_keeps_the_facet_index_current(self):
+        self.store_skins([
+            make_skin("100", selected=True),
+            make_skin("200", name="AWP | Asiimov", weapon_type="AWP", item_type="Sniper Rifle"),
+        ])
+        signature = self.storage.signature()
+
+        update_inventory_skins({"100": {"selected": False}, "200": {"selected": True, "price_eur": "80"}})
+
+        data = self.storage.read()
+        self.assertEqual([skin["selected"] for skin in data["skins"]], [False, True])
+        self.assertEqual(data["skins"][1]["price_eur"], "80")
+        self.assertEqual(facet_counts(data["facets"], "selected"),
+                         facet_counts(build_facet_index(data["skins"]), "selected"))
+        self.assertNotEqual(self.storage.signature(), signature)
+
+    def test_load_inventory_from_file(self):
+        self.store_skins([make_skin("100", selected=True), make_skin("200")])
+
+        skins, total = load_inventory_from_file(selected_only=True)
+
+        self.assertEqual([skin["asset_id"] for skin in skins], ["100"])
+        self.assertEqual(total, 2)
+
+    def test_import_command(self):
+        source = JsonFileStorage(self.data_file)
+        skins = [make_skin("100", selected=True, price_eur="5", stickers=[STICKER]), make_skin("200")]
+        save_inventory_to_file(skins, 2, 3, storage=source)
+
+        out = StringIO()
+        call_command("import_inventory_json", self.data_file, stdout=out)
+
+        self.assertIn("Imported 2 skins", out.getvalue())
+        data = self.storage.read()
+        self.assertEqual(self._asset_ids(), ["100", "200"])
+        self.assertEqual(data["skins"][0]["stickers"], [STICKER])
+        self.assertEqual(data["skins"][0]["price_eur"], "5")
+        self.assertEqual(data["total_before_filters"], 3)
@@ -0,0 +1,103 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import override_settings
+
+from inventory import icon_cache
+from inventory.icon_cache import IconFetchError, get_icon
+from inventory.tests.base import InventoryTestCase
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 1016
+
+
+class _CdnHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path.startswith("/broken/"):
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(PNG)))
+        self.end_headers()
+        self.wfile.write(PNG)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class IconCacheTests(InventoryTestCase):
+    """``get_icon`` and the ``/icons/`` view against a local stand-in for the CDN."""
+
+    def setUp(self):
+        super().setUp()
+        self.cdn = ThreadingHTTPServer(("127.0.0.1", 0), _CdnHandler)
+        self.cdn.requests = []
+        thread = threading.Thread(target=self.cdn.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.cdn.server_close)
+        self.addCleanup(self.cdn.shutdown)
+        self.cdn_url = f"http://127.0.0.1:{self.cdn.server_address[1]}"
+
+        overrides = override_settings(ICON_CDN_HOSTS=("127.0.0.1",), ICON_CACHE_MAX_BYTES=2560)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        # The running cache size is tracked per process
+        icon_cache._size_state["bytes"] = None
+
+    def test_second_request_is_served_from_the_cache(self):
+        url = f"{self.cdn_url}/economy/a.png"
+
+        self.assertEqual(get_icon(url, "skin"), (PNG, "image/png"))
+        self.assertEqual(get_icon(url, "skin"), (PNG, "image/png"))
+
+        self.assertEqual(self.cdn.requests, ["/economy/a.png"])
+
+    def test_least_recently_used_images_are_evicted_past_the_size_limit(self):
+        first, second, third = (f"{self.cdn_url}/economy/{name}.png" for name in "abc")
+        get_icon(first, "skin")
+        get_icon(second, "skin")
+        for url in (first, second):
+            path = icon_cache._cache_path(url, None, None)
+            os.utime(path, (1_000_000, 1_000_000))
+        get_icon(first, "skin")  # a hit makes it the most recently used
+
+        get_icon(third, "skin")  # 3 KB cached, 2.5 KB allowed
+
+        self.assertTrue(os.path.exists(icon_cache._cache_path(first, None, None)))
+        self.assertFalse(os.path.exists(icon_cache._cache_path(second, None, None)))
+        self.assertTrue(os.path.exists(icon_cache._cache_path(third, None, None)))
+
+    def test_fetch_failure_raises(self):
+        with self.assertRaises(IconFetchError):
+            get_icon(f"{self.cdn_url}/broken/a.png", "skin")
+
+    def test_view_serves_cached_image(self):
+        response = self.client.get("/icons/skin/", {"src": f"{self.cdn_url}/economy/a.png"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(response.content, PNG)
+
+    def test_view_rejects_other_hosts(self):
+        response = self.client.get("/icons/skin/", {"src": "https://example.com/a.png"})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.cdn.requests, [])
+
+    def test_view_rejects_unknown_variants(self):
+        response = self.client.get("/icons/huge/", {"src": f"{self.cdn_url}/economy/a.png"})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_view_redirects_to_the_cdn_when_the_fetch_fails(self):
+        src = f"{self.cdn_url}/broken/a.png"
+
+        response = self.client.get("/icons/skin/", {"src": src})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], src)
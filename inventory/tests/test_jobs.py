@@ -0,0 +1,60 @@
+import hashlib
+from datetime import timedelta
+
+from django.utils import timezone
+
+from inventory import jobs
+from inventory.benchmarks.synthetic import make_inventory_text
+from inventory.models import RefreshJob
+from inventory.tests.base import InventoryTestCase
+
+
+class EnqueueRefreshTests(InventoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.payload = make_inventory_text(20)
+        self.payload_hash = hashlib.sha256(self.payload.encode("utf-8") + b"\0").hexdigest()
+
+    def _active_job(self, **fields):
+        return RefreshJob.objects.create(payload_hash=self.payload_hash, **fields)
+
+    def test_job_left_queued_by_a_restarted_worker_is_submitted_again(self):
+        dead = self._active_job()
+
+        job = jobs.enqueue_refresh([self.payload])
+
+        self.assertNotEqual(job.pk, dead.pk)
+        self.assertEqual(job.status, RefreshJob.STATUS_SUCCEEDED)
+        dead.refresh_from_db()
+        self.assertEqual(dead.status, RefreshJob.STATUS_FAILED)
+
+    def test_running_job_without_recent_heartbeat_is_submitted_again(self):
+        stale = timezone.now() - timedelta(hours=1)
+        dead = self._active_job(status=RefreshJob.STATUS_RUNNING, heartbeat_at=stale)
+
+        job = jobs.enqueue_refresh([self.payload])
+
+        self.assertNotEqual(job.pk, dead.pk)
+        self.assertEqual(job.status, RefreshJob.STATUS_SUCCEEDED)
+
+    def test_running_job_with_recent_heartbeat_is_reused(self):
+        running = self._active_job(status=RefreshJob.STATUS_RUNNING, heartbeat_at=timezone.now())
+
+        self.assertEqual(jobs.enqueue_refresh([self.payload]).pk, running.pk)
+        self.assertEqual(RefreshJob.objects.count(), 1)
+
+    def test_job_queued_on_this_process_is_reused(self):
+        queued = self._active_job()
+        jobs._owned_jobs.add(queued.pk)
+        self.addCleanup(jobs._owned_jobs.discard, queued.pk)
+
+        self.assertEqual(jobs.enqueue_refresh([self.payload]).pk, queued.pk)
+
+    def test_abandoned_job_is_not_run(self):
+        dead = self._active_job()
+        jobs.enqueue_refresh([self.payload])
+
+        jobs.run_refresh_job(dead.pk)
+
+        dead.refresh_from_db()
+        self.assertEqual(dead.status, RefreshJob.STATUS_FAILED)
@@ -0,0 +1,40 @@
+import threading
+import time
+
+from inventory import steam_api
+from inventory.steam_api import load_inventory_from_file
+from inventory.storage import get_storage
+from inventory.tests.base import InventoryTestCase, make_skin
+
+
+class CoordinatedLoadTests(InventoryTestCase):
+    def test_lock_holder_does_not_wait_for_a_load_blocked_on_its_lock(self):
+        # The reader leads a load that has to write the expired lock back, so
+        # it waits for the storage lock; the holder then loads the same file.
+        self.store_skins_with_expired_lock([make_skin("100", selected=True), make_skin("200")])
+        storage = get_storage()
+        held = threading.Event()
+        results = {}
+
+        def holder():
+            with storage.lock():
+                held.set()
+                deadline = time.monotonic() + 5
+                while not steam_api._load_flights and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                results["holder"] = load_inventory_from_file()
+
+        def reader():
+            held.wait()
+            results["reader"] = load_inventory_from_file()
+
+        threads = [threading.Thread(target=holder, daemon=True), threading.Thread(target=reader, daemon=True)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertFalse(any(thread.is_alive() for thread in threads), "load deadlocked")
+        for skins, _ in results.values():
+            self.assertEqual([skin["asset_id"] for skin in skins], ["100", "200"])
+            self.assertTrue(skins[0]["tradable_info"]["is_tradable"])
@@ -0,0 +1,87 @@
+import json
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from inventory.benchmarks.synthetic import make_inventory_payloads
+from inventory.merge import describe_merge, merge_inventory, merge_is_noop
+from inventory.steam_api import _normalize_skin, update_inventory_from_manual, update_inventory_skins
+from inventory.storage import get_storage
+from inventory.tests.base import InventoryTestCase, make_skin
+
+
+class MergeInventoryTests(SimpleTestCase):
+    def test_stacked_copies_keep_their_own_price_and_note(self):
+        current = [
+            make_skin("100", selected=True, price_eur="1", note="first"),
+            make_skin("100", selected=False, price_eur="2", note="second"),
+        ]
+
+        merged, report = merge_inventory(current, [make_skin("100"), make_skin("100")])
+
+        self.assertEqual([(skin["selected"], skin["price_eur"], skin["note"]) for skin in merged],
+                         [(True, "1", "first"), (False, "2", "second")])
+        self.assertEqual((len(report["added"]), len(report["removed"]), len(report["retained"])), (0, 0, 2))
+
+    def test_legacy_skins_without_asset_id_match_on_name_and_exterior(self):
+        current = [
+            make_skin(None, name="AWP | Asiimov", exterior="Field-Tested", price_eur="80", selected=True),
+            make_skin(None, name="AWP | Asiimov", exterior="Battle-Scarred", price_eur="40"),
+        ]
+
+        merged, report = merge_inventory(current, [
+            make_skin("900", name="AWP | Asiimov", exterior="Battle-Scarred"),
+            make_skin("901", name="AWP | Asiimov", exterior="Field-Tested"),
+        ])
+
+        self.assertEqual([(skin["asset_id"], skin["price_eur"]) for skin in merged], [("900", "40"), ("901", "80")])
+        self.assertTrue(merged[1]["selected"])
+        self.assertEqual(len(report["retained"]), 2)
+
+    def test_report_counts(self):
+        current = [make_skin("100", price_eur="5"), make_skin("200"), make_skin("300")]
+
+        merged, report = merge_inventory(current, [make_skin("300"), make_skin("100"), make_skin("400")])
+
+        self.assertEqual([skin["asset_id"] for skin in report["added"]], ["400"])
+        self.assertEqual([skin["asset_id"] for skin in report["removed"]], ["200"])
+        self.assertEqual(merged[1]["price_eur"], "5")
+        self.assertEqual(describe_merge(report), "1 added, 1 removed, 2 kept")
+        self.assertFalse(merge_is_noop(current, merged, report))
+
+    def test_noop(self):
+        current = [make_skin("100", price_eur="5"), make_skin("200")]
+
+        merged, report = merge_inventory(current, [make_skin("100"), make_skin("200")])
+        self.assertTrue(merge_is_noop(current, merged, report))
+
+        merged, report = merge_inventory(current, [make_skin("100"), make_skin("200", exterior="Minimal Wear")])
+        self.assertFalse(merge_is_noop(current, merged, report))
+
+
+class ManualUpdateTests(InventoryTestCase):
+    def setUp(self):
+        super().setUp()
+        pages = make_inventory_payloads(40, now=1_700_000_000)
+        self.raw_json = "\n".join(json.dumps(page) for page in pages)
+
+    def test_carries_selection_over_and_skips_unchanged_payloads(self):
+        skins, _, _, report = update_inventory_from_manual(self.raw_json)
+        self.assertEqual(len(report["added"]), len(skins))
+
+        update_inventory_skins({skins[0]["asset_id"]: {"selected": True, "price_eur": "12"}})
+        signature = get_storage().signature()
+
+        with mock.patch("inventory.steam_api.save_inventory_to_file") as save:
+            skins, _, _, report = update_inventory_from_manual(self.raw_json)
+
+        save.assert_not_called()
+        self.assertEqual(get_storage().signature(), signature)
+        self.assertEqual((skins[0]["selected"], skins[0]["price_eur"]), (True, "12"))
+        self.assertEqual((report["added"], report["removed"]), ([], []))
+
+    def test_normalizes_each_skin_once(self):
+        with mock.patch("inventory.steam_api._normalize_skin", wraps=_normalize_skin) as normalize:
+            skins, _, _, _ = update_inventory_from_manual(self.raw_json)
+
+        self.assertEqual(normalize.call_count, len(skins))
@@ -0,0 +1,53 @@
+import os
+
+from django.test import override_settings
+
+from inventory.checks import check_storage_backend
+from inventory.tests.base import InventoryTestCase, make_skin
+from inventory.profiles import use_profile
+
+
+class ProfileAdminNavTests(InventoryTestCase):
+    def setUp(self):
+        super().setUp()
+        overrides = override_settings(INVENTORY_PROFILES={
+            "alice": {"steam_id": "76561198000000001", "data_file": os.path.join(self.tmp_dir, "alice.json")},
+        })
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.login_admin()
+
+    def test_profile_admin_page_has_logout_and_links_to_its_showroom(self):
+        with use_profile("alice"):
+            self.store_skins([make_skin("100")])
+
+        response = self.client.get("/manage/alice/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'href="/buy/alice/"')
+        self.assertContains(response, "Log out")
+
+    def test_default_admin_page_links_to_the_default_showroom(self):
+        self.store_skins([make_skin("100")])
+
+        response = self.client.get("/manage/")
+
+        self.assertContains(response, 'href="/buy/" class="nav-link"')
+        self.assertContains(response, "Log out")
+
+    def test_public_page_has_no_admin_nav(self):
+        self.store_skins([make_skin("100", selected=True)])
+
+        self.assertNotContains(self.client.get("/buy/"), "Log out")
+
+    def test_unknown_profile_is_404(self):
+        self.assertEqual(self.client.get("/manage/nobody/").status_code, 404)
+
+    def test_storage_backend_without_profiles_fails_the_system_check(self):
+        self.assertEqual(check_storage_backend(None), [])
+
+        with override_settings(INVENTORY_STORAGE_BACKEND="inventory.storage.DatabaseStorage"):
+            errors = check_storage_backend(None)
+
+        self.assertEqual([error.id for error in errors], ["inventory.E002"])
+        self.assertIn("alice", errors[0].msg)
@@ -0,0 +1,101 @@
+import json
+import os
+from unittest import mock
+
+from inventory.steam_api import SCHEMA_VERSION, load_inventory_from_file
+from inventory.storage import JsonFileStorage, get_storage
+from inventory.tests.base import InventoryTestCase
+
+CDN = "https://cdn.steamstatic.com/apps/730/icons/econ"
+
+# A data file as written before schema versions existed
+BASELINE_DOCUMENT = {
+    "skins": [
+        {
+            "name": "AK-47 | Midnight Laminate",
+            "icon_url": "icon-ak",
+            "exterior": "Factory New",
+            "tradable": "Trade Protected until Jan 1, 2099 (9:00:00)",
+            "selected": True,
+            "weapon_type": "AK-47",
+            "item_type": "Rifle",
+            "stickers": [{"icon_url": f"{CDN}/stickers/cph2024/spir.png", "name": "Team Spirit | Copenhagen 2024"}],
+            "asset_id": "100",
+            "float": 0.0489,
+            "price_eur": "52.00",
+            "note": "  mint  ",
+        },
+        {
+            "name": "Sir Bloody Darryl Royale | The Professionals",
+            "icon_url": "icon-agent",
+            "exterior": None,
+            "tradable": "Yes",
+            "selected": False,
+            "weapon_type": "Other",
+            "item_type": "Agent",
+            "stickers": [
+                {"icon_url": f"{CDN}/patches/case01/phoenix.png", "name": "Patch: Phoenix"},
+                {"icon_url": f"{CDN}/stickers/cologne2014/ibp.png", "name": "iBUYPOWER | Cologne 2014"},
+            ],
+            "patches": [{"icon_url": f"{CDN}/patches/case01/crown.png", "name": "Patch: Crown"}],
+            "asset_id": "200",
+            "price_eur": None,
+        },
+    ],
+    "total": 2,
+    "total_before_filters": 3,
+}
+
+
+class SchemaUpgradeTests(InventoryTestCase):
+    def setUp(self):
+        super().setUp()
+        os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
+        with open(self.data_file, "w", encoding="utf-8") as fp:
+            json.dump(BASELINE_DOCUMENT, fp, indent=2)
+
+    def test_baseline_file_is_upgraded_once(self):
+        skins, total_before_filters = load_inventory_from_file()
+
+        self.assertEqual(total_before_filters, 3)
+        stored = JsonFileStorage(self.data_file).read()
+        self.assertEqual(stored["schema_version"], SCHEMA_VERSION)
+        rifle, agent = stored["skins"]
+
+        self.assertNotIn("tradable", rifle)
+        self.assertEqual(rifle["tradable_info"]["raw"], "Trade Protected until Jan 1, 2099 (9:00:00)")
+        self.assertFalse(rifle["tradable_info"]["is_tradable"])
+        self.assertIsNotNone(rifle["tradable_info"]["unlock_epoch"])
+        self.assertEqual(stored["next_unlock_at"], rifle["tradable_info"]["unlock_epoch"])
+        self.assertEqual(rifle["wear_rating"], 0.0489)
+        self.assertEqual(rifle["price_eur"], "52")
+        self.assertEqual(rifle["note"], "mint")
+        self.assertEqual(rifle["patches"], [])
+        self.assertEqual([sticker["name"] for sticker in rifle["stickers"]], ["Team Spirit | Copenhagen 2024"])
+
+        self.assertTrue(agent["tradable_info"]["is_tradable"])
+        self.assertEqual([sticker["name"] for sticker in agent["stickers"]], ["iBUYPOWER | Cologne 2014"])
+        self.assertEqual([patch["name"] for patch in agent["patches"]], ["Crown", "Phoenix"])
+        self.assertIn("facets", stored)
+        self.assertEqual([skin["asset_id"] for skin in skins], ["100", "200"])
+
+    def test_current_file_is_not_written_again(self):
+        load_inventory_from_file()
+        signature = get_storage().signature()
+
+        with mock.patch.object(JsonFileStorage, "write") as write:
+            skins, _ = load_inventory_from_file()
+
+        write.assert_not_called()
+        self.assertEqual(get_storage().signature(), signature)
+        self.assertEqual(len(skins), 2)
+
+    def test_without_auto_resave_the_file_is_left_alone(self):
+        with open(self.data_file, "rb") as fp:
+            before = fp.read()
+
+        skins, _ = load_inventory_from_file(auto_resave=False)
+
+        self.assertNotIn("tradable", skins[0])
+        with open(self.data_file, "rb") as fp:
+            self.assertEqual(fp.read(), before)
@@ -0,0 +1,39 @@
+from inventory.helpers import build_tradable_info
+from inventory.steam_api import get_inventory_snapshot
+from inventory.storage import get_storage
+from inventory.tests.base import InventoryTestCase, make_skin
+
+
+class BuyPageTests(InventoryTestCase):
+    def _store_lock_that_ran_out(self):
+        self.store_skins_with_expired_lock([
+            make_skin("100", selected=True, tradable_info=build_tradable_info("Trade Protected until Jan 1, 2099 (9:00:00)")),
+            make_skin("200", selected=True),
+        ])
+
+    def test_snapshot_is_keyed_on_the_version_left_by_the_expired_lock_write_back(self):
+        self._store_lock_that_ran_out()
+
+        snapshot = get_inventory_snapshot()
+
+        self.assertEqual(snapshot["signature"], get_storage().signature())
+        self.assertIs(get_inventory_snapshot(), snapshot)
+        self.assertTrue(all(skin["tradable_info"]["is_tradable"] for skin in snapshot["selected_skins"]))
+
+    def test_expired_lock_write_back_does_not_change_the_etag_of_the_next_request(self):
+        self._store_lock_that_ran_out()
+
+        first = self.client.get("/buy/")
+        second = self.client.get("/buy/")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn(b'data-lock-state="locked"', first.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual(first.content, second.content)
+
+    def test_unchanged_page_is_answered_with_304(self):
+        self.store_skins([make_skin("100", selected=True)])
+
+        etag = self.client.get("/buy/")["ETag"]
+
+        self.assertEqual(self.client.get("/buy/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
@@ -0,0 +1,21 @@
+from django.test import SimpleTestCase
+
+from inventory.staticfiles import minify_css
+
+
+class MinifyCssTests(SimpleTestCase):
+    def test_strips_comments_and_whitespace(self):
+        css = "/* header */\n.card  >  .price {\n  color: #fff ;\n  margin: 0 /* none */ ;\n}\n"
+
+        self.assertEqual(minify_css(css), ".card>.price{color:#fff;margin:0}\n")
+
+    def test_keeps_string_literals_verbatim(self):
+        css = 'a::after { content: "x > y ; z" ; }\nb::before{content:\'/* not a comment */ ;}\'}'
+
+        self.assertEqual(
+            minify_css(css),
+            'a::after{content:"x > y ; z"}b::before{content:\'/* not a comment */ ;}\'}\n',
+        )
+
+    def test_keeps_calc_spacing(self):
+        self.assertEqual(minify_css(".a { width: calc(100% - 2rem); }"), ".a{width:calc(100% - 2rem)}\n")
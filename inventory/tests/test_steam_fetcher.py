@@ -0,0 +1,90 @@
+import os
+
+from django.conf import settings
+from django.test import override_settings
+
+from inventory.benchmarks.synthetic import make_inventory_payloads
+from inventory.fake_steam import FakeSteamServer
+from inventory.steam_api import load_inventory_from_file
+from inventory.steam_fetcher import SteamFetchError, fetch_inventory_payloads, refresh_inventory_from_steam
+from inventory.tests.base import InventoryTestCase
+
+
+class SteamFetcherTests(InventoryTestCase):
+    """The fetcher against the local stand-in for Steam's inventory endpoint."""
+
+    def setUp(self):
+        super().setUp()
+        self.main = make_inventory_payloads(25, page_size=25)[0]
+        self.protected = make_inventory_payloads(5, seed=1, page_size=5)[0]
+        for entry in self.protected["assets"] + self.protected["asset_properties"]:
+            entry["assetid"] = "9" + entry["assetid"]
+
+        self.steam = FakeSteamServer({
+            (settings.STEAM_ID, "2"): self.main,
+            (settings.STEAM_ID, "16"): self.protected,
+        }).start()
+        self.addCleanup(self.steam.stop)
+        overrides = override_settings(
+            STEAM_INVENTORY_BASE_URL=self.steam.base_url,
+            STEAM_FETCH_PAGE_SIZE=10,
+            STEAM_FETCH_BACKOFF=0,
+            STEAM_FETCH_RETRIES=3,
+            # One context at a time keeps the request log in order
+            STEAM_FETCH_CONCURRENCY=1,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def _asset_ids(self, payloads):
+        return [asset["assetid"] for payload in payloads for asset in payload["assets"]]
+
+    def test_pages_are_followed_through_last_assetid(self):
+        payloads = fetch_inventory_payloads()
+
+        # Protected context first (1 page), then the main one in pages of 10
+        self.assertEqual([len(payload["assets"]) for payload in payloads], [5, 10, 10, 5])
+        self.assertEqual(
+            self._asset_ids(payloads),
+            [asset["assetid"] for asset in self.protected["assets"] + self.main["assets"]],
+        )
+        main_requests = [path for path in self.steam.requests if "/730/2?" in path]
+        self.assertNotIn("start_assetid", main_requests[0])
+        self.assertIn(f"start_assetid={self.main['assets'][9]['assetid']}", main_requests[1])
+        self.assertIn(f"start_assetid={self.main['assets'][19]['assetid']}", main_requests[2])
+
+    def test_rate_limits_and_server_errors_are_retried(self):
+        self.steam.failures[:] = [429, 503]
+
+        payloads = fetch_inventory_payloads()
+
+        self.assertEqual(len(self._asset_ids(payloads)), 30)
+        self.assertEqual(len(self.steam.requests), 4 + 2)
+
+    def test_too_many_failures_raise(self):
+        self.steam.failures[:] = [503] * 10
+
+        with self.assertRaises(SteamFetchError):
+            fetch_inventory_payloads()
+
+    def test_unchanged_pages_are_revalidated_and_served_from_the_disk_cache(self):
+        first = fetch_inventory_payloads()
+        self.assertTrue(os.listdir(settings.STEAM_FETCH_CACHE_DIR))
+
+        self.steam.statuses.clear()
+
+        second = fetch_inventory_payloads()
+
+        self.assertEqual(self.steam.statuses, [304] * 4)
+        self.assertEqual(second, first)
+
+    def test_private_inventory_raises(self):
+        with self.assertRaisesRegex(SteamFetchError, "private"):
+            fetch_inventory_payloads("76561198000000999")
+
+    def test_refresh_stores_the_fetched_inventory(self):
+        skins, _, _, report = refresh_inventory_from_steam()
+
+        stored, _ = load_inventory_from_file()
+        self.assertEqual(len(stored), len(skins))
+        self.assertEqual(len(report["added"]), len(skins))
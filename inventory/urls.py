@@ -1,12 +1,26 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
 app_name = 'inventory'
 
+# Under ASGI the public read path is served by the async views
+if getattr(settings, 'INVENTORY_ASYNC_VIEWS', False):
+    landing, index, api_skins = views.landing_async, views.index_async, views.api_skins_async
+else:
+    landing, index, api_skins = views.landing, views.index, views.api_skins
+
 urlpatterns = [
-    path('', views.landing, name='landing'),
-    path('buy/', views.index, name='index'),
+    path('', landing, name='landing'),
+    path('buy/', index, name='index'),
     path('sell/', views.sell, name='sell'),
     path('manage/', views.admin_view, name='admin'),
+    path('api/skins/', api_skins, name='api_skins'),
+    path('icons/<str:variant>/', views.icon_proxy, name='icon_proxy'),
+    path('manage/jobs/<int:job_id>/', views.refresh_job_status, name='refresh_job_status'),
+    # Showrooms of the other traders in INVENTORY_PROFILES
+    path('buy/<slug:profile>/', index, name='profile_index'),
+    path('manage/<slug:profile>/', views.admin_view, name='profile_admin'),
+    path('api/skins/<slug:profile>/', api_skins, name='profile_api_skins'),
 ]
\ No newline at end of file
@@ -1,24 +1,61 @@
+from collections import Counter
 from decimal import Decimal, InvalidOperation
 
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, HttpResponseRedirect, JsonResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
 from .steam_api import (
     load_inventory_from_file,
     save_inventory_to_file,
-    update_inventory_from_manual,
+    update_inventory_skins,
+    get_inventory_snapshot,
+    aget_inventory_snapshot,
+    query_inventory,
     _normalize_price,
     _sanitize_note,
 )
-from .helpers import WEAPON_TYPES, ITEM_TYPES, get_filter_counts
+from .helpers import WEAPON_TYPES, ITEM_TYPES, facet_counts
+from .storage import get_storage
+from .fragment_cache import render_skin_fragment
+from .jobs import enqueue_refresh, job_status
+from .profiles import active_profile, profile_view
+from .steam_fetcher import inventory_url
+from .models import RefreshJob
+from .icon_cache import ICON_VARIANTS, IconFetchError, get_icon, is_allowed_source, negotiate_format
 
 startup_error = None
 
+# Skins rendered into /buy/ and returned per API page unless ?limit= is given
+SKINS_PAGE_SIZE = 48
+SKINS_PAGE_SIZE_MAX = 200
+
+# Seconds a rendered /buy/ page is kept per inventory version
+BUY_PAGE_CACHE_TIMEOUT = int(getattr(settings, 'BUY_PAGE_CACHE_TIMEOUT', 300))
+
+# Public API fields of a skin, see _serialize_skin
+_API_SKIN_FIELDS = (
+    "asset_id", "name", "icon_url", "exterior", "weapon_type", "item_type",
+    "rarity", "rarity_color", "collection", "float", "pattern_template",
+    "price_eur", "inspect_link", "stickers", "patches", "is_reserved",
+)
+
 
 def landing(request):
     return render(request, 'inventory/landing.html')
 
 
+async def landing_async(request):
+    # Static page; nothing to offload
+    return render(request, 'inventory/landing.html')
+
+
 def sell(request):
     return render(request, 'inventory/sell.html')
 
@@ -46,31 +83,88 @@ def _split_admin_skins(skins):
     return regular, reserved
 
 
+def _parse_price_input(raw_value, previous_price):
+    """Normalize a submitted euro price, keeping the previous one if it is invalid."""
+    if raw_value is None:
+        return previous_price
+    raw_value = raw_value.strip()
+    if not raw_value:
+        return None
+
+    normalized = raw_value.replace(',', '.').replace('€', '').strip()
+    try:
+        price_decimal = Decimal(normalized)
+        if price_decimal < 0:
+            raise InvalidOperation
+        sanitized_price = _normalize_price(normalized)
+        if sanitized_price is None:
+            raise InvalidOperation
+        return sanitized_price
+    except (InvalidOperation, ValueError):
+        # Keep previous price if parsing fails
+        return previous_price
+
+
 def _augment_admin_context(context):
-    skins = context.get('skins', []) or []
-    regular, reserved = _split_admin_skins(list(skins))
+    # The template renders the two groups; no need to copy the skins again
+    regular, reserved = _split_admin_skins(context.get('skins', []) or [])
     context['skins_regular'] = regular
     context['skins_reserved'] = reserved
     context['has_reserved_skins'] = bool(reserved)
-    context['skins'] = regular + reserved
     return context
 
 # Helper to build Steam inventory URLs for manual import
 def _steam_inventory_urls():
-    steam_id = settings.STEAM_ID
-    app_id = settings.STEAM_APP_ID
-    base = "https://steamcommunity.com/inventory"
+    steam_id = active_profile().steam_id
     return {
-        'main': f"{base}/{steam_id}/{app_id}/2?l=english&count=2500",
-        'protected': f"{base}/{steam_id}/{app_id}/16?l=english&count=2500",
+        'main': f"{inventory_url(steam_id, '2')}?l=english&count=2500",
+        'protected': f"{inventory_url(steam_id, '16')}?l=english&count=2500",
     }
 
 # {"appid":730,"classid":"2076633109","instanceid":"7517088041","currency":0,"background_color":"","icon_url":"i0CoZ81Ui0m-9KwlBY1L_18myuGuq1wfhWSaZgMttyVfPaERSR0Wqmu7LAocGIGz3UqlXOLrxM-vMGmW8VNxu5Dx60noTyLijZGwpR1Y-s29e6M9eM-XHGaXzuBwufNscDqwmg0ijDGMnYftbyrFPVAoWcQjELQOuxO4k4e1N-nnsQfW2I5Mz3ivi3wb7Stj5ukAUKY7uvqAqS55_Pw","descriptions":[{"type":"html","value":"Exterior: Factory New","name":"exterior_wear"},{"type":"html","value":" ","name":"blank"},{"value":"Name Tag: ''远赴人间惊鸿宴 一睹人间盛世颜''","color":"b0c3d9","name":"nametag"},{"type":"html","value":" ","name":"blank"},{"type":"html","value":"The SSG08 bolt-action is a low-damage but very cost-effective sniper rifle, making it a smart choice for early-round long-range marksmanship. It has been given a hydrographic of a monstrous dragon snorting fire.\n\n<i>Sit on your horde and wait for any who come to take it</i>","name":"description"},{"type":"html","value":" ","name":"blank"},{"type":"html","value":"The Glove Collection","color":"9da1a9","name":"itemset_name"},{"type":"html","value":" ","name":"blank"},{"type":"html","value":"<br><div id=\"sticker_info\" class=\"sticker_info\" style=\"border: 2px solid rgb(102, 102, 102); border-radius: 6px; width=100; margin:4px; padding:8px;\"><center><img width=64 height=48 src=\"https://cdn.steamstatic.com/apps/730/icons/econ/stickers/illuminate_capsule_01/chinese_dragon.304b654d32117c442284e3a969bbf63074ee28d9.png\" title=\"Sticker: Guardian Dragon\"><br>Sticker: Guardian Dragon</center></div>","name":"sticker_info"}],"tradable":1,"actions":[{"link":"steam://rungame/730/76561202255233023/+csgo_econ_action_preview%20S%owner_steamid%A%assetid%D5208664502278462180","name":"Inspect in Game..."}],"name":"SSG 08 | Dragonfire","name_color":"D2D2D2","type":"Covert Sniper Rifle","market_name":"SSG 08 | Dragonfire (Factory New)","market_hash_name":"SSG 08 | Dragonfire (Factory New)","market_actions":[{"link":"steam://rungame/730/76561202255233023/+csgo_econ_action_preview%20M%listingid%A%assetid%D5208664502278462180","name":"Inspect in Game..."}],"commodity":0,"market_tradable_restriction":7,"market_marketable_restriction":7,"marketable":1,"tags":[{"category":"Type","internal_name":"CSGO_Type_SniperRifle","localized_category_name":"Type","localized_tag_name":"Sniper Rifle"},{"category":"Weapon","internal_name":"weapon_ssg08","localized_category_name":"Weapon","localized_tag_name":"SSG 08"},{"category":"ItemSet","internal_name":"set_community_15","localized_category_name":"Collection","localized_tag_name":"The Glove Collection"},{"category":"Quality","internal_name":"normal","localized_category_name":"Category","localized_tag_name":"Normal"},{"category":"Rarity","internal_name":"Rarity_Ancient_Weapon","localized_category_name":"Quality","localized_tag_name":"Covert","color":"eb4b4b"},{"category":"Exterior","internal_name":"WearCategory0","localized_category_name":"Exterior","localized_tag_name":"Factory New"}],"sealed":0},
 # TODO pridat Inspect in Game link to the item details – po kliku a potvrdeni vyskakovacieho okna otvorí náhľad skinu v hre pomocou Steam linku
 
 
-def index(request):
-    """Public view showing selected inventory items."""
+def _profile_reverse(name):
+    """URL of inventory view ``name`` for the active profile."""
+    profile = active_profile()
+    if profile.is_default:
+        return reverse(f'inventory:{name}')
+    return reverse(f'inventory:profile_{name}', kwargs={'profile': profile.slug})
+
+
+def _buy_page_etag(request):
+    if startup_error:
+        return None
+    return get_inventory_snapshot()['version']
+
+
+def _buy_page_last_modified(request):
+    if startup_error:
+        return None
+    return get_inventory_snapshot()['last_modified']
+
+
+def _conditional_response(request, etag, last_modified, respond):
+    """What ``cache_control(no_cache=True)`` plus ``condition`` do, for async views.
+
+    Django only wraps coroutine views in those decorators from 5.0 on.
+    """
+    etag = quote_etag(etag) if etag else None
+    last_modified = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = respond()
+    if request.method in ('GET', 'HEAD'):
+        if last_modified and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(last_modified)
+        if etag and not response.has_header('ETag'):
+            response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def _render_buy_page(request, snapshot):
     if startup_error:
         context = {
             'error': startup_error,
@@ -78,33 +172,157 @@ def index(request):
             'skins': [],
             'total': 0
         }
-    else:
-        # Load the most recent inventory data
-        skins, _ = load_inventory_from_file(auto_resave=False)
-        
-        # Filter to only selected skins
-        selected_skins = [skin for skin in skins if skin.get("selected", False)]
-
-        for skin in selected_skins:
-            note_value = skin.get('note')
-            if isinstance(note_value, str):
-                is_reserved = bool(note_value.strip())
-            else:
-                is_reserved = False
-            skin['is_reserved'] = is_reserved
-        
-        # Get filters with counts
-        filters = get_filter_counts(selected_skins)
-        
-        context = {
-            'skins': selected_skins,
-            'total': len(selected_skins),
-            'error': None,
-            'filters': filters
-        }
-    
-    return render(request, 'inventory/buy.html', context)
+        return render(request, 'inventory/buy.html', context)
+
+    page_cache_key = (
+        f"buy-page:{active_profile().slug}:{snapshot['version']}" if snapshot['version'] else None
+    )
+    if page_cache_key:
+        cached_page = cache.get(page_cache_key)
+        if cached_page is not None:
+            return HttpResponse(cached_page)
+
+    skins = query_inventory(snapshot)
+    first_page = skins[:SKINS_PAGE_SIZE]
+
+    # Only the first page is rendered, the rest is fetched from api_skins
+    context = {
+        'skins': first_page,
+        'total': len(skins),
+        'next_cursor': str(len(first_page)) if len(skins) > len(first_page) else '',
+        'skins_api_url': _profile_reverse('api_skins'),
+        'error': None,
+        'filters': snapshot['filters']
+    }
+    response = render(request, 'inventory/buy.html', context)
+    if page_cache_key:
+        cache.set(page_cache_key, response.content, BUY_PAGE_CACHE_TIMEOUT)
+    return response
+
+
+@profile_view
+@cache_control(no_cache=True)
+@condition(etag_func=_buy_page_etag, last_modified_func=_buy_page_last_modified)
+def index(request):
+    """Public view showing selected inventory items.
+
+    The page only depends on the stored inventory, so it is answered with
+    304 when the client's ETag/Last-Modified still match and otherwise
+    served from a page cache keyed on the inventory version.
+    """
+    # Reuse the cached snapshot; it is rebuilt only when the data file changes
+    return _render_buy_page(request, None if startup_error else get_inventory_snapshot())
+
+
+@profile_view
+async def index_async(request):
+    """``index`` for ASGI deployments, see INVENTORY_ASYNC_VIEWS."""
+    if startup_error:
+        return _conditional_response(request, None, None, lambda: _render_buy_page(request, None))
+    snapshot = await aget_inventory_snapshot()
+    return _conditional_response(
+        request, snapshot['version'], snapshot['last_modified'], lambda: _render_buy_page(request, snapshot)
+    )
+
+def _serialize_skin(skin):
+    data = {field: skin.get(field) for field in _API_SKIN_FIELDS}
+    tradable_info = skin.get('tradable_info', {}) or {}
+    data['tradable'] = tradable_info.get('raw') or skin.get('tradable', 'Yes')
+    data['unlock_iso'] = tradable_info.get('unlock_iso')
+    return data
+
+
+def _parse_page_param(raw_value, default, maximum=None, minimum=0):
+    """Parse an integer query parameter of at least ``minimum``, raising ValueError if invalid."""
+    if raw_value in (None, ''):
+        return default
+    value = int(raw_value)
+    if value < minimum:
+        raise ValueError(raw_value)
+    return min(value, maximum) if maximum is not None else value
+
 
+def _skins_api_response(request, snapshot):
+    if startup_error:
+        return JsonResponse({'error': startup_error}, status=503)
+
+    try:
+        offset = _parse_page_param(request.GET.get('cursor'), 0)
+        # A zero limit would hand back the same cursor forever
+        limit = _parse_page_param(request.GET.get('limit'), SKINS_PAGE_SIZE, SKINS_PAGE_SIZE_MAX, minimum=1)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor or limit.'}, status=400)
+
+    selections = {
+        'weapon_types': request.GET.getlist('weapon_type'),
+        'item_types': request.GET.getlist('item_type'),
+        'tradable': request.GET.getlist('tradable'),
+    }
+    skins = query_inventory(
+        snapshot,
+        selections,
+        search=request.GET.get('q', '').strip(),
+        sort=request.GET.get('sort'),
+    )
+    page = skins[offset:offset + limit]
+    end = offset + len(page)
+
+    data = {
+        'results': [_serialize_skin(skin) for skin in page],
+        'total': len(skins),
+        'next_cursor': str(end) if end < len(skins) else None,
+    }
+    if request.GET.get('format') == 'html':
+        data['html'] = ''.join(
+            render_skin_fragment('inventory/_skin_card.html', skin) for skin in page
+        )
+    return JsonResponse(data)
+
+
+@profile_view
+@require_GET
+def api_skins(request):
+    """Filtered, sorted and paginated selected skins for the showroom.
+
+    Query parameters: ``weapon_type``, ``item_type`` and ``tradable`` (may
+    repeat), ``q`` (search), ``sort`` (see helpers.SORT_MODES), ``cursor``
+    and ``limit``. With ``format=html`` the rendered cards are included.
+    """
+    return _skins_api_response(request, None if startup_error else get_inventory_snapshot())
+
+
+@profile_view
+async def api_skins_async(request):
+    """``api_skins`` for ASGI deployments, see INVENTORY_ASYNC_VIEWS."""
+    # require_GET only wraps coroutine views from Django 5.0 on
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    snapshot = None if startup_error else await aget_inventory_snapshot()
+    return _skins_api_response(request, snapshot)
+
+
+@require_GET
+def icon_proxy(request, variant):
+    """Serve a CDN image from the local icon cache, resized for ``variant`` when possible."""
+    src = request.GET.get('src', '')
+    if variant not in ICON_VARIANTS or not is_allowed_source(src):
+        raise Http404("Unknown icon")
+
+    fmt = negotiate_format(request.headers.get('Accept', ''))
+    try:
+        data, content_type = get_icon(src, variant, fmt)
+    except IconFetchError as exc:
+        # Let the browser try the CDN itself rather than showing a broken image
+        print(f"Icon proxy falling back to CDN: {exc}")
+        return HttpResponseRedirect(src)
+
+    response = HttpResponse(data, content_type=content_type)
+    response['Cache-Control'] = 'public, max-age=2592000'
+    response['Vary'] = 'Accept'
+    return response
+
+
+@profile_view
 @login_required
 def admin_view(request):
     """Admin view for managing inventory selection."""
@@ -130,18 +348,21 @@ def admin_view(request):
             manual_json_main = request.POST.get('inventory_json_main', '').strip()
             manual_json_protected = request.POST.get('inventory_json_protected', '').strip()
 
+            # Uploaded files take precedence and are streamed instead of read whole
             payload_segments = []
-            if manual_json_protected:
-                payload_segments.append(manual_json_protected)
-            if manual_json_main:
-                payload_segments.append(manual_json_main)
+            protected_file = request.FILES.get('inventory_file_protected')
+            main_file = request.FILES.get('inventory_file_main')
+            if protected_file or manual_json_protected:
+                payload_segments.append(protected_file or manual_json_protected)
+            if main_file or manual_json_main:
+                payload_segments.append(main_file or manual_json_main)
 
             if not payload_segments:
-                skins, total_before_filters = load_inventory_from_file(auto_resave=False)
+                skins, total_before_filters, facets = load_inventory_from_file(with_facets=True)
                 total = len(skins)
                 context = {
                     'error': None,
-                    'filters': get_filter_counts(skins),
+                    'filters': facet_counts(facets),
                     'skins': skins,
                     'total': total,
                     'total_before_filters': total_before_filters,
@@ -153,29 +374,14 @@ def admin_view(request):
                 return render(request, 'inventory/admin.html', _augment_admin_context(context))
 
             try:
-                combined_payload = "\n".join(payload_segments)
-                update_inventory_from_manual(combined_payload)
-            except ValueError as exc:
-                skins, total_before_filters = load_inventory_from_file(auto_resave=False)
+                # The import itself runs on the refresh worker (see jobs.py)
+                job = enqueue_refresh(payload_segments)
+            except OSError as exc:
+                skins, total_before_filters, facets = load_inventory_from_file(with_facets=True)
                 total = len(skins)
                 context = {
-                    'error': str(exc),
-                    'filters': get_filter_counts(skins),
-                    'skins': skins,
-                    'total': total,
-                    'total_before_filters': total_before_filters,
-                    'steam_inventory_urls': _steam_inventory_urls(),
-                    'pasted_json_main': manual_json_main,
-                    'pasted_json_protected': manual_json_protected,
-                    'show_manual_import': True
-                }
-                return render(request, 'inventory/admin.html', _augment_admin_context(context))
-            except Exception as exc:
-                skins, total_before_filters = load_inventory_from_file(auto_resave=False)
-                total = len(skins)
-                context = {
-                    'error': f'Unexpected error processing inventory: {exc}',
-                    'filters': get_filter_counts(skins),
+                    'error': f'Could not queue inventory refresh: {exc}',
+                    'filters': facet_counts(facets),
                     'skins': skins,
                     'total': total,
                     'total_before_filters': total_before_filters,
@@ -186,69 +392,57 @@ def admin_view(request):
                 }
                 return render(request, 'inventory/admin.html', _augment_admin_context(context))
 
-            # Redirect after successful refresh
-            return redirect('inventory:admin')
+            # Redirect to the admin page, which follows the job until it finishes
+            return redirect(f"{_profile_reverse('admin')}?job={job.pk}")
         
         elif action == 'save_selection':
-            # Load current inventory data for saving selection
-            skins, total_before_filters = load_inventory_from_file()
-            
-            # Get selected indices from form
-            selected_indices = request.POST.getlist('selected_skins')
-            
-            # If clear_all flag is set or no selections were made
-            clear_all = request.POST.get('clear_all') == 'true' or not selected_indices
-            
-            if clear_all:
-                # Set all skins to not selected
-                for skin in skins:
-                    skin['selected'] = False
-            else:
-                # Convert to integers
-                selected_indices = [int(idx) for idx in selected_indices]
-                
-                # Update selection status for all skins
+            with get_storage().lock():
+                # Load current inventory data for saving selection
+                skins, total_before_filters = load_inventory_from_file()
+
+                # Get selected indices from form
+                selected_indices = request.POST.getlist('selected_skins')
+
+                # If clear_all flag is set or no selections were made
+                clear_all = request.POST.get('clear_all') == 'true' or not selected_indices
+                selected_indices = set() if clear_all else {int(idx) for idx in selected_indices}
+
+                # Collect only the skins whose selection, note or price changed
+                changes = {}
                 for i, skin in enumerate(skins):
-                    skin['selected'] = (i in selected_indices)
-
-            # Update price information for each skin
-            for i, skin in enumerate(skins):
-                note_key = f'note_{i}'
-                note_value = request.POST.get(note_key)
-                if note_value is not None:
-                    skin['note'] = _sanitize_note(note_value)
-
-                price_key = f'price_{i}'
-                raw_value = request.POST.get(price_key, '')
-                previous_price = skin.get('price_eur')
-                if raw_value is None:
-                    continue
-                raw_value = raw_value.strip()
-                if not raw_value:
-                    skin['price_eur'] = None
-                    continue
-
-                normalized = raw_value.replace(',', '.').replace('€', '').strip()
-                try:
-                    price_decimal = Decimal(normalized)
-                    if price_decimal < 0:
-                        raise InvalidOperation
-                    sanitized_price = _normalize_price(normalized)
-                    if sanitized_price is None:
-                        raise InvalidOperation
-                    skin['price_eur'] = sanitized_price
-                except (InvalidOperation, ValueError):
-                    # Keep previous price if parsing fails
-                    skin['price_eur'] = previous_price
-    
-            # Save updated inventory back to file
-            save_inventory_to_file(skins, len(skins), total_before_filters)
+                    updates = {}
+
+                    selected = i in selected_indices
+                    if bool(skin.get('selected', False)) != selected:
+                        updates['selected'] = selected
+
+                    note_value = request.POST.get(f'note_{i}')
+                    if note_value is not None:
+                        note_value = _sanitize_note(note_value)
+                        if note_value != skin.get('note'):
+                            updates['note'] = note_value
+
+                    price_value = _parse_price_input(request.POST.get(f'price_{i}', ''), skin.get('price_eur'))
+                    if price_value != skin.get('price_eur'):
+                        updates['price_eur'] = price_value
+
+                    if updates:
+                        skin.update(updates)
+                        changes[i] = updates
+
+                asset_id_counts = Counter(skin.get('asset_id') for skin in skins)
+                if any(not skins[i].get('asset_id') or asset_id_counts[skins[i]['asset_id']] > 1 for i in changes):
+                    # Legacy skins without an asset id, and copies of a stacked
+                    # asset (which share its id), can only be saved as a whole
+                    save_inventory_to_file(skins, len(skins), total_before_filters)
+                else:
+                    update_inventory_skins({skins[i]['asset_id']: updates for i, updates in changes.items()})
             
             # Redirect after saving
-            return redirect('inventory:admin')
+            return redirect(_profile_reverse('admin'))
     
     # Load current inventory data for GET request (no automatic refresh)
-    skins, total_before_filters = load_inventory_from_file(auto_resave=False)
+    skins, total_before_filters, facets = load_inventory_from_file(with_facets=True)
     total = len(skins)
     
     # Display the admin interface (GET request)
@@ -257,10 +451,36 @@ def admin_view(request):
         'total': total,
         'total_before_filters': total_before_filters,
         'error': None,
-    'filters': get_filter_counts(skins),
+    'filters': facet_counts(facets),
         'steam_inventory_urls': _steam_inventory_urls(),
         'pasted_json_main': '',
         'pasted_json_protected': '',
-        'show_manual_import': False
+        'show_manual_import': False,
+        'refresh_job': _requested_refresh_job(request),
     }
     return render(request, 'inventory/admin.html', _augment_admin_context(context))
+
+
+def _requested_refresh_job(request):
+    """Status of the refresh job named by ``?job=``, or None."""
+    job_id = request.GET.get('job', '')
+    if not job_id.isdigit():
+        return None
+    job = RefreshJob.objects.filter(pk=int(job_id)).first()
+    if job is None:
+        return None
+    status = job_status(job)
+    status['status_url'] = reverse('inventory:refresh_job_status', args=[job.pk])
+    return status
+
+
+@login_required
+@require_GET
+def refresh_job_status(request, job_id):
+    """JSON status of a background inventory refresh, polled by the admin page."""
+    job = RefreshJob.objects.filter(pk=job_id).first()
+    if job is None:
+        raise Http404("Unknown refresh job")
+    response = JsonResponse(job_status(job))
+    response['Cache-Control'] = 'no-store'
+    return response
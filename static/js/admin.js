@@ -0,0 +1,399 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // DOM Elements
+    const filterToggle = document.getElementById('filter-panel-toggle');
+    const filterPanel = document.getElementById('filter-panel');
+    const searchBox = document.getElementById('search-box');
+    const inventoryContainer = document.getElementById('inventory');
+    const items = Array.from(inventoryContainer.querySelectorAll('.skin-item'));
+    const sortSelect = document.getElementById('sort-select');
+    const showingCount = document.getElementById('showing-count');
+    const filterCheckboxes = document.querySelectorAll('.filter-checkbox');
+    const selectAllBtn = document.getElementById('select-all-btn');
+    const clearSelectionBtn = document.getElementById('clear-selection-btn');
+    const adminForm = document.getElementById('admin-form');
+    const refreshBtn = document.querySelector('.refresh-btn');
+    const manualImportSection = document.querySelector('.manual-import');
+    const inventoryJsonProtected = document.getElementById('inventory-json-protected');
+    const inventoryJsonMain = document.getElementById('inventory-json-main');
+    const inventoryFileProtected = document.getElementById('inventory-file-protected');
+    const inventoryFileMain = document.getElementById('inventory-file-main');
+    const refreshHint = document.getElementById('manual-refresh-hint');
+    const reservedHeading = inventoryContainer.querySelector('.inventory-section-heading');
+    const reservedItems = items.filter(item => item.dataset.reserved === 'true');
+    const regularItems = items.filter(item => item.dataset.reserved !== 'true');
+    const defaultRegularOrder = regularItems.slice();
+    const defaultReservedOrder = reservedItems.slice();
+    const allItems = defaultRegularOrder.concat(defaultReservedOrder);
+
+    const makeNumericSorter = (datasetKey, ascending) => (a, b) => {
+        const valueA = parseFloat(a.dataset[datasetKey]);
+        const valueB = parseFloat(b.dataset[datasetKey]);
+        const aValid = Number.isFinite(valueA);
+        const bValid = Number.isFinite(valueB);
+
+        if (!aValid && !bValid) return 0;
+        if (!aValid) return 1;
+        if (!bValid) return -1;
+        return ascending ? valueA - valueB : valueB - valueA;
+    };
+
+    const sortComparators = {
+        'float-asc': makeNumericSorter('float', true),
+        'float-desc': makeNumericSorter('float', false),
+        'price-asc': makeNumericSorter('price', true),
+        'price-desc': makeNumericSorter('price', false)
+    };
+
+    const getSortComparator = (mode) => sortComparators[mode] || null;
+
+    const matchesFilters = (item, activeFilters, searchTerm) => {
+        const tradable = item.dataset.tradable;
+        const weapon = item.dataset.weapon;
+        const type = item.dataset.type;
+        const dataName = (item.dataset.name || '').toLowerCase();
+        const itemText = (item.textContent || '').toLowerCase();
+        const searchableText = dataName ? `${dataName} ${itemText}` : itemText;
+
+        const matchesTradable = activeFilters.tradable.length === 0 || activeFilters.tradable.includes(tradable);
+        const matchesWeapon = activeFilters.weapon.length === 0 || activeFilters.weapon.includes(weapon);
+        const matchesType = activeFilters.type.length === 0 || activeFilters.type.includes(type);
+        const matchesSearch = searchTerm === '' || searchableText.includes(searchTerm);
+
+        return matchesTradable && matchesWeapon && matchesType && matchesSearch;
+    };
+
+    const updateReservedHeadingVisibility = (visibleReservedCount = reservedItems.length) => {
+        if (!reservedHeading) {
+            return;
+        }
+        reservedHeading.style.display = visibleReservedCount > 0 ? '' : 'none';
+    };
+
+    updateReservedHeadingVisibility();
+
+    const autoResizeTextarea = (textarea) => {
+        if (!textarea) {
+            return;
+        }
+
+        if (!textarea.dataset.baseHeight) {
+            const computed = window.getComputedStyle(textarea);
+            const minHeight = parseFloat(computed.minHeight) || textarea.scrollHeight;
+            textarea.dataset.baseHeight = String(minHeight);
+        }
+
+        const baseHeight = parseFloat(textarea.dataset.baseHeight) || 0;
+        textarea.style.height = 'auto';
+        const newHeight = Math.max(textarea.scrollHeight, baseHeight);
+        textarea.style.height = `${newHeight}px`;
+    };
+
+    // Initial manual import state
+    let manualImportRevealed = false;
+    if (manualImportSection) {
+        const shouldStartVisible = manualImportSection.dataset.show === 'true';
+        manualImportRevealed = shouldStartVisible;
+
+        if (shouldStartVisible) {
+            manualImportSection.removeAttribute('hidden');
+            manualImportSection.style.display = '';
+        } else {
+            manualImportSection.setAttribute('hidden', '');
+            manualImportSection.style.display = 'none';
+        }
+
+        if (refreshHint) {
+            refreshHint.textContent = '';
+            refreshHint.setAttribute('hidden', '');
+        }
+    }
+
+    // Initial filter panel state
+    filterPanel.style.display = 'none';
+
+    // Toggle filter panel with consistent behavior
+    filterToggle.addEventListener('click', function() {
+        const isHidden = filterPanel.style.display === 'none' || !filterPanel.style.display;
+        filterPanel.style.display = isHidden ? 'block' : 'none';
+        filterToggle.classList.toggle('panel-open', isHidden);
+    });
+
+    if (refreshBtn && manualImportSection) {
+        refreshBtn.addEventListener('click', function(event) {
+            const hasProtected = (inventoryJsonProtected && inventoryJsonProtected.value.trim())
+                || (inventoryFileProtected && inventoryFileProtected.files.length);
+            const hasMain = (inventoryJsonMain && inventoryJsonMain.value.trim())
+                || (inventoryFileMain && inventoryFileMain.files.length);
+
+            if (!manualImportRevealed) {
+                manualImportSection.removeAttribute('hidden');
+                manualImportSection.style.display = '';
+                manualImportRevealed = true;
+                if (refreshHint) {
+                    refreshHint.textContent = '';
+                    refreshHint.setAttribute('hidden', '');
+                }
+                event.preventDefault();
+                event.stopPropagation();
+                return;
+            }
+
+            if (!hasProtected || !hasMain) {
+                if (refreshHint) {
+                    refreshHint.textContent = 'Both JSON fields are required before refreshing.';
+                    refreshHint.removeAttribute('hidden');
+                }
+                event.preventDefault();
+                event.stopPropagation();
+                return;
+            }
+
+            manualImportSection.setAttribute('hidden', '');
+            manualImportSection.style.display = 'none';
+            manualImportRevealed = false;
+            if (refreshHint) {
+                refreshHint.textContent = '';
+                refreshHint.setAttribute('hidden', '');
+            }
+        });
+    }
+
+    // Make items clickable for selection and auto-select when price is filled
+    // Defer this heavy processing to allow skin titles to render first
+    setTimeout(() => {
+        items.forEach(item => {
+        const checkbox = item.querySelector('.skin-checkbox');
+        const priceInput = item.querySelector('.skin-price-input input');
+        const noteInput = item.querySelector('.skin-note textarea');
+
+        const setSelected = (shouldSelect) => {
+            item.classList.toggle('selected', shouldSelect);
+            if (checkbox) {
+                checkbox.checked = shouldSelect;
+            }
+        };
+
+        const toggleSelection = () => {
+            setSelected(!item.classList.contains('selected'));
+        };
+
+        item.addEventListener('click', function(event) {
+            if (event.target.closest('.inspect-btn') || event.target.closest('.trade-protected-badge') || event.target.closest('.sticker-thumb')) {
+                return;
+            }
+
+            if (event.target.closest('.skin-price-input input')) {
+                return;
+            }
+
+            if (event.target.closest('.skin-note')) {
+                return;
+            }
+
+            event.preventDefault();
+            event.stopPropagation();
+
+            toggleSelection();
+        });
+
+        const updateSelectionFromInputs = () => {
+            const hasPrice = priceInput && priceInput.value.trim() !== '';
+            const hasNote = noteInput && noteInput.value.trim() !== '';
+
+            if (hasNote) {
+                setSelected(false);
+                return;
+            }
+
+            if (hasPrice) {
+                setSelected(true);
+            }
+        };
+
+        if (priceInput) {
+            priceInput.addEventListener('input', updateSelectionFromInputs);
+            priceInput.addEventListener('change', updateSelectionFromInputs);
+        }
+
+        if (noteInput) {
+            const handleNoteChange = () => {
+                autoResizeTextarea(noteInput);
+                updateSelectionFromInputs();
+            };
+
+            autoResizeTextarea(noteInput);
+            noteInput.addEventListener('input', handleNoteChange);
+            noteInput.addEventListener('change', handleNoteChange);
+        }
+
+        // Don't call updateSelectionFromInputs() on page load to preserve server-side selections
+    });
+    }, 0); // End of setTimeout - defer heavy processing to allow skin titles to render first
+
+    // Select All functionality - only visible items
+    selectAllBtn.addEventListener('click', function(event) {
+        event.preventDefault();
+
+        items.forEach(item => {
+            if (item.style.display !== 'none') {
+                item.classList.add('selected');
+                const checkbox = item.querySelector('.skin-checkbox');
+                if (checkbox) {
+                    checkbox.checked = true;
+                }
+            }
+        });
+    });
+
+    // Clear Selection functionality
+    clearSelectionBtn.addEventListener('click', function(event) {
+        event.preventDefault();
+
+        items.forEach(item => {
+            item.classList.remove('selected');
+            const checkbox = item.querySelector('.skin-checkbox');
+            if (checkbox) {
+                checkbox.checked = false;
+            }
+        });
+    });
+
+    // Filter application function
+    function applyFilters() {
+        const searchTerm = searchBox.value.toLowerCase().trim();
+        const activeFilters = {
+            tradable: getActiveValues('tradable'),
+            weapon: getActiveValues('weapon'),
+            type: getActiveValues('type')
+        };
+
+        const sortFn = sortSelect ? getSortComparator(sortSelect.value) : null;
+
+        const filteredRegular = defaultRegularOrder.filter(item => matchesFilters(item, activeFilters, searchTerm));
+        const filteredReserved = defaultReservedOrder.filter(item => matchesFilters(item, activeFilters, searchTerm));
+
+        const orderedRegular = sortFn ? filteredRegular.slice().sort(sortFn) : filteredRegular.slice();
+        const orderedReserved = sortFn ? filteredReserved.slice().sort(sortFn) : filteredReserved.slice();
+
+        allItems.forEach(item => {
+            if (item.style.display !== 'none') {
+                item.style.display = 'none';
+            }
+        });
+
+        const fragment = document.createDocumentFragment();
+
+        orderedRegular.forEach(item => {
+            item.style.display = 'flex';
+            fragment.appendChild(item);
+        });
+
+        const visibleReserved = orderedReserved.length;
+        updateReservedHeadingVisibility(visibleReserved);
+
+        if (reservedHeading) {
+            if (reservedHeading.parentNode) {
+                reservedHeading.parentNode.removeChild(reservedHeading);
+            }
+            if (visibleReserved > 0) {
+                fragment.appendChild(reservedHeading);
+            }
+        }
+
+        orderedReserved.forEach(item => {
+            item.style.display = 'flex';
+            fragment.appendChild(item);
+        });
+
+        inventoryContainer.appendChild(fragment);
+
+        const visibleCount = orderedRegular.length + orderedReserved.length;
+        showingCount.textContent = visibleCount;
+    }
+
+    // Helper to get active values for a filter category
+    function getActiveValues(filterType) {
+        const values = [];
+        document.querySelectorAll(`.filter-checkbox[data-type="${filterType}"]:checked`).forEach(cb => {
+            values.push(cb.value);
+        });
+        return values;
+    }
+
+    // Apply filters when inputs change
+    searchBox.addEventListener('input', applyFilters);
+    filterCheckboxes.forEach(checkbox => {
+        checkbox.addEventListener('change', applyFilters);
+    });
+
+    if (sortSelect) {
+        sortSelect.addEventListener('change', applyFilters);
+    }
+
+    // Form submit handler for empty selection
+    if (adminForm) {
+        adminForm.addEventListener('submit', function(event) {
+            const selectedCheckboxes = document.querySelectorAll('.skin-checkbox:checked');
+
+            if (selectedCheckboxes.length === 0) {
+                // Add a hidden field to indicate we want to clear all selections
+                const clearFlag = document.createElement('input');
+                clearFlag.type = 'hidden';
+                clearFlag.name = 'clear_all';
+                clearFlag.value = 'true';
+                this.appendChild(clearFlag);
+            }
+        });
+    }
+
+    // Only apply filters on page load if there are active filters or search terms
+    // This prevents unnecessary DOM manipulation that can cause visual delays
+    if (searchBox.value.trim() !== '' || document.querySelectorAll('.filter-checkbox:checked').length > 0) {
+        applyFilters();
+    }
+
+    if (window.InventoryUI) {
+        window.InventoryUI.bindSkinActions(document.getElementById('inventory'));
+    }
+});
+
+// Follow a queued inventory refresh until the worker finishes it
+document.addEventListener('DOMContentLoaded', function() {
+    const jobStatus = document.getElementById('refresh-job-status');
+    if (!jobStatus || jobStatus.dataset.finished === 'true') {
+        return;
+    }
+
+    const stageLabels = {
+        parsing: 'Reading inventory',
+        merging: 'Merging',
+        saving: 'Saving',
+    };
+
+    const poll = function() {
+        fetch(jobStatus.dataset.statusUrl, { headers: { 'Accept': 'application/json' }, credentials: 'same-origin' })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('HTTP ' + response.status);
+                }
+                return response.json();
+            })
+            .then(job => {
+                if (job.finished) {
+                    // Reload to show the refreshed inventory and the job result
+                    window.location.reload();
+                    return;
+                }
+                const label = stageLabels[job.stage] || 'Queued';
+                jobStatus.textContent = job.processed
+                    ? `Refreshing inventory: ${label} (${job.processed} items)…`
+                    : `Refreshing inventory: ${label}…`;
+                window.setTimeout(poll, 1500);
+            })
+            .catch(() => {
+                window.setTimeout(poll, 5000);
+            });
+    };
+
+    window.setTimeout(poll, 1000);
+});
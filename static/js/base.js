@@ -0,0 +1,438 @@
+const THEME_STORAGE_KEY = 'preferred-theme';
+const LOCALE_STORAGE_KEY = 'display-settings';
+const DEFAULT_LOCALE = {
+    language: 'en',
+    currency: 'EUR'
+};
+const LIGHT_THEME = 'light';
+const DARK_THEME = 'dark';
+
+document.addEventListener('DOMContentLoaded', () => {
+    const root = document.documentElement;
+    const toggle = document.getElementById('theme-toggle');
+
+    const systemPreference = typeof window.matchMedia === 'function'
+        ? window.matchMedia('(prefers-color-scheme: light)')
+        : null;
+
+    const getStoredTheme = () => {
+        try {
+            return localStorage.getItem(THEME_STORAGE_KEY);
+        } catch (error) {
+            return null;
+        }
+    };
+
+    const storeTheme = (theme) => {
+        try {
+            localStorage.setItem(THEME_STORAGE_KEY, theme);
+        } catch (error) {
+            /* no-op if storage is unavailable */
+        }
+    };
+
+    const updateThemeButton = (theme) => {
+        if (!toggle) {
+            return;
+        }
+
+        if (theme === LIGHT_THEME) {
+            toggle.setAttribute('aria-label', 'Switch to dark mode');
+            toggle.setAttribute('data-label', 'Switch to dark mode');
+            toggle.textContent = '☀️';
+        } else {
+            toggle.setAttribute('aria-label', 'Switch to light mode');
+            toggle.setAttribute('data-label', 'Switch to light mode');
+            toggle.textContent = '🌙';
+        }
+    };
+
+    const applyTheme = (theme) => {
+        const targetTheme = theme === LIGHT_THEME ? LIGHT_THEME : DARK_THEME;
+        root.setAttribute('data-theme', targetTheme);
+        updateThemeButton(targetTheme);
+    };
+
+    const savedTheme = getStoredTheme();
+    if (savedTheme === LIGHT_THEME || savedTheme === DARK_THEME) {
+        applyTheme(savedTheme);
+    } else {
+        const prefersLight = systemPreference ? systemPreference.matches : false;
+        applyTheme(prefersLight ? LIGHT_THEME : DARK_THEME);
+    }
+
+    if (toggle) {
+        toggle.addEventListener('click', () => {
+            const currentTheme = root.getAttribute('data-theme') === LIGHT_THEME ? LIGHT_THEME : DARK_THEME;
+            const nextTheme = currentTheme === DARK_THEME ? LIGHT_THEME : DARK_THEME;
+            applyTheme(nextTheme);
+            storeTheme(nextTheme);
+        });
+    }
+
+    const handleSystemPreferenceChange = (event) => {
+        const hasSavedPreference = getStoredTheme();
+        if (hasSavedPreference !== LIGHT_THEME && hasSavedPreference !== DARK_THEME) {
+            applyTheme(event.matches ? LIGHT_THEME : DARK_THEME);
+        }
+    };
+
+    if (systemPreference && typeof systemPreference.addEventListener === 'function') {
+        systemPreference.addEventListener('change', handleSystemPreferenceChange);
+    } else if (systemPreference && typeof systemPreference.addListener === 'function') {
+        systemPreference.addListener(handleSystemPreferenceChange);
+    }
+
+    initLocaleSwitcher();
+    initTooltipClamping();
+
+    function initLocaleSwitcher() {
+        const switcher = document.getElementById('locale-switcher-button');
+        const panel = document.getElementById('locale-switcher-panel');
+        if (!switcher || !panel) {
+            return;
+        }
+
+        const form = panel.querySelector('.locale-switcher__form');
+        const languageSelect = form?.querySelector('#locale-language');
+        const currencySelect = form?.querySelector('#locale-currency');
+        const confirmButton = form?.querySelector('.locale-switcher__confirm');
+        const currencySymbolSlot = switcher.querySelector('[data-slot="currency-symbol"]');
+        const currencyCodeSlot = switcher.querySelector('[data-slot="currency-code"]');
+        const languageCodeSlot = switcher.querySelector('[data-slot="language-code"]');
+
+        if (!form || !languageSelect || !currencySelect || !confirmButton || !currencySymbolSlot || !currencyCodeSlot || !languageCodeSlot) {
+            return;
+        }
+
+        let panelOpen = false;
+
+        const getStoredLocale = () => {
+            try {
+                const stored = localStorage.getItem(LOCALE_STORAGE_KEY);
+                return stored ? JSON.parse(stored) : {};
+            } catch (error) {
+                return {};
+            }
+        };
+
+        const storeLocale = (settings) => {
+            try {
+                localStorage.setItem(LOCALE_STORAGE_KEY, JSON.stringify(settings));
+            } catch (error) {
+                /* storage unavailable, ignore */
+            }
+        };
+
+        const updateButtonLabel = () => {
+            const currencyOption = currencySelect.options[currencySelect.selectedIndex];
+            const languageOption = languageSelect.options[languageSelect.selectedIndex];
+            const currencySymbol = currencyOption?.dataset.symbol || currencyOption?.textContent?.trim().split(' ')[0] || '€';
+            const currencyCode = currencyOption?.value || 'EUR';
+            const languageShort = languageOption?.dataset.short || languageOption?.value?.slice(0, 2)?.toUpperCase() || 'EN';
+
+            currencySymbolSlot.textContent = currencySymbol;
+            currencyCodeSlot.textContent = currencyCode.toUpperCase();
+            languageCodeSlot.textContent = languageShort.toUpperCase();
+        };
+
+        const applyStoredLocale = () => {
+            const stored = getStoredLocale();
+
+            let languageValue = stored.language;
+            if (!languageValue || !languageSelect.querySelector(`option[value="${languageValue}"]`)) {
+                languageValue = DEFAULT_LOCALE.language;
+            }
+
+            let currencyValue = stored.currency;
+            if (!currencyValue || !currencySelect.querySelector(`option[value="${currencyValue}"]`)) {
+                currencyValue = DEFAULT_LOCALE.currency;
+            }
+
+            languageSelect.value = languageValue;
+            currencySelect.value = currencyValue;
+
+            updateButtonLabel();
+
+            if (stored.language !== languageValue || stored.currency !== currencyValue) {
+                storeLocale({
+                    language: languageValue,
+                    currency: currencyValue
+                });
+            }
+        };
+
+        const openPanel = () => {
+            if (panelOpen) {
+                return;
+            }
+
+            panel.hidden = false;
+            panelOpen = true;
+            switcher.setAttribute('aria-expanded', 'true');
+            (languageSelect || panel).focus();
+
+            document.addEventListener('mousedown', handleOutsideClick);
+            document.addEventListener('touchstart', handleOutsideClick);
+            document.addEventListener('keydown', handleKeydown);
+        };
+
+        const closePanel = () => {
+            if (!panelOpen) {
+                return;
+            }
+
+            panel.hidden = true;
+            panelOpen = false;
+            switcher.setAttribute('aria-expanded', 'false');
+
+            document.removeEventListener('mousedown', handleOutsideClick);
+            document.removeEventListener('touchstart', handleOutsideClick);
+            document.removeEventListener('keydown', handleKeydown);
+        };
+
+        const handleOutsideClick = (event) => {
+            if (!panel.contains(event.target) && !switcher.contains(event.target)) {
+                closePanel();
+            }
+        };
+
+        const handleKeydown = (event) => {
+            if (event.key === 'Escape') {
+                closePanel();
+                switcher.focus();
+            }
+        };
+
+        switcher.addEventListener('click', (event) => {
+            event.preventDefault();
+            if (panelOpen) {
+                closePanel();
+            } else {
+                openPanel();
+            }
+        });
+
+        confirmButton.addEventListener('click', () => {
+            updateButtonLabel();
+            storeLocale({
+                language: languageSelect.value,
+                currency: currencySelect.value
+            });
+            closePanel();
+        });
+
+        form.addEventListener('submit', (event) => {
+            event.preventDefault();
+        });
+
+        applyStoredLocale();
+    }
+
+    function initTooltipClamping() {
+        const targets = document.querySelectorAll('.nav-icon-btn[data-label], .locale-switcher__button[data-label], .theme-toggle[data-label], .footer-social[data-label]');
+        if (!targets.length) {
+            return;
+        }
+
+        const measure = document.createElement('div');
+        measure.setAttribute('data-tooltip-measure', 'true');
+        measure.style.position = 'fixed';
+        measure.style.top = '-9999px';
+        measure.style.left = '-9999px';
+        measure.style.visibility = 'hidden';
+        measure.style.pointerEvents = 'none';
+        measure.style.padding = '6px 10px';
+        measure.style.border = '1px solid transparent';
+        measure.style.boxSizing = 'border-box';
+        measure.style.fontSize = '12px';
+        measure.style.fontWeight = '600';
+        measure.style.lineHeight = '1.2';
+        measure.style.whiteSpace = 'nowrap';
+        measure.style.zIndex = '-1';
+        document.body.appendChild(measure);
+
+        const VIEWPORT_MARGIN = 12;
+
+        const updateShift = (element) => {
+            const label = element.getAttribute('data-label');
+            if (!label) {
+                element.style.removeProperty('--tooltip-shift');
+                return;
+            }
+
+            const computed = window.getComputedStyle(element);
+            measure.style.fontFamily = computed.fontFamily || window.getComputedStyle(document.body).fontFamily || 'Inter, sans-serif';
+            measure.textContent = label;
+
+            const tooltipWidth = measure.getBoundingClientRect().width;
+            const triggerRect = element.getBoundingClientRect();
+            const viewportWidth = document.documentElement.clientWidth;
+
+            const centeredLeft = triggerRect.left + triggerRect.width / 2 - tooltipWidth / 2;
+            const centeredRight = triggerRect.left + triggerRect.width / 2 + tooltipWidth / 2;
+
+            let shift = 0;
+
+            if (centeredLeft < VIEWPORT_MARGIN) {
+                shift = VIEWPORT_MARGIN - centeredLeft;
+            } else if (centeredRight > viewportWidth - VIEWPORT_MARGIN) {
+                shift = (viewportWidth - VIEWPORT_MARGIN) - centeredRight;
+            }
+
+            element.style.setProperty('--tooltip-shift', `${shift}px`);
+        };
+
+        const clearShift = (element) => {
+            element.style.removeProperty('--tooltip-shift');
+        };
+
+        targets.forEach((target) => {
+            target.addEventListener('mouseenter', () => updateShift(target));
+            target.addEventListener('focus', () => updateShift(target));
+            target.addEventListener('mouseleave', () => clearShift(target));
+            target.addEventListener('blur', () => clearShift(target));
+        });
+
+        window.addEventListener('resize', () => {
+            document.querySelectorAll('.nav-icon-btn[data-label]:hover, .locale-switcher__button[data-label]:hover, .theme-toggle[data-label]:hover, .footer-social[data-label]:hover, .nav-icon-btn[data-label]:focus, .locale-switcher__button[data-label]:focus, .theme-toggle[data-label]:focus, .footer-social[data-label]:focus').forEach((element) => {
+                updateShift(element);
+            });
+        });
+    }
+});
+
+function formatSkinTitles() {
+    document.querySelectorAll('.skin-title').forEach(title => {
+        if (title.dataset.formatted === 'true') {
+            return;
+        }
+
+        const segments = title.textContent.split('|').map(part => part.trim()).filter(Boolean);
+        if (segments.length > 1) {
+            title.textContent = '';
+            segments.forEach((part, index) => {
+                const span = document.createElement('span');
+                span.textContent = part;
+                title.appendChild(span);
+                if (index < segments.length - 1) {
+                    title.appendChild(document.createElement('br'));
+                }
+            });
+        }
+
+        title.dataset.formatted = 'true';
+    });
+}
+
+window.formatSkinTitles = formatSkinTitles;
+
+document.addEventListener('DOMContentLoaded', formatSkinTitles);
+
+document.addEventListener('DOMContentLoaded', function() {
+    const shell = document.getElementById('modal-shell');
+    if (!shell) {
+        return;
+    }
+
+    const overlay = shell.querySelector('.modal-overlay');
+    const windowEl = shell.querySelector('.modal-window');
+    const titleEl = shell.querySelector('#modal-title');
+    const bodyEl = shell.querySelector('#modal-body');
+    const footerEl = shell.querySelector('#modal-footer');
+
+    function closeModal() {
+        shell.setAttribute('hidden', '');
+        shell.classList.remove('visible');
+        bodyEl.innerHTML = '';
+        footerEl.innerHTML = '';
+        windowEl.removeAttribute('data-modal-type');
+    }
+
+    function buildActionButton(action) {
+        const btn = document.createElement('button');
+        btn.type = 'button';
+        btn.className = `modal-btn ${action.variant ? `modal-btn-${action.variant}` : ''}`.trim();
+        btn.textContent = action.label;
+        btn.addEventListener('click', async () => {
+            if (typeof action.onClick === 'function') {
+                const result = await action.onClick();
+                if (result === false) {
+                    return;
+                }
+            }
+            closeModal();
+        });
+        return btn;
+    }
+
+    function openModal({ title, body, actions = [], modalType = null }) {
+        titleEl.textContent = title || '';
+        bodyEl.innerHTML = '';
+        footerEl.innerHTML = '';
+
+        if (body instanceof Node) {
+            bodyEl.appendChild(body);
+        } else if (typeof body === 'string') {
+            bodyEl.innerHTML = body;
+        }
+
+        const frag = document.createDocumentFragment();
+        actions.forEach(action => {
+            frag.appendChild(buildActionButton(action));
+        });
+        footerEl.appendChild(frag);
+
+        if (modalType) {
+            windowEl.setAttribute('data-modal-type', modalType);
+        }
+
+        shell.removeAttribute('hidden');
+        requestAnimationFrame(() => {
+            shell.classList.add('visible');
+        });
+    }
+
+    shell.addEventListener('click', event => {
+        if (event.target.closest('[data-modal-close]')) {
+            closeModal();
+        }
+    });
+
+    document.addEventListener('keyup', event => {
+        if (event.key === 'Escape' && !shell.hasAttribute('hidden')) {
+            closeModal();
+        }
+    });
+
+    window.AppModal = {
+        open: openModal,
+        close: closeModal
+    };
+
+    window.InventoryUI = {
+        bindSkinActions(scope) {
+            const root = scope || document;
+            const modal = window.AppModal;
+            if (!modal) {
+                return;
+            }
+
+            const inspectButtons = root.querySelectorAll('.inspect-btn');
+            inspectButtons.forEach(btn => {
+                if (btn.dataset.bound === 'true') {
+                    return;
+                }
+                btn.dataset.bound = 'true';
+                btn.addEventListener('click', event => {
+                    event.preventDefault();
+                    const link = btn.dataset.inspectLink;
+                    if (!link) {
+                        return;
+                    }
+                    window.location.href = link;
+                });
+            });
+        }
+    };
+});
@@ -0,0 +1,148 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const filterPanel = document.getElementById('filter-panel');
+    const filterButton = document.getElementById('filter-panel-toggle');
+
+    // Initial filter panel state
+    filterPanel.style.display = 'none';
+
+    filterButton.addEventListener('click', function() {
+        const isHidden = filterPanel.style.display === 'none' || !filterPanel.style.display;
+        filterPanel.style.display = isHidden ? 'block' : 'none';
+        filterButton.classList.toggle('panel-open', isHidden);
+    });
+
+    // Filters, search and sort are applied server-side; pages of
+    // rendered cards are fetched from the skins API as the user scrolls.
+    const searchBox = document.getElementById('search-box');
+    const inventoryContainer = document.getElementById('inventory');
+    const sentinel = document.getElementById('inventory-sentinel');
+    const apiUrl = inventoryContainer.dataset.apiUrl;
+    const sortSelect = document.getElementById('sort-select');
+    const showingCount = document.getElementById('showing-count');
+    const checkboxes = document.querySelectorAll('.filter-checkbox');
+
+    let nextCursor = inventoryContainer.dataset.nextCursor || null;
+    let requestSeq = 0;
+    let loading = false;
+    let searchTimer = null;
+
+    // Toggle selection on click, delegated so fetched cards work too
+    inventoryContainer.addEventListener('click', function(event) {
+        const item = event.target.closest('.skin-item');
+        if (!item || event.target.closest('.inspect-btn') || event.target.closest('.trade-protected-badge') || event.target.closest('.sticker-thumb')) {
+            return;
+        }
+
+        event.preventDefault();
+        event.stopPropagation();
+
+        // Toggle selected class for visual feedback
+        item.classList.toggle('selected');
+    });
+
+    // Helper to get active values for a filter category
+    function getActiveValues(filterType) {
+        const values = [];
+        document.querySelectorAll(`.filter-checkbox[data-type="${filterType}"]:checked`).forEach(cb => {
+            values.push(cb.value);
+        });
+        return values;
+    }
+
+    function buildQuery(cursor) {
+        const params = new URLSearchParams({ format: 'html' });
+        ['weapon_type', 'item_type', 'tradable'].forEach(filterType => {
+            getActiveValues(filterType).forEach(value => params.append(filterType, value));
+        });
+        const searchTerm = searchBox.value.trim();
+        if (searchTerm) {
+            params.set('q', searchTerm);
+        }
+        if (sortSelect && sortSelect.value) {
+            params.set('sort', sortSelect.value);
+        }
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        return params;
+    }
+
+    async function loadSkins(replace) {
+        if (!replace && (loading || !nextCursor)) {
+            return;
+        }
+
+        // Responses to superseded queries are dropped
+        const seq = ++requestSeq;
+        loading = true;
+        try {
+            const response = await fetch(`${apiUrl}?${buildQuery(replace ? null : nextCursor)}`, {
+                headers: { 'Accept': 'application/json' }
+            });
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const data = await response.json();
+            if (seq !== requestSeq) {
+                return;
+            }
+
+            if (replace) {
+                inventoryContainer.innerHTML = data.html;
+            } else {
+                inventoryContainer.insertAdjacentHTML('beforeend', data.html);
+            }
+            nextCursor = data.next_cursor;
+            showingCount.textContent = data.total;
+
+            if (window.formatSkinTitles) {
+                window.formatSkinTitles();
+            }
+            if (window.InventoryUI) {
+                window.InventoryUI.bindSkinActions(inventoryContainer);
+            }
+        } catch (error) {
+            console.error('Failed to load skins:', error);
+        } finally {
+            if (seq === requestSeq) {
+                loading = false;
+            }
+        }
+    }
+
+    function applyFilters() {
+        loadSkins(true);
+    }
+
+    // Apply filters when inputs change
+    searchBox.addEventListener('input', function() {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(applyFilters, 250);
+    });
+    checkboxes.forEach(checkbox => {
+        checkbox.addEventListener('change', applyFilters);
+    });
+
+    if (sortSelect) {
+        sortSelect.addEventListener('change', applyFilters);
+    }
+
+    if ('IntersectionObserver' in window) {
+        const observer = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadSkins(false);
+            }
+        }, { rootMargin: '600px 0px' });
+        observer.observe(sentinel);
+    } else {
+        window.addEventListener('scroll', function() {
+            if (sentinel.getBoundingClientRect().top < window.innerHeight + 600) {
+                loadSkins(false);
+            }
+        });
+    }
+
+    if (window.InventoryUI) {
+        window.InventoryUI.bindSkinActions(inventoryContainer);
+    }
+});